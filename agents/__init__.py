@@ -1 +1,18 @@
-# Agents package
\ No newline at end of file
+# Agents package
+from .endgame import EndgameAgent
+from .simple import AggressiveAgent, ConservativeAgent, RandomAgent
+
+# Non-interactive agents by name, for tournaments and other batch runs
+AGENTS = {
+    "random": RandomAgent,
+    "conservative": ConservativeAgent,
+    "aggressive": AggressiveAgent,
+    "endgame": EndgameAgent,
+}
+
+
+def make_agent(name: str):
+    try:
+        return AGENTS[name](name.capitalize())
+    except KeyError:
+        raise ValueError(f"Unknown agent {name!r}, choose from {', '.join(AGENTS)}") from None
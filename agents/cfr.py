@@ -0,0 +1,405 @@
+from __future__ import annotations
+
+import random
+import struct
+from array import array
+from bisect import bisect_right
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING
+
+from game import rules
+from game.checkpoint import atomic_write
+from game.core import Action, GamePhase
+from game.mutable import MutableState
+from game.seeding import derive_seed
+
+from .endgame import EndgameAgent
+
+if TYPE_CHECKING:
+    from game.core import Agent
+    from game.state import State
+
+# Abstract actions: PASS, then raises of this many $1000 over the minimum bid
+RAISE_STEPS = (0, 1, 3)
+NUM_ACTIONS = 1 + len(RAISE_STEPS)
+PASS = 0
+
+# Information set abstraction; bucket edges are in thousands of dollars
+PROPERTY_TIERS = 5  # properties 1-6, 7-12, ..., 25-30
+BID_EDGES = (1, 2, 3, 4, 6, 9)
+MONEY_EDGES = (2, 4, 6, 9, 13, 18)
+MAX_PLAYERS_IN = 6
+
+_BID_BUCKETS = len(BID_EDGES) + 1
+_MONEY_BUCKETS = len(MONEY_EDGES) + 1
+_PLAYERS_IN_BUCKETS = MAX_PLAYERS_IN - 1  # 2 to 6 players still bidding
+NUM_INFO_SETS = PROPERTY_TIERS * PROPERTY_TIERS * _BID_BUCKETS * _MONEY_BUCKETS * _PLAYERS_IN_BUCKETS
+
+TABLE_MAGIC = b"FSCFRT\x01"
+CHECKPOINT_MAGIC = b"FSCFRC\x01"
+_TABLE_HEADER = struct.Struct("<II")
+_CHECKPOINT_HEADER = struct.Struct("<IIQQ")
+
+_PASS_ACTION = Action.pass_turn()
+
+
+def info_set(lowest: int, highest: int, high_bid: int, money: int, players_in: int) -> int:
+    """Index of the abstract information set of a bidding decision.
+
+    Buckets the lowest and highest property on offer, the standing high bid,
+    the bidder's money and the number of players who have not passed.
+    """
+    index = (lowest - 1) // 6
+    index = index * PROPERTY_TIERS + (highest - 1) // 6
+    index = index * _BID_BUCKETS + bisect_right(BID_EDGES, high_bid // 1000)
+    index = index * _MONEY_BUCKETS + bisect_right(MONEY_EDGES, money // 1000)
+    return index * _PLAYERS_IN_BUCKETS + min(max(players_in, 2), MAX_PLAYERS_IN) - 2
+
+
+def state_info_set(state: State) -> int:
+    auction_state = state.auction_state
+    properties = auction_state.current_properties
+    return info_set(
+        min(properties),
+        max(properties),
+        max(auction_state.current_bids.values(), default=0),
+        state.players[state.current_player_idx].money,
+        len(state.players) - len(auction_state.players_passed),
+    )
+
+
+def position_info_set(position: MutableState) -> int:
+    properties = position.auction_properties
+    return info_set(
+        min(properties),
+        max(properties),
+        position.high_bid,
+        position.money[position.current_player_idx],
+        position.num_players - position.passed_mask.bit_count(),
+    )
+
+
+def legal_abstract_actions(high_bid: int, money: int) -> list[int]:
+    min_bid = (high_bid // 1000 + 1) * 1000
+    return [PASS] + [1 + k for k, step in enumerate(RAISE_STEPS) if min_bid + 1000 * step <= money]
+
+
+def to_action(abstract_action: int, high_bid: int) -> Action:
+    if abstract_action == PASS:
+        return _PASS_ACTION
+    return Action.bid((high_bid // 1000 + 1 + RAISE_STEPS[abstract_action - 1]) * 1000)
+
+
+def _regret_matching(regrets: array, base: int, legal: list[int]) -> list[float]:
+    positive = [max(regrets[base + a], 0.0) for a in legal]
+    total = sum(positive)
+    if total > 0:
+        return [r / total for r in positive]
+    return [1.0 / len(legal)] * len(legal)
+
+
+def _sample(rng: random.Random, probabilities: list[float]) -> int:
+    x = rng.random()
+    for k, p in enumerate(probabilities):
+        x -= p
+        if x < 0:
+            return k
+    return len(probabilities) - 1
+
+
+class StrategyTable:
+    """Average strategy per information set, as float32 probabilities.
+
+    `NUM_INFO_SETS * NUM_ACTIONS` floats in one flat array, loaded from a
+    file in a single read.
+    """
+
+    def __init__(self, probabilities: array):
+        if probabilities.typecode != "f" or len(probabilities) != NUM_INFO_SETS * NUM_ACTIONS:
+            raise ValueError("Strategy table does not match the abstraction")
+        self.probabilities = probabilities
+
+    def strategy(self, index: int, legal: list[int]) -> list[float]:
+        """Probabilities of the `legal` abstract actions at `index`, renormalized."""
+        base = index * NUM_ACTIONS
+        weights = [self.probabilities[base + a] for a in legal]
+        total = sum(weights)
+        if total > 0:
+            return [w / total for w in weights]
+        return [1.0 / len(legal)] * len(legal)
+
+    def save(self, path: str) -> None:
+        atomic_write(path, TABLE_MAGIC + _TABLE_HEADER.pack(NUM_INFO_SETS, NUM_ACTIONS) + self.probabilities.tobytes())
+
+    @classmethod
+    def load(cls, path: str) -> StrategyTable:
+        with open(path, "rb") as f:
+            data = f.read()
+        if not data.startswith(TABLE_MAGIC):
+            raise ValueError(f"{path} is not a CFR strategy table")
+        sizes = _TABLE_HEADER.unpack_from(data, len(TABLE_MAGIC))
+        if sizes != (NUM_INFO_SETS, NUM_ACTIONS):
+            raise ValueError(f"{path} was trained for a different abstraction")
+        probabilities = array("f")
+        probabilities.frombytes(data[len(TABLE_MAGIC) + _TABLE_HEADER.size:])
+        return cls(probabilities)
+
+
+# Training
+def _iterate(
+    regrets: array,
+    strategy_sums: array,
+    rng: random.Random,
+    num_players: int,
+    traverser: int,
+    exploration: float,
+) -> None:
+    """One outcome-sampling MCCFR iteration for `traverser`, updating in place.
+
+    Every seat bids from the current regret-matching strategy; the traverser
+    mixes in `exploration` of uniform play and corrects for it by importance
+    weighting, in both the regrets and the average strategy (which is
+    weighted by the traverser's own reach over its sampling probability).
+    Sales are played highest card first by everyone.
+    """
+    position = MutableState(rules.begin(rules.new_game(num_players, rng)))
+    visited: list[tuple[int, list[int], list[float], int]] = []
+    sample_probability = 1.0
+    # Probability of the traverser's choices so far under sigma
+    reach = 1.0
+
+    while position.phase == GamePhase.BIDDING:
+        player_idx = position.current_player_idx
+        high_bid = position.high_bid
+        legal = legal_abstract_actions(high_bid, position.money[player_idx])
+        if len(legal) == 1:
+            position.make_move(_PASS_ACTION)
+            continue
+
+        base = position_info_set(position) * NUM_ACTIONS
+        sigma = _regret_matching(regrets, base, legal)
+        if player_idx == traverser:
+            uniform = exploration / len(legal)
+            k = _sample(rng, [uniform + (1 - exploration) * p for p in sigma])
+            visited.append((base, legal, sigma, k))
+            weight = reach / sample_probability
+            for a, p in zip(legal, sigma):
+                strategy_sums[base + a] += weight * p
+            reach *= sigma[k]
+            sample_probability *= uniform + (1 - exploration) * sigma[k]
+        else:
+            k = _sample(rng, sigma)
+        position.make_move(to_action(legal[k], high_bid))
+
+    while not position.is_terminal():
+        position.make_move(tuple(Action.play_card(max(hand)) for hand in position.properties))
+
+    scores = position.scores()
+    weight = scores[traverser] / (max(scores) or 1) / sample_probability
+
+    # tail: probability of the traverser's remaining choices under sigma
+    tail = 1.0
+    for base, legal, sigma, k in reversed(visited):
+        chosen = sigma[k]
+        for j, a in enumerate(legal):
+            if j == k:
+                regrets[base + a] += weight * tail * (1 - chosen)
+            else:
+                regrets[base + a] -= weight * tail * chosen
+        tail *= chosen
+
+
+def _run_iterations(
+    regrets: array,
+    strategy_sums: array,
+    seed: int,
+    first: int,
+    count: int,
+    player_counts: Sequence[int],
+    exploration: float,
+) -> None:
+    for iteration in range(first, first + count):
+        rng = random.Random(derive_seed(seed, iteration))
+        num_players = player_counts[iteration % len(player_counts)]
+        _iterate(regrets, strategy_sums, rng, num_players, rng.randrange(num_players), exploration)
+
+
+def _train_shard(
+    regrets: bytes,
+    seed: int,
+    first: int,
+    count: int,
+    player_counts: Sequence[int],
+    exploration: float,
+) -> tuple[bytes, bytes]:
+    """Iterations on a private copy of the regrets; returns the regret and strategy increments."""
+    before = array("d")
+    before.frombytes(regrets)
+    after = array("d", before)
+    strategy_sums = array("d", bytes(8 * len(before)))
+    _run_iterations(after, strategy_sums, seed, first, count, player_counts, exploration)
+    for i, value in enumerate(before):
+        after[i] -= value
+    return after.tobytes(), strategy_sums.tobytes()
+
+
+class CFRTrainer:
+    """Outcome-sampling Monte Carlo CFR over the bidding abstraction.
+
+    Iteration `i` deals its game from `derive_seed(seed, i)`. With several
+    workers each batch is split between processes that all start from the
+    regrets at the start of the batch, and their increments are summed
+    afterwards; a single worker updates the regrets after every iteration.
+    A run is therefore reproduced by its seed, `batch_size` and number of
+    workers, and resuming with a different worker count continues it
+    differently. Checkpoints are written between batches and hold everything
+    else needed to resume.
+    """
+
+    def __init__(self, seed: int = 0, player_counts: Sequence[int] = (3, 4, 5, 6), exploration: float = 0.6):
+        self.seed = seed
+        self.player_counts = tuple(player_counts)
+        self.exploration = exploration
+        self.iterations = 0
+        self.regrets = array("d", bytes(8 * NUM_INFO_SETS * NUM_ACTIONS))
+        self.strategy_sums = array("d", bytes(8 * NUM_INFO_SETS * NUM_ACTIONS))
+
+    def train(
+        self,
+        iterations: int,
+        workers: int = 1,
+        batch_size: int = 10_000,
+        checkpoint: str | None = None,
+    ) -> None:
+        """Run `iterations` more iterations, checkpointing after every batch."""
+        target = self.iterations + iterations
+        pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+        try:
+            while self.iterations < target:
+                count = min(batch_size, target - self.iterations)
+                if pool is None:
+                    _run_iterations(
+                        self.regrets, self.strategy_sums, self.seed, self.iterations, count,
+                        self.player_counts, self.exploration,
+                    )
+                else:
+                    self._train_parallel(pool, workers, count)
+                self.iterations += count
+                if checkpoint is not None:
+                    self.save_checkpoint(checkpoint)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+    def _train_parallel(self, pool: ProcessPoolExecutor, workers: int, count: int) -> None:
+        regrets = self.regrets.tobytes()
+        bounds = [self.iterations + count * w // workers for w in range(workers + 1)]
+        futures = [
+            pool.submit(_train_shard, regrets, self.seed, lo, hi - lo, self.player_counts, self.exploration)
+            for lo, hi in zip(bounds, bounds[1:])
+            if hi > lo
+        ]
+        for future in futures:
+            for totals, data in zip((self.regrets, self.strategy_sums), future.result()):
+                delta = array("d")
+                delta.frombytes(data)
+                for i, value in enumerate(delta):
+                    if value:
+                        totals[i] += value
+
+    def table(self) -> StrategyTable:
+        """The average strategy, which is what converges to equilibrium."""
+        probabilities = array("f", bytes(4 * NUM_INFO_SETS * NUM_ACTIONS))
+        for base in range(0, len(probabilities), NUM_ACTIONS):
+            total = sum(self.strategy_sums[base:base + NUM_ACTIONS])
+            if total > 0:
+                for a in range(NUM_ACTIONS):
+                    probabilities[base + a] = self.strategy_sums[base + a] / total
+        return StrategyTable(probabilities)
+
+    @property
+    def visited_info_sets(self) -> int:
+        return sum(
+            1 for base in range(0, len(self.strategy_sums), NUM_ACTIONS)
+            if any(self.strategy_sums[base:base + NUM_ACTIONS])
+        )
+
+    def save_checkpoint(self, path: str) -> None:
+        atomic_write(path, b"".join((
+            CHECKPOINT_MAGIC,
+            _CHECKPOINT_HEADER.pack(NUM_INFO_SETS, NUM_ACTIONS, self.seed, self.iterations),
+            struct.pack("<dB", self.exploration, len(self.player_counts)),
+            bytes(self.player_counts),
+            self.regrets.tobytes(),
+            self.strategy_sums.tobytes(),
+        )))
+
+    @classmethod
+    def load_checkpoint(cls, path: str) -> CFRTrainer:
+        with open(path, "rb") as f:
+            data = f.read()
+        if not data.startswith(CHECKPOINT_MAGIC):
+            raise ValueError(f"{path} is not a CFR checkpoint")
+        offset = len(CHECKPOINT_MAGIC)
+        info_sets, actions, seed, iterations = _CHECKPOINT_HEADER.unpack_from(data, offset)
+        if (info_sets, actions) != (NUM_INFO_SETS, NUM_ACTIONS):
+            raise ValueError(f"{path} was trained for a different abstraction")
+        offset += _CHECKPOINT_HEADER.size
+        exploration, num_counts = struct.unpack_from("<dB", data, offset)
+        offset += struct.calcsize("<dB")
+        player_counts = tuple(data[offset:offset + num_counts])
+        offset += num_counts
+
+        trainer = cls(seed, player_counts, exploration)
+        trainer.iterations = iterations
+        size = 8 * NUM_INFO_SETS * NUM_ACTIONS
+        trainer.regrets = array("d")
+        trainer.regrets.frombytes(data[offset:offset + size])
+        trainer.strategy_sums = array("d")
+        trainer.strategy_sums.frombytes(data[offset + size:offset + 2 * size])
+        return trainer
+
+
+class CFRAgent:
+    """Bids from a precomputed `StrategyTable`; sells with `selling_agent`.
+
+    Samples the table's mixed strategy, or plays its most likely action with
+    `greedy`. Information sets the training never reached play uniformly.
+    """
+
+    def __init__(
+        self,
+        table: StrategyTable | str,
+        name: str = "CFR",
+        greedy: bool = False,
+        selling_agent: Agent | None = None,
+        rng: random.Random | None = None,
+    ):
+        self.name = name
+        self.table = StrategyTable.load(table) if isinstance(table, str) else table
+        self.greedy = greedy
+        self.selling_agent = selling_agent if selling_agent is not None else EndgameAgent(name)
+        self.rng = rng if rng is not None else random.Random()
+
+    def set_rng(self, rng: random.Random) -> None:
+        self.rng = rng
+        set_rng = getattr(self.selling_agent, "set_rng", None)
+        if set_rng is not None:
+            set_rng(rng)
+
+    def move(self, state: State) -> Action:
+        if state.phase != GamePhase.BIDDING or not state.auction_state:
+            return self.selling_agent.move(state)
+
+        high_bid = max(state.auction_state.current_bids.values(), default=0)
+        legal = legal_abstract_actions(high_bid, state.players[state.current_player_idx].money)
+        if len(legal) == 1:
+            return _PASS_ACTION
+
+        probabilities = self.table.strategy(state_info_set(state), legal)
+        if self.greedy:
+            k = max(range(len(legal)), key=probabilities.__getitem__)
+        else:
+            k = _sample(self.rng, probabilities)
+        return to_action(legal[k], high_bid)
@@ -0,0 +1,314 @@
+from __future__ import annotations
+
+import collections
+import functools
+import itertools
+import math
+import random
+from collections.abc import Callable, Iterable, Sequence
+from typing import TYPE_CHECKING
+
+import attrs
+
+from game.core import Action, GamePhase
+
+from .simple import ConservativeAgent
+
+if TYPE_CHECKING:
+    from game.core import Agent
+    from game.state import State
+
+Hands = tuple[tuple[int, ...], ...]
+
+
+def round_payoffs(plays: tuple[int, ...], checks: Sequence[float]) -> list[float]:
+    """Checks won by each seat; `checks` must be sorted highest first."""
+    gains = [0] * len(plays)
+    order = sorted(range(len(plays)), key=plays.__getitem__, reverse=True)
+    for player_idx, check in zip(order, checks):
+        gains[player_idx] = check
+    return gains
+
+
+def canonicalize(hands: Hands) -> tuple[Hands, list[int]]:
+    """Replace card values by their rank among all cards still in play.
+
+    Only the relative order of played cards decides a sale, so positions that
+    differ in values but not in order share one solution. Returns the ranked
+    hands and the rank -> value mapping.
+    """
+    values = sorted(card for hand in hands for card in hand)
+    rank = {card: i for i, card in enumerate(values)}
+    return tuple(tuple(sorted(rank[card] for card in hand)) for hand in hands), values
+
+
+@attrs.frozen
+class SaleSolution:
+    plays: tuple[int, ...]  # card value per seat
+    payoffs: tuple[float, ...]  # expected checks still to come per seat, this round included
+    converged: bool  # False if no pure equilibrium was found
+
+
+class SaleSolver:
+    """Approximate equilibrium play for the selling phase.
+
+    The selling phase is a simultaneous-move game with every hand visible in
+    `State`, but the order of the check deck is hidden: a player knows which
+    checks are left, not which round each one comes up in. A position is
+    therefore the hands, the checks on offer and the multiset of checks
+    left, and positions are memoized on exactly that, with hands replaced by
+    their ranks (see `canonicalize`) and the checks sorted.
+
+    A position is searched by best-response dynamics over pure strategies:
+    starting from everyone playing their highest card, each player in turn
+    switches to the card that maximizes their expected checks given the
+    others' plays, until no one wants to switch. That profile is a pure
+    equilibrium of the search. The dynamics can cycle, so if they have not
+    settled within `max_sweeps` sweeps every pure profile is checked, as long
+    as there are at most `max_profiles`, and the first equilibrium found is
+    played. When there is none (the round only has mixed equilibria) or the
+    check is skipped, the last profile is returned with `converged` False and
+    counted in `unconverged`.
+
+    The value of a play is its checks this round plus the expected value of
+    the resulting position over the next round's draw from the checks left:
+    every distinct draw with its probability when there are at most
+    `samples` of them, else `samples` random draws. Positions with at most
+    `exact_cards` cards per hand are searched this way to the end of the
+    game. Larger ones look `lookahead` rounds ahead and then score the rest
+    of the game with a heuristic: everyone plays their cards highest first,
+    and each round's checks are valued at their expectation. Both limits
+    make the result an approximation of equilibrium play, not a solution.
+    """
+
+    def __init__(
+        self,
+        exact_cards: int = 3,
+        lookahead: int = 1,
+        max_sweeps: int = 8,
+        max_profiles: int = 64,
+        samples: int = 8,
+        max_cache: int = 200_000,
+    ):
+        self.exact_cards = exact_cards
+        self.lookahead = lookahead
+        self.max_sweeps = max_sweeps
+        self.max_profiles = max_profiles
+        self.samples = samples
+        self.max_cache = max_cache
+        self._cache: dict[tuple, SaleSolution] = {}
+        # Positions searched, and those whose best responses did not settle
+        self.searched = 0
+        self.unconverged = 0
+
+    def solve(
+        self, hands: Hands, current_checks: tuple[int, ...], remaining_checks: Iterable[int], rng: random.Random
+    ) -> SaleSolution:
+        """Plays (card values), expected future checks and convergence for a position.
+
+        Only the multiset of `remaining_checks` is used, never its order.
+        """
+        cards_per_hand = len(hands[0])
+        depth = cards_per_hand if cards_per_hand <= self.exact_cards else self.lookahead
+        if len(self._cache) > self.max_cache:
+            self._cache.clear()
+
+        ranked, values = canonicalize(hands)
+        solution = self._solve(
+            ranked, tuple(sorted(current_checks, reverse=True)), tuple(sorted(remaining_checks)), depth, rng
+        )
+        return attrs.evolve(solution, plays=tuple(values[card] for card in solution.plays))
+
+    def _solve(
+        self, hands: Hands, checks: tuple[int, ...], remaining: tuple[int, ...], depth: int, rng: random.Random
+    ) -> SaleSolution:
+        key = (hands, checks, remaining, depth)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+
+        num_players = len(hands)
+        profile = [hand[-1] for hand in hands]
+        utilities: dict[tuple[int, ...], tuple[float, ...]] = {}
+        draws = self._draws(remaining, num_players, rng) if depth > 1 and remaining else []
+
+        def utility(plays: tuple[int, ...]) -> tuple[float, ...]:
+            result = utilities.get(plays)
+            if result is None:
+                totals = [float(gain) for gain in round_payoffs(plays, checks)]
+                for i, gain in enumerate(self._continuation(hands, plays, remaining, draws, depth, rng)):
+                    totals[i] += gain
+                result = tuple(totals)
+                utilities[plays] = result
+            return result
+
+        converged = True
+        if len(hands[0]) > 1:
+            converged = False
+            for _ in range(self.max_sweeps):
+                changed = False
+                for i in range(num_players):
+                    current_card = best_card = profile[i]
+                    best_value = utility(tuple(profile))[i]
+                    # Lowest card first, so ties keep the stronger cards in hand
+                    for card in hands[i]:
+                        if card == current_card:
+                            continue
+                        profile[i] = card
+                        value = utility(tuple(profile))[i]
+                        if value > best_value:
+                            best_card, best_value = card, value
+                    profile[i] = best_card
+                    changed |= best_card != current_card
+                if not changed:
+                    converged = True
+                    break
+            if not converged and math.prod(len(hand) for hand in hands) <= self.max_profiles:
+                for plays in itertools.product(*hands):
+                    if self._is_equilibrium(hands, plays, utility):
+                        profile, converged = list(plays), True
+                        break
+
+        self.searched += 1
+        if not converged:
+            self.unconverged += 1
+        solution = SaleSolution(tuple(profile), utility(tuple(profile)), converged)
+        self._cache[key] = solution
+        return solution
+
+    @staticmethod
+    def _is_equilibrium(
+        hands: Hands, plays: tuple[int, ...], utility: Callable[[tuple[int, ...]], tuple[float, ...]]
+    ) -> bool:
+        values = utility(plays)
+        for i, hand in enumerate(hands):
+            for card in hand:
+                if card != plays[i] and utility(plays[:i] + (card,) + plays[i + 1:])[i] > values[i]:
+                    return False
+        return True
+
+    def _draws(
+        self, remaining: tuple[int, ...], size: int, rng: random.Random
+    ) -> list[tuple[tuple[int, ...], tuple[int, ...], float]]:
+        """`(next round's checks, checks left after it, probability)` for the next round's draw."""
+        if len(remaining) <= size:
+            return [(tuple(sorted(remaining, reverse=True)), (), 1.0)]
+        exact = _distinct_draws(remaining, size, self.samples)
+        if exact is not None:
+            return exact
+        draws = []
+        for _ in range(self.samples):
+            drawn = sorted(rng.sample(range(len(remaining)), size))
+            left = tuple(check for i, check in enumerate(remaining) if i not in drawn)
+            draws.append((tuple(sorted((remaining[i] for i in drawn), reverse=True)), left, 1 / self.samples))
+        return draws
+
+    def _continuation(
+        self,
+        hands: Hands,
+        plays: tuple[int, ...],
+        remaining: tuple[int, ...],
+        draws: list[tuple[tuple[int, ...], tuple[int, ...], float]],
+        depth: int,
+        rng: random.Random,
+    ) -> tuple[float, ...]:
+        if not remaining:
+            return (0,) * len(hands)
+        after, _ = canonicalize(tuple(
+            tuple(card for card in hand if card != play) for hand, play in zip(hands, plays)
+        ))
+        if depth <= 1:
+            return self._estimate(after, remaining)
+        totals = [0.0] * len(hands)
+        for checks, left, probability in draws:
+            for i, gain in enumerate(self._solve(after, checks, left, depth - 1, rng).payoffs):
+                totals[i] += probability * gain
+        return tuple(totals)
+
+    @staticmethod
+    def _estimate(hands: Hands, remaining: tuple[int, ...]) -> tuple[float, ...]:
+        """Expected future checks if everyone plays their cards highest first.
+
+        Every future round is an equally likely draw from the checks left, so
+        the k-th best play of any round expects the same check.
+        """
+        expected = _expected_order_statistics(tuple(sorted(remaining, reverse=True)), len(hands))
+        totals = [0.0] * len(hands)
+        for k in range(len(hands[0])):
+            plays = tuple(hand[-1 - k] for hand in hands)
+            for i, gain in enumerate(round_payoffs(plays, expected)):
+                totals[i] += gain
+        return tuple(totals)
+
+
+def _distinct_draws(
+    remaining: tuple[int, ...], size: int, limit: int
+) -> list[tuple[tuple[int, ...], tuple[int, ...], float]] | None:
+    """Every distinct `size`-draw from the sorted `remaining` with its probability, or None past `limit`."""
+    counts = sorted(collections.Counter(remaining).items(), reverse=True)
+    total = math.comb(len(remaining), size)
+    draws = []
+
+    def extend(index: int, drawn: list[int], left: list[int], ways: int) -> bool:
+        if len(drawn) == size:
+            left = left + [value for value, count in counts[index:] for _ in range(count)]
+            draws.append((tuple(drawn), tuple(sorted(left)), ways / total))
+            return len(draws) <= limit
+        if index == len(counts):
+            return True
+        value, count = counts[index]
+        for taken in range(min(count, size - len(drawn)), -1, -1):
+            more = extend(
+                index + 1, drawn + [value] * taken, left + [value] * (count - taken), ways * math.comb(count, taken)
+            )
+            if not more:
+                return False
+        return True
+
+    return draws if extend(0, [], [], 1) else None
+
+
+@functools.lru_cache(maxsize=4096)
+def _expected_order_statistics(checks: tuple[int, ...], size: int) -> tuple[float, ...]:
+    """Mean r-th highest of a random `size`-subset of `checks` (sorted highest first), per r."""
+    n = len(checks)
+    # checks[j] is the r-th highest when r of the j higher and the rest of the lower ones are drawn
+    return tuple(
+        sum(check * math.comb(j, r) * math.comb(n - 1 - j, size - 1 - r) for j, check in enumerate(checks))
+        / math.comb(n, size)
+        for r in range(size)
+    )
+
+
+class EndgameAgent:
+    """Plays the selling phase with `SaleSolver`; bids like another agent."""
+
+    def __init__(
+        self,
+        name: str = "Endgame",
+        bidding_agent: Agent | None = None,
+        solver: SaleSolver | None = None,
+        rng: random.Random | None = None,
+    ):
+        self.name = name
+        self.bidding_agent = bidding_agent if bidding_agent is not None else ConservativeAgent(name)
+        self.solver = solver if solver is not None else SaleSolver()
+        self.rng = rng if rng is not None else random.Random()
+
+    def set_rng(self, rng: random.Random) -> None:
+        self.rng = rng
+        set_rng = getattr(self.bidding_agent, "set_rng", None)
+        if set_rng is not None:
+            set_rng(rng)
+
+    def move(self, state: State) -> Action:
+        if state.phase != GamePhase.SELLING or not state.sale_state:
+            return self.bidding_agent.move(state)
+
+        current_player = state.get_current_player()
+        if not current_player.properties:
+            raise ValueError("No properties to play")
+
+        hands = tuple(player.properties for player in state.players)
+        solution = self.solver.solve(hands, state.sale_state.current_checks, state.check_deck, self.rng)
+        return Action.play_card(solution.plays[state.current_player_idx])
@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+import math
+import random
+import time
+from typing import TYPE_CHECKING
+
+import attrs
+
+from game.core import Action, GamePhase
+from game.equity import position_equities
+from game.mutable import MutableState
+
+from .endgame import EndgameAgent
+
+if TYPE_CHECKING:
+    from game.core import Agent
+    from game.state import State
+
+PASS = Action.pass_turn()
+
+
+@attrs.define
+class SearchStats:
+    iterations: int = 0
+    elapsed: float = 0.0
+    nodes: int = 0
+    reused_visits: int = 0
+    max_depth: int = 0
+
+    @property
+    def iterations_per_second(self) -> float:
+        return self.iterations / self.elapsed if self.elapsed else 0.0
+
+    def report(self) -> str:
+        return (
+            f"{self.iterations} iterations in {self.elapsed * 1000:.1f} ms "
+            f"({self.iterations_per_second:,.0f}/s), {self.nodes} nodes, "
+            f"{self.reused_visits} visits reused, depth {self.max_depth}"
+        )
+
+
+class Node:
+    __slots__ = ("player", "visits", "edges")
+
+    def __init__(self, player: int):
+        self.player = player
+        self.visits = 0
+        # action -> [visits, total reward for `player`]
+        self.edges: dict[Action, list] = {}
+
+
+def information_key(m: MutableState) -> tuple:
+    """Everything a player can see, i.e. the position minus the deck orders."""
+    return (
+        m.phase,
+        m.current_player_idx,
+        tuple(m.money),
+        tuple(tuple(sorted(hand)) for hand in m.properties),
+        tuple(tuple(sorted(checks)) for checks in m.checks),
+        tuple(sorted(m.auction_properties)),
+        tuple(m.bids),
+        m.passed_mask,
+        tuple(m.properties_taken),
+    )
+
+
+class ISMCTSAgent:
+    """Information-set Monte Carlo Tree Search for the bidding phase.
+
+    Each iteration determinizes the hidden order of the remaining property
+    and check decks, then walks the tree with UCB1. At each node the player to
+    move picks by their own reward, which is their final score as a share of
+    the best score. The walk expands one node and finishes the game with a
+    cheap rollout policy. Nodes are keyed by information set rather than by
+    path, so the tree built for one move is found again on the next and
+    reused. The position is advanced in place with
+    `MutableState.make_move` and rewound with `unmake_move` after every
+    iteration.
+
+    With `rollout_sales=False` a rollout stops when the bidding ends and
+    rewards each player's equity (`game.equity.position_equities`) instead of
+    playing the sales out at random.
+
+    The search stops at `time_limit` seconds or `iterations`, whichever comes
+    first. Selling-phase moves are delegated to `selling_agent`.
+    """
+
+    def __init__(
+        self,
+        name: str = "ISMCTS",
+        time_limit: float | None = 0.2,
+        iterations: int | None = None,
+        exploration: float = 0.7,
+        rollout_bid_probability: float = 0.3,
+        rollout_sales: bool = True,
+        raise_steps: tuple[int, ...] = (0, 1, 2, 4),
+        max_nodes: int = 200_000,
+        selling_agent: Agent | None = None,
+        rng: random.Random | None = None,
+    ):
+        if time_limit is None and iterations is None:
+            raise ValueError("Need a time limit or an iteration budget")
+        self.name = name
+        self.time_limit = time_limit
+        self.iterations = iterations
+        self.exploration = exploration
+        self.rollout_bid_probability = rollout_bid_probability
+        self.rollout_sales = rollout_sales
+        self.raise_steps = raise_steps
+        self.max_nodes = max_nodes
+        self.selling_agent = selling_agent if selling_agent is not None else EndgameAgent(name)
+        self.rng = rng if rng is not None else random.Random()
+        self.tree: dict[tuple, Node] = {}
+        self.last_stats = SearchStats()
+
+    def set_rng(self, rng: random.Random) -> None:
+        self.rng = rng
+        set_rng = getattr(self.selling_agent, "set_rng", None)
+        if set_rng is not None:
+            set_rng(rng)
+
+    def move(self, state: State) -> Action:
+        if state.phase != GamePhase.BIDDING or not state.auction_state:
+            return self.selling_agent.move(state)
+
+        if len(state.get_legal_actions()) == 1:
+            return Action.pass_turn()
+
+        visits = self.search(state)
+        return max(visits, key=visits.get)
+
+    def search(self, state: State) -> dict[Action, int]:
+        """Run one budgeted search from `state`; returns root visit counts."""
+        position, root, stats = self._prepare(state)
+        property_deck = list(state.property_deck)
+        check_deck = list(state.check_deck)
+        started = time.perf_counter()
+        deadline = started + self.time_limit if self.time_limit is not None else math.inf
+        budget = self.iterations if self.iterations is not None else math.inf
+
+        while stats.iterations < budget and time.perf_counter() < deadline:
+            self._determinize(position, property_deck, check_deck)
+            path = self._descend(root, position)
+            stats.max_depth = max(stats.max_depth, len(path))
+            self._backpropagate(path, self._rollout(position))
+            while position.depth:
+                position.unmake_move()
+            stats.iterations += 1
+
+        return self._finish(root, stats, started)
+
+    def _prepare(self, state: State) -> tuple[MutableState, Node, SearchStats]:
+        if len(self.tree) > self.max_nodes:
+            self.tree.clear()
+
+        position = MutableState(state)
+        root_key = information_key(position)
+        root = self.tree.get(root_key)
+        if root is None:
+            root = self.tree[root_key] = Node(position.current_player_idx)
+        return position, root, SearchStats(reused_visits=root.visits)
+
+    def _finish(self, root: Node, stats: SearchStats, started: float) -> dict[Action, int]:
+        stats.elapsed = time.perf_counter() - started
+        stats.nodes = len(self.tree)
+        self.last_stats = stats
+        return {action: edge[0] for action, edge in root.edges.items()}
+
+    def _determinize(self, position: MutableState, property_deck: list[int], check_deck: list[int]) -> None:
+        """Deal the hidden deck orders afresh; `position` must be at the root."""
+        self.rng.shuffle(property_deck)
+        self.rng.shuffle(check_deck)
+        position.property_deck = tuple(property_deck)
+        position.check_deck = tuple(check_deck)
+
+    @staticmethod
+    def _backpropagate(path: list[tuple[Node, Action]], rewards: list[float]) -> None:
+        for node, action in path:
+            node.visits += 1
+            edge = node.edges[action]
+            edge[0] += 1
+            edge[1] += rewards[node.player]
+
+    def _descend(self, node: Node, position: MutableState) -> list[tuple[Node, Action]]:
+        path = []
+        while position.phase == GamePhase.BIDDING:
+            legal_actions = self._tree_actions(position)
+            untried = [a for a in legal_actions if a not in node.edges]
+            if untried:
+                action = self.rng.choice(untried)
+                node.edges[action] = [0, 0.0]
+                path.append((node, action))
+                position.make_move(action)
+                break
+
+            log_visits = math.log(node.visits + 1)
+            exploration = self.exploration
+            best_action = None
+            best_score = -math.inf
+            for action in legal_actions:
+                visits, reward = node.edges[action]
+                score = reward / visits + exploration * math.sqrt(log_visits / visits)
+                if score > best_score:
+                    best_action, best_score = action, score
+            path.append((node, best_action))
+            position.make_move(best_action)
+
+            key = information_key(position)
+            child = self.tree.get(key)
+            if child is None:
+                self.tree[key] = Node(position.current_player_idx)
+                break
+            node = child
+        return path
+
+    def _tree_actions(self, position: MutableState) -> list[Action]:
+        """PASS and the smallest few raises; larger jumps rarely pay off."""
+        min_bid = (position.high_bid // 1000 + 1) * 1000
+        money = position.money[position.current_player_idx]
+        return [PASS] + [
+            Action.bid(min_bid + 1000 * step) for step in self.raise_steps if min_bid + 1000 * step <= money
+        ]
+
+    def _rollout(self, position: MutableState) -> list[float]:
+        rng = self.rng
+        bid_probability = self.rollout_bid_probability
+        while not position.is_terminal():
+            if position.phase == GamePhase.BIDDING:
+                min_bid = (position.high_bid // 1000 + 1) * 1000
+                if min_bid <= position.money[position.current_player_idx] and rng.random() < bid_probability:
+                    position.make_move(Action.bid(min_bid))
+                else:
+                    position.make_move(PASS)
+            elif not self.rollout_sales:
+                break
+            else:
+                position.make_move(tuple(Action.play_card(rng.choice(hand)) for hand in position.properties))
+
+        scores = position.scores() if position.is_terminal() else position_equities(position)
+        best = max(scores) or 1
+        return [score / best for score in scores]
@@ -0,0 +1,255 @@
+from __future__ import annotations
+
+import itertools
+import mmap
+import os
+import random
+import struct
+from array import array
+from bisect import bisect_right
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING
+
+from game import rules
+from game.checkpoint import atomic_write
+from game.core import Action, GamePhase
+from game.mutable import MutableState
+from game.seeding import AGENT_STREAM, DECK_STREAM, derive_seed
+
+from .cfr import BID_EDGES, MONEY_EDGES, NUM_ACTIONS, legal_abstract_actions, to_action
+from .endgame import EndgameAgent
+from .simple import AggressiveAgent, ConservativeAgent, RandomAgent
+
+if TYPE_CHECKING:
+    from game.core import Agent
+    from game.state import State
+
+# Situations: player count, the tiers of the properties on offer (which also
+# gives the number of players still in), the standing bid and the bidder's
+# money; actions are those of agents.cfr
+_TIER_SETS = {
+    tiers: i
+    for i, tiers in enumerate(
+        tiers for k in range(1, 7) for tiers in itertools.combinations_with_replacement(range(5), k)
+    )
+}
+_BID_BUCKETS = len(BID_EDGES) + 1
+_MONEY_BUCKETS = len(MONEY_EDGES) + 1
+NUM_SITUATIONS = 4 * len(_TIER_SETS) * _BID_BUCKETS * _MONEY_BUCKETS
+
+MAGIC = b"FSEVT\x01\x00\x00"
+_HEADER = struct.Struct("<IIII")
+_DATA_OFFSET = 32
+_VALUES_SIZE = 4 * NUM_SITUATIONS * NUM_ACTIONS
+_FILE_SIZE = _DATA_OFFSET + 2 * _VALUES_SIZE  # float32 values, then u32 sample counts
+
+_PASS = Action.pass_turn()
+
+
+def situation(num_players: int, properties: Sequence[int], high_bid: int, money: int) -> int:
+    index = (num_players - 3) * len(_TIER_SETS) + _TIER_SETS[tuple(sorted((p - 1) // 6 for p in properties))]
+    index = index * _BID_BUCKETS + bisect_right(BID_EDGES, high_bid // 1000)
+    return index * _MONEY_BUCKETS + bisect_right(MONEY_EDGES, money // 1000)
+
+
+class EVTable:
+    """Expected value of each abstract action per bidding situation.
+
+    The file is mapped read-only and viewed in place, so opening it parses
+    nothing and every process that opens the same file shares one copy in
+    the page cache. `open` keeps one mapping per path and process.
+    """
+
+    _open: dict[str, EVTable] = {}
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mmap[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not an EV table")
+        if len(self._mmap) >= _DATA_OFFSET and _HEADER.unpack_from(self._mmap, len(MAGIC))[:2] != (
+            NUM_SITUATIONS, NUM_ACTIONS
+        ):
+            raise ValueError(f"{path} was built for a different abstraction")
+        if len(self._mmap) != _FILE_SIZE:
+            raise ValueError(f"{path} is truncated or damaged: {len(self._mmap)} bytes, expected {_FILE_SIZE}")
+        view = memoryview(self._mmap)
+        self.values = view[_DATA_OFFSET:_DATA_OFFSET + _VALUES_SIZE].cast("f")
+        self.counts = view[_DATA_OFFSET + _VALUES_SIZE:].cast("I")
+
+    @classmethod
+    def open(cls, path: str) -> EVTable:
+        key = os.path.realpath(path)
+        table = cls._open.get(key)
+        if table is None:
+            table = cls._open[key] = cls(path)
+        return table
+
+    @staticmethod
+    def write(path: str, values: Sequence[float], counts: Sequence[int], rollouts: int) -> None:
+        atomic_write(path, b"".join((
+            MAGIC + _HEADER.pack(NUM_SITUATIONS, NUM_ACTIONS, rollouts, 0),
+            bytes(_DATA_OFFSET - len(MAGIC) - _HEADER.size),
+            array("f", values).tobytes(),
+            array("I", counts).tobytes(),
+        )))
+
+
+# Building
+_LINEUP_AGENTS = (RandomAgent, ConservativeAgent, AggressiveAgent)
+
+
+def _rollout(position: MutableState, rng: random.Random, bid_probability: float) -> tuple[int, ...]:
+    """Finish the game with cheap random play; returns the scores."""
+    while not position.is_terminal():
+        if position.phase == GamePhase.BIDDING:
+            min_bid = (position.high_bid // 1000 + 1) * 1000
+            if min_bid <= position.money[position.current_player_idx] and rng.random() < bid_probability:
+                position.make_move(Action.bid(min_bid))
+            else:
+                position.make_move(_PASS)
+        else:
+            position.make_move(tuple(Action.play_card(rng.choice(hand)) for hand in position.properties))
+    return position.scores()
+
+
+def _build_shard(
+    seed: int, first: int, count: int, player_counts: Sequence[int], rollouts: int, bid_probability: float
+) -> tuple[bytes, bytes]:
+    """Value sums and sample counts from games `first` to `first + count`."""
+    sums = array("d", bytes(8 * NUM_SITUATIONS * NUM_ACTIONS))
+    counts = array("I", bytes(4 * NUM_SITUATIONS * NUM_ACTIONS))
+
+    for game_index in range(first, first + count):
+        rng = random.Random(derive_seed(seed, game_index))
+        num_players = player_counts[game_index % len(player_counts)]
+        agents = [rng.choice(_LINEUP_AGENTS)() for _ in range(num_players)]
+        for seat, agent in enumerate(agents):
+            if isinstance(agent, RandomAgent):
+                agent.set_rng(random.Random(derive_seed(seed, game_index, AGENT_STREAM, seat)))
+        deck_rng = random.Random(derive_seed(seed, game_index, DECK_STREAM))
+        state = rules.begin(rules.new_game(num_players, deck_rng))
+
+        while state.phase == GamePhase.BIDDING:
+            player_idx = state.current_player_idx
+            auction_state = state.auction_state
+            high_bid = max(auction_state.current_bids.values(), default=0)
+            money = state.players[player_idx].money
+            legal = legal_abstract_actions(high_bid, money)
+            if len(legal) > 1:
+                base = situation(num_players, auction_state.current_properties, high_bid, money) * NUM_ACTIONS
+                position = MutableState(state)
+                property_deck = list(state.property_deck)
+                check_deck = list(state.check_deck)
+                for a in legal:
+                    for _ in range(rollouts):
+                        # The deck order is hidden from the bidder, so deal it afresh
+                        rng.shuffle(property_deck)
+                        rng.shuffle(check_deck)
+                        position.property_deck = tuple(property_deck)
+                        position.check_deck = tuple(check_deck)
+                        position.make_move(to_action(a, high_bid))
+                        scores = _rollout(position, rng, bid_probability)
+                        sums[base + a] += scores[player_idx] / (max(scores) or 1)
+                        counts[base + a] += 1
+                        while position.depth:
+                            position.unmake_move()
+            state = rules.apply(state, agents[player_idx].move(state))
+
+    return sums.tobytes(), counts.tobytes()
+
+
+def build_table(
+    path: str,
+    games: int,
+    seed: int = 0,
+    player_counts: Sequence[int] = (3, 4, 5, 6),
+    rollouts: int = 8,
+    bid_probability: float = 0.3,
+    workers: int = 1,
+    shard_size: int = 100,
+) -> int:
+    """Estimate the table from the bidding decisions of `games` seeded games.
+
+    Games are played by a random lineup of the simple agents. At every
+    decision with a choice, each abstract action is scored by `rollouts`
+    random playouts after it, as the bidder's final score as a share of the
+    best score. Returns the number of situations with samples.
+    """
+    sums = array("d", bytes(8 * NUM_SITUATIONS * NUM_ACTIONS))
+    counts = array("I", bytes(4 * NUM_SITUATIONS * NUM_ACTIONS))
+    shards = [(first, min(shard_size, games - first)) for first in range(0, games, shard_size)]
+    args = (tuple(player_counts), rollouts, bid_probability)
+
+    def merge(shard_sums: bytes, shard_counts: bytes) -> None:
+        part_sums = array("d")
+        part_sums.frombytes(shard_sums)
+        part_counts = array("I")
+        part_counts.frombytes(shard_counts)
+        for i, n in enumerate(part_counts):
+            if n:
+                sums[i] += part_sums[i]
+                counts[i] += n
+
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for result in pool.map(_build_shard, *zip(*((seed, first, count, *args) for first, count in shards))):
+                merge(*result)
+    else:
+        for first, count in shards:
+            merge(*_build_shard(seed, first, count, *args))
+
+    values = [total / n if n else 0.0 for total, n in zip(sums, counts)]
+    EVTable.write(path, values, counts, rollouts)
+    return sum(1 for base in range(0, len(counts), NUM_ACTIONS) if any(counts[base:base + NUM_ACTIONS]))
+
+
+class LookupAgent:
+    """Bids the abstract action with the best value in an `EVTable`.
+
+    Actions with fewer than `min_samples` samples are ignored; situations
+    with none left, and the selling phase, go to the fallback agents.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        name: str = "Lookup",
+        min_samples: int = 16,
+        bidding_agent: Agent | None = None,
+        selling_agent: Agent | None = None,
+    ):
+        self.name = name
+        self.table = EVTable.open(path)
+        self.min_samples = min_samples
+        self.bidding_agent = bidding_agent if bidding_agent is not None else ConservativeAgent(name)
+        self.selling_agent = selling_agent if selling_agent is not None else EndgameAgent(name)
+
+    def set_rng(self, rng: random.Random) -> None:
+        self.rng = rng
+        for agent in (self.bidding_agent, self.selling_agent):
+            set_rng = getattr(agent, "set_rng", None)
+            if set_rng is not None:
+                set_rng(rng)
+
+    def move(self, state: State) -> Action:
+        if state.phase != GamePhase.BIDDING or not state.auction_state:
+            return self.selling_agent.move(state)
+
+        auction_state = state.auction_state
+        high_bid = max(auction_state.current_bids.values(), default=0)
+        money = state.players[state.current_player_idx].money
+        legal = legal_abstract_actions(high_bid, money)
+        if len(legal) == 1:
+            return _PASS
+
+        base = situation(len(state.players), auction_state.current_properties, high_bid, money) * NUM_ACTIONS
+        values, counts = self.table.values, self.table.counts
+        best = None
+        for a in legal:
+            if counts[base + a] >= self.min_samples and (best is None or values[base + a] > values[base + best]):
+                best = a
+        if best is None:
+            return self.bidding_agent.move(state)
+        return to_action(best, high_bid)
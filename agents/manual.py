@@ -14,23 +14,21 @@ class ManualAgent:
         self.name = name
 
     def move(self, state: State) -> Action:
-        from game.core import Action
-
         print(f"\n--- {self.name}'s Turn ---")
         print(state.display_state())
         print(state.display_legal_actions())
 
-        legal_actions = state.get_legal_actions()
-        if not legal_actions:
+        num_actions = state.legal_action_count()
+        if not num_actions:
             raise ValueError("No legal actions available")
 
         while True:
             try:
-                choice = input(f"\n{self.name}, choose action (1-{len(legal_actions)}): ").strip()
+                choice = input(f"\n{self.name}, choose action (1-{num_actions}): ").strip()
                 action_idx = int(choice) - 1
 
-                if 0 <= action_idx < len(legal_actions):
-                    chosen_action = legal_actions[action_idx]
+                if 0 <= action_idx < num_actions:
+                    chosen_action = state.legal_action(action_idx)
                     print(f"You chose: {chosen_action.type.lower()}", end="")
                     if chosen_action.value is not None:
                         print(f" {chosen_action.value}")
@@ -38,10 +36,10 @@ class ManualAgent:
                         print()
                     return chosen_action
                 else:
-                    print(f"Please enter a number between 1 and {len(legal_actions)}")
+                    print(f"Please enter a number between 1 and {num_actions}")
 
             except ValueError:
-                print(f"Please enter a valid number between 1 and {len(legal_actions)}")
+                print(f"Please enter a valid number between 1 and {num_actions}")
             except (EOFError, KeyboardInterrupt):
                 print(f"\n{self.name} interrupted the game!")
                 raise KeyboardInterrupt()  # Re-raise to let main game loop handle it
\ No newline at end of file
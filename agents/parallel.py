@@ -0,0 +1,315 @@
+"""Multi-process search for `ISMCTSAgent`.
+
+`SearchPool` keeps a fixed set of worker processes alive for as long as the
+pool is open, so agents that use it pay process startup once rather than per
+move or per game. Positions travel as `game.packed` bytes (`PACKED_SIZE` bytes each)
+and each worker keeps its own `ISMCTSAgent`, including its tree, between
+requests.
+
+Two ways of using the workers are provided:
+
+- `RootParallelISMCTSAgent` sends the root to every worker, lets each run an
+  independent determinized search under the same budget and sums the root
+  visit counts.
+- `LeafParallelISMCTSAgent` keeps one tree in the calling process, selects a
+  batch of leaves with virtual loss and has the workers run the rollouts.
+
+Root parallelism is the better default: leaf batches cost one round trip
+each, which only pays off when rollouts are long compared to the IPC.
+"""
+
+from __future__ import annotations
+
+import atexit
+import math
+import multiprocessing
+import random
+import time
+import traceback
+from typing import TYPE_CHECKING, Any
+
+from game.core import Action, GamePhase
+from game.mutable import MutableState
+from game.packed import PackedState, pack, unpack
+
+from .ismcts import ISMCTSAgent, SearchStats
+
+if TYPE_CHECKING:
+    from multiprocessing.connection import Connection
+
+    from game.state import State
+
+    from .ismcts import Node
+
+
+def _worker_main(conn: Connection) -> None:
+    # One searcher per distinct set of search options, kept for tree reuse
+    searchers: dict[tuple, ISMCTSAgent] = {}
+
+    def searcher(options: dict[str, Any]) -> ISMCTSAgent:
+        key = tuple(sorted(options.items()))
+        agent = searchers.get(key)
+        if agent is None:
+            agent = searchers[key] = ISMCTSAgent(**options)
+        return agent
+
+    while True:
+        try:
+            request = conn.recv()
+        except EOFError:
+            return
+        if request is None:
+            return
+
+        try:
+            kind, packed, seed, options = request
+            agent = searcher(options)
+            agent.set_rng(random.Random(seed))
+            if kind == "search":
+                visits = agent.search(unpack(packed))
+                reply = ("ok", (visits, agent.last_stats))
+            elif kind == "rollout":
+                reply = ("ok", [_rollouts(agent, leaf, count) for leaf, count in packed])
+            else:
+                raise ValueError(f"Unknown request {kind!r}")
+        except Exception:
+            reply = ("error", traceback.format_exc())
+        conn.send(reply)
+
+
+def _rollouts(agent: ISMCTSAgent, leaf: PackedState, count: int) -> list[float]:
+    """Mean rollout reward per seat over `count` rollouts from `leaf`."""
+    position = MutableState(unpack(leaf))
+    totals = [0.0] * position.num_players
+    for _ in range(count):
+        for i, reward in enumerate(agent._rollout(position)):
+            totals[i] += reward
+        while position.depth:
+            position.unmake_move()
+    return [total / count for total in totals]
+
+
+class SearchPool:
+    """A fixed set of persistent search worker processes.
+
+    Every worker has its own pipe, so a request fanned out to all workers
+    runs on all of them at once rather than queueing behind a busy one.
+    Close the pool (or use it as a context manager) to stop the workers;
+    they are daemonic and also exit with the parent process.
+    """
+
+    def __init__(self, workers: int | None = None):
+        self.workers = workers or multiprocessing.cpu_count()
+        self._connections: list[Connection] = []
+        self._processes: list[multiprocessing.Process] = []
+        for _ in range(self.workers):
+            parent_conn, child_conn = multiprocessing.Pipe()
+            process = multiprocessing.Process(target=_worker_main, args=(child_conn,), daemon=True)
+            process.start()
+            child_conn.close()
+            self._connections.append(parent_conn)
+            self._processes.append(process)
+
+    def __enter__(self) -> SearchPool:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    @property
+    def closed(self) -> bool:
+        return not self._processes
+
+    def search(
+        self, state: State, seeds: list[int], options: dict[str, Any]
+    ) -> list[tuple[dict[Action, int], SearchStats]]:
+        """One independent search per seed, each on its own worker."""
+        if len(seeds) > self.workers:
+            raise ValueError(f"At most {self.workers} concurrent searches")
+        packed = pack(state)
+        return self._scatter([("search", packed, seed, options) for seed in seeds])
+
+    def rollouts(
+        self, leaves: list[PackedState], seeds: list[int], rollouts: int, options: dict[str, Any]
+    ) -> list[list[float]]:
+        """Mean rollout rewards for each leaf, spread evenly over the workers."""
+        chunks = [leaves[i::len(seeds)] for i in range(len(seeds))]
+        replies = self._scatter([
+            ("rollout", [(leaf, rollouts) for leaf in chunk], seed, options) for chunk, seed in zip(chunks, seeds)
+        ])
+        # Undo the round-robin split
+        rewards: list[list[float]] = [[] for _ in leaves]
+        for i, reply in enumerate(replies):
+            rewards[i::len(seeds)] = reply
+        return rewards
+
+    def _scatter(self, requests: list[tuple]) -> list[Any]:
+        if self.closed:
+            raise RuntimeError("Search pool is closed")
+        connections = self._connections[:len(requests)]
+        for conn, request in zip(connections, requests):
+            conn.send(request)
+        replies = [conn.recv() for conn in connections]
+        for status, payload in replies:
+            if status == "error":
+                raise RuntimeError(f"Search worker failed:\n{payload}")
+        return [payload for _, payload in replies]
+
+    def close(self) -> None:
+        for conn in self._connections:
+            try:
+                conn.send(None)
+            except OSError:
+                pass
+            conn.close()
+        for process in self._processes:
+            process.join(timeout=1)
+            if process.is_alive():
+                process.terminate()
+        self._connections = []
+        self._processes = []
+
+
+_shared_pools: dict[int | None, SearchPool] = {}
+
+
+def shared_pool(workers: int | None = None) -> SearchPool:
+    """A process-wide pool per worker count, started on first use."""
+    pool = _shared_pools.get(workers)
+    if pool is None or pool.closed:
+        pool = _shared_pools[workers] = SearchPool(workers)
+    return pool
+
+
+@atexit.register
+def _close_shared_pools() -> None:
+    for pool in _shared_pools.values():
+        pool.close()
+    _shared_pools.clear()
+
+
+class RootParallelISMCTSAgent:
+    """`ISMCTSAgent` with one independent search per worker.
+
+    Each worker searches the same root with its own determinizations under
+    the full `time_limit` or `iterations` budget, and the move with the most
+    visits summed over all workers is played. `last_stats` adds up the
+    workers' iterations over the wall-clock time of the move. Extra keyword
+    arguments are passed to the workers' `ISMCTSAgent`.
+    """
+
+    def __init__(
+        self,
+        name: str = "ParallelISMCTS",
+        pool: SearchPool | None = None,
+        workers: int | None = None,
+        time_limit: float | None = 0.2,
+        iterations: int | None = None,
+        rng: random.Random | None = None,
+        **search_options: Any,
+    ):
+        self.name = name
+        self.pool = pool
+        self.workers = workers
+        self.options = dict(search_options, time_limit=time_limit, iterations=iterations)
+        # Validates the options and plays the selling phase locally
+        self.local = ISMCTSAgent(name, **self.options)
+        self.rng = rng if rng is not None else random.Random()
+        self.last_stats = SearchStats()
+
+    def set_rng(self, rng: random.Random) -> None:
+        self.rng = rng
+        self.local.set_rng(rng)
+
+    def move(self, state: State) -> Action:
+        if state.phase != GamePhase.BIDDING or not state.auction_state:
+            return self.local.selling_agent.move(state)
+
+        if len(state.get_legal_actions()) == 1:
+            return Action.pass_turn()
+
+        visits = self.search(state)
+        return max(visits, key=visits.get)
+
+    def search(self, state: State) -> dict[Action, int]:
+        pool = self.pool if self.pool is not None else shared_pool(self.workers)
+        started = time.perf_counter()
+        seeds = [self.rng.getrandbits(64) for _ in range(pool.workers)]
+        results = pool.search(state, seeds, self.options)
+
+        merged: dict[Action, int] = {}
+        stats = SearchStats()
+        for visits, worker_stats in results:
+            for action, count in visits.items():
+                merged[action] = merged.get(action, 0) + count
+            stats.iterations += worker_stats.iterations
+            stats.nodes += worker_stats.nodes
+            stats.reused_visits += worker_stats.reused_visits
+            stats.max_depth = max(stats.max_depth, worker_stats.max_depth)
+        stats.elapsed = time.perf_counter() - started
+        self.last_stats = stats
+        return merged
+
+
+class LeafParallelISMCTSAgent(ISMCTSAgent):
+    """`ISMCTSAgent` whose rollouts run on the worker processes.
+
+    Each step selects `leaf_batch` leaves, adding a virtual loss along every
+    selected path so the batch spreads over the tree, packs the determinized
+    leaves and has the workers run `rollouts` rollouts from each. An
+    iteration in `last_stats` is one leaf, however many rollouts it got.
+    """
+
+    def __init__(
+        self,
+        name: str = "LeafParallelISMCTS",
+        pool: SearchPool | None = None,
+        workers: int | None = None,
+        leaf_batch: int | None = None,
+        rollouts: int = 4,
+        **search_options: Any,
+    ):
+        super().__init__(name, **search_options)
+        self.pool = pool
+        self.workers = workers
+        self.leaf_batch = leaf_batch
+        self.rollouts = rollouts
+        self.rollout_options = {
+            "rollout_bid_probability": self.rollout_bid_probability,
+            "rollout_sales": self.rollout_sales,
+        }
+
+    def search(self, state: State) -> dict[Action, int]:
+        pool = self.pool if self.pool is not None else shared_pool(self.workers)
+        leaf_batch = self.leaf_batch or 4 * pool.workers
+
+        position, root, stats = self._prepare(state)
+        property_deck = list(state.property_deck)
+        check_deck = list(state.check_deck)
+        started = time.perf_counter()
+        deadline = started + self.time_limit if self.time_limit is not None else math.inf
+        budget = self.iterations if self.iterations is not None else math.inf
+
+        while stats.iterations < budget and time.perf_counter() < deadline:
+            paths: list[list[tuple[Node, Action]]] = []
+            leaves: list[PackedState] = []
+            for _ in range(int(min(leaf_batch, budget - stats.iterations))):
+                self._determinize(position, property_deck, check_deck)
+                path = self._descend(root, position)
+                stats.max_depth = max(stats.max_depth, len(path))
+                # Virtual loss: count the visit now, add the reward later
+                for node, action in path:
+                    node.visits += 1
+                    node.edges[action][0] += 1
+                paths.append(path)
+                leaves.append(pack(position.to_state()))
+                while position.depth:
+                    position.unmake_move()
+
+            seeds = [self.rng.getrandbits(64) for _ in range(min(pool.workers, len(leaves)))]
+            for path, rewards in zip(paths, pool.rollouts(leaves, seeds, self.rollouts, self.rollout_options)):
+                for node, action in path:
+                    node.edges[action][1] += rewards[node.player]
+            stats.iterations += len(leaves)
+
+        return self._finish(root, stats, started)
@@ -11,14 +11,15 @@ if TYPE_CHECKING:
 class RandomAgent:
     """A simple agent that makes random legal moves."""
 
-    def __init__(self, name: str = "Random"):
+    def __init__(self, name: str = "Random", rng: random.Random | None = None):
         self.name = name
+        self.rng = rng if rng is not None else random.Random()
+
+    def set_rng(self, rng: random.Random) -> None:
+        self.rng = rng
 
     def move(self, state: State) -> Action:
-        legal_actions = state.get_legal_actions()
-        if not legal_actions:
-            raise ValueError("No legal actions available")
-        return random.choice(legal_actions)
+        return state.sample_legal_action(self.rng)
 
 
 class ConservativeAgent:
@@ -41,17 +42,15 @@ class ConservativeAgent:
     def _bidding_strategy(self, state: State) -> Action:
         from game.core import Action
 
-        legal_actions = state.get_legal_actions()
-
         # Always pass if we have less than 3000 money left
         current_player = state.get_current_player()
         if current_player.money < 3000:
             return Action.pass_turn()
 
         # Find minimum bid actions (conservative bidding)
-        bid_actions = [a for a in legal_actions if a.type == Action.Type.BID]
-        if bid_actions:
-            min_bid = min(a.value for a in bid_actions)
+        bids = state.bid_range()
+        if bids:
+            min_bid = bids[0]
             # Only bid if it's reasonable compared to our money
             if min_bid <= current_player.money // 3:
                 return Action.bid(min_bid)
@@ -93,7 +92,6 @@ class AggressiveAgent:
         if not state.auction_state:
             return Action.pass_turn()
 
-        legal_actions = state.get_legal_actions()
         current_player = state.get_current_player()
 
         # Check if there are high-value properties in the auction
@@ -101,13 +99,13 @@ class AggressiveAgent:
 
         # Bid aggressively for high-value properties (25+)
         if max_property >= 25:
-            bid_actions = [a for a in legal_actions if a.type == Action.Type.BID]
-            if bid_actions and current_player.money > 5000:
+            bids = state.bid_range()
+            if bids and current_player.money > 5000:
                 # Bid up to 40% of available money for high-value properties
-                max_affordable_bid = min(current_player.money * 4 // 10, max(a.value for a in bid_actions))
-                affordable_bids = [a for a in bid_actions if a.value <= max_affordable_bid]
-                if affordable_bids:
-                    return max(affordable_bids, key=lambda a: a.value)
+                max_affordable_bid = min(current_player.money * 4 // 10, bids[-1])
+                if max_affordable_bid >= bids[0]:
+                    # The highest legal bid that is still affordable
+                    return Action.bid(bids[(max_affordable_bid - bids[0]) // bids.step])
 
         return Action.pass_turn()
 
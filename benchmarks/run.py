@@ -0,0 +1,322 @@
+"""Reproducible benchmarks for the engine, state and agent hot paths.
+
+Every case uses fixed seeds, so two runs do the same work and differ only in
+speed. Results print as JSON (`--json`) or a table, can be saved with
+`--save`, and are compared against a stored baseline with `--baseline`; the
+exit status is 1 if any case is worse than its baseline by more than the
+larger of `--tolerance` and `--noise` times the two runs' spread.
+
+    python benchmarks/run.py --save benchmarks/baseline.json
+    python benchmarks/run.py --baseline benchmarks/baseline.json
+
+Timings are the median of `--repeat` runs, and each result records its
+spread: the median absolute deviation of those runs relative to the median.
+A fixed pure-Python workload is timed around every run as well, and
+comparisons scale each case by how much faster or slower that reference ran
+(the `host` column), so a shared or throttled machine does not show up as a
+regression. Baselines only mean something on the machine they were
+recorded on.
+"""
+
+from __future__ import annotations
+
+import argparse
+import copy
+import datetime
+import gc
+import json
+import math
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+
+import attrs
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from agents import make_agent  # noqa: E402
+from game import GameEngine, game_seed, rules  # noqa: E402
+from game.core import Action, GamePhase  # noqa: E402
+from game.packed import PACKED_SIZE, pack  # noqa: E402
+from game.state import State  # noqa: E402
+from tournament import run_tournament  # noqa: E402
+
+SEED = 20240101
+
+AGENT_MIXES = {
+    "random": ["random"],
+    "simple": ["random", "conservative", "aggressive"],
+    "endgame": ["endgame", "conservative", "aggressive"],
+}
+
+
+@attrs.frozen
+class Result:
+    value: float
+    unit: str
+    higher_is_better: bool
+    spread: float = 0.0
+    # Median seconds of `reference_work` while the case ran, 0 if not timed
+    host: float = 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "value": self.value,
+            "unit": self.unit,
+            "higher_is_better": self.higher_is_better,
+            "spread": self.spread,
+            "host": self.host,
+        }
+
+
+@attrs.frozen
+class Timing:
+    seconds: float
+    spread: float
+    host: float
+
+
+def reference_work() -> None:
+    """Fixed interpreter-bound work that tracks how fast the machine is right now."""
+    table: dict[int, tuple[int, int]] = {}
+    for i in range(20_000):
+        table[i % 101] = (i, i * 3)
+    sorted(table.values(), reverse=True)
+
+
+def host_time() -> float:
+    # Best of a few, since one pass is short enough to catch a scheduler hiccup
+    best = float("inf")
+    for _ in range(3):
+        started = time.perf_counter()
+        reference_work()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def median_time(fn: Callable[[], object], repeat: int) -> Timing:
+    # Like timeit, keep the cyclic GC out of the measurement
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        times = []
+        hosts = []
+        for _ in range(repeat):
+            before = host_time()
+            started = time.perf_counter()
+            fn()
+            times.append(time.perf_counter() - started)
+            hosts.append(math.sqrt(before * host_time()))
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    # Spread of the host-scaled times, so drift common to both does not count as noise
+    scaled = [t / h for t, h in zip(times, hosts)]
+    median = statistics.median(scaled)
+    deviation = statistics.median(abs(x - median) for x in scaled)
+    return Timing(statistics.median(times), deviation / median, statistics.median(hosts))
+
+
+def rate(count: int, timing: Timing, unit: str) -> Result:
+    return Result(count / timing.seconds, unit, True, timing.spread, timing.host)
+
+
+def lineup(mix: list[str], num_players: int) -> list[str]:
+    return [mix[i % len(mix)] for i in range(num_players)]
+
+
+# Sample positions
+def sample_states(num_games: int) -> dict[str, list]:
+    """Decision points from seeded games, sorted by the transition they feed."""
+    bids: list[tuple[State, int, int]] = []
+    passes: list[tuple[State, int]] = []
+    sales: list[State] = []
+    decisions: list[State] = []
+    for game_index in range(num_games):
+        num_players = 3 + game_index % 4
+        agents = [make_agent(name) for name in lineup(AGENT_MIXES["simple"], num_players)]
+        engine = GameEngine(agents, seed=game_seed(SEED, game_index))
+        state = rules.begin(engine.state)
+        while not rules.is_terminal(state):
+            decisions.append(state)
+            if state.phase == GamePhase.BIDDING:
+                action = agents[state.current_player_idx].move(state)
+                if action.type == Action.Type.BID:
+                    bids.append((state, state.current_player_idx, action.value))
+                else:
+                    passes.append((state, state.current_player_idx))
+            else:
+                action = tuple(agent.move(rules.player_view(state, i)) for i, agent in enumerate(agents))
+                sales.append(rules.collect_plays(state, {i: a.value for i, a in enumerate(action)}))
+            state = rules.apply(state, action)
+    return {"bids": bids, "passes": passes, "sales": sales, "decisions": decisions}
+
+
+def per_call(calls: int, timing: Timing) -> Result:
+    return Result(timing.seconds / calls * 1e9, "ns/call", False, timing.spread, timing.host)
+
+
+# Cases
+def bench_games(results: dict[str, Result], num_games: int, repeat: int) -> None:
+    for mix_name, mix in AGENT_MIXES.items():
+        games = num_games // 10 if mix_name == "endgame" else num_games
+        for num_players in (3, 4, 5, 6):
+            names = lineup(mix, num_players)
+
+            def play() -> None:
+                for game_index in range(games):
+                    agents = [make_agent(name) for name in names]
+                    GameEngine(agents, seed=game_seed(SEED, game_index)).play_game()
+
+            results[f"games/{mix_name}/{num_players}p"] = rate(games, median_time(play, repeat), "games/s")
+
+
+def bench_transitions(results: dict[str, Result], samples: dict[str, list], repeat: int) -> None:
+    engine = GameEngine([make_agent("random") for _ in range(3)])
+
+    def bids() -> None:
+        for state, player_idx, amount in samples["bids"]:
+            engine.state = state
+            engine._process_bid_action(player_idx, amount)
+
+    def passes() -> None:
+        for state, player_idx in samples["passes"]:
+            engine.state = state
+            engine._process_pass(player_idx)
+
+    def sales() -> None:
+        for state in samples["sales"]:
+            engine.state = state
+            engine._resolve_sale()
+
+    def legal_actions() -> None:
+        for state in samples["decisions"]:
+            state.get_legal_actions()
+
+    results["calls/_process_bid_action"] = per_call(len(samples["bids"]), median_time(bids, repeat))
+    results["calls/_process_pass"] = per_call(len(samples["passes"]), median_time(passes, repeat))
+    results["calls/_resolve_sale"] = per_call(len(samples["sales"]), median_time(sales, repeat))
+    results["calls/get_legal_actions"] = per_call(len(samples["decisions"]), median_time(legal_actions, repeat))
+
+
+def bench_memory(results: dict[str, Result], samples: dict[str, list]) -> None:
+    states = samples["decisions"]
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    # Copied one by one so states do not share players or decks
+    copies = [copy.deepcopy(state) for state in states]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del copies
+    results["memory/state"] = Result((after - before) / len(states), "bytes", False)
+    results["memory/packed_state"] = Result(float(len(pack(states[0]))), "bytes", False)
+    assert len(pack(states[0])) == PACKED_SIZE
+
+
+def bench_tournament(results: dict[str, Result], num_games: int, repeat: int) -> None:
+    agent_names = AGENT_MIXES["simple"]
+    for workers in sorted({1, os.cpu_count() or 1}):
+        timing = median_time(
+            lambda: run_tournament(agent_names, [3, 4, 5, 6], num_games, SEED, workers=workers), repeat
+        )
+        results[f"tournament/{workers}w"] = rate(num_games, timing, "games/s")
+
+
+# Reporting
+def compare(results: dict[str, Result], baseline: dict, tolerance: float, noise: float) -> tuple[list[str], bool]:
+    lines = [f"{'case':<32}{'baseline':>14}{'current':>14}{'host':>10}{'change':>10}{'allowed':>10}"]
+    regressed = False
+    for name, result in results.items():
+        entry = baseline.get(name)
+        if entry is None:
+            lines.append(f"{name:<32}{'-':>14}{result.value:>14,.1f}{'':>10}{'new':>10}")
+            continue
+        # How much slower the machine ran the reference work than when recording
+        host = result.host / entry["host"] if result.host and entry.get("host") else 1.0
+        value = result.value * host if result.higher_is_better else result.value / host
+        change = value / entry["value"] - 1 if entry["value"] else 0.0
+        worse = -change if result.higher_is_better else change
+        # A noisy case has to move further before it counts
+        allowed = max(tolerance, noise * (entry.get("spread", 0.0) + result.spread))
+        flag = ""
+        if worse > allowed:
+            flag = "  REGRESSION"
+            regressed = True
+        lines.append(
+            f"{name:<32}{entry['value']:>14,.1f}{result.value:>14,.1f}{host - 1:>+10.1%}{change:>+10.1%}"
+            f"{allowed:>10.1%}{flag}"
+        )
+    return lines, regressed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark engine, state and agent hot paths.")
+    parser.add_argument("--games", type=int, default=200, help="games per games/s case")
+    parser.add_argument("--samples", type=int, default=300, help="games to sample positions from")
+    parser.add_argument("--tournament-games", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--only", help="comma-separated case groups: games,calls,memory,tournament")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    parser.add_argument("--save", metavar="PATH", help="write results as a baseline")
+    parser.add_argument("--baseline", metavar="PATH", help="compare against a saved baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown before failing")
+    parser.add_argument(
+        "--noise", type=float, default=3.0, help="allowed slowdown per unit of baseline plus current spread"
+    )
+    args = parser.parse_args()
+
+    groups = set(args.only.split(",")) if args.only else {"games", "calls", "memory", "tournament"}
+    results: dict[str, Result] = {}
+    if "games" in groups:
+        bench_games(results, args.games, args.repeat)
+    if groups & {"calls", "memory"}:
+        samples = sample_states(args.samples)
+        if "calls" in groups:
+            bench_transitions(results, samples, args.repeat)
+        if "memory" in groups:
+            bench_memory(results, samples)
+    if "tournament" in groups:
+        bench_tournament(results, args.tournament_games, args.repeat)
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "timestamp": datetime.datetime.now(datetime.UTC).isoformat(timespec="seconds"),
+            "seed": SEED,
+            "args": {"games": args.games, "samples": args.samples, "tournament_games": args.tournament_games},
+        },
+        "results": {name: result.to_dict() for name, result in results.items()},
+    }
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+
+    regressed = False
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        lines, regressed = compare(results, baseline, args.tolerance, args.noise)
+        report["regressed"] = regressed
+        if not args.json:
+            print("\n".join(lines))
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    elif not args.baseline:
+        for name, result in results.items():
+            print(f"{name:<32}{result.value:>14,.1f} {result.unit}")
+
+    sys.exit(1 if regressed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""Precompute the bidding EV table read by `agents.lookup.LookupAgent`.
+
+    python build_ev_table.py --games 20000 --out ev.table
+
+The table is memory-mapped by every process that plays with it, so one copy
+in the page cache serves a whole tournament pool.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+
+from agents.lookup import NUM_SITUATIONS, build_table
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Precompute bidding expected values.")
+    parser.add_argument("--games", type=int, default=10_000, help="games to sample bidding situations from")
+    parser.add_argument("--rollouts", type=int, default=8, help="playouts per situation and action")
+    parser.add_argument("--players", default="3,4,5,6", help="comma-separated player counts")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--out", metavar="PATH", required=True)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    filled = build_table(
+        args.out, args.games, args.seed, [int(n) for n in args.players.split(",")], args.rollouts,
+        workers=args.workers,
+    )
+    print(
+        f"{filled}/{NUM_SITUATIONS} situations from {args.games} games in {time.perf_counter() - started:.1f}s",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+"""Tournament batches spread over worker processes on any number of hosts.
+
+The coordinator splits the run into the same seeded shards as
+`tournament.py` and puts them in a SQLite work queue (see `game.workqueue`)
+on a filesystem every host can reach. Workers lease one shard at a time,
+play it with `GameEngine`, renew the lease while they play, and write the
+results back; shards of a worker that dies are leased again once their
+lease expires, and a shard that raises is handed back at once. A shard that
+fails `--max-attempts` times is given up on, and the coordinator then stops
+with an error; otherwise it waits for every shard and reports the same
+statistics `tournament.py` would.
+
+    python distributed.py coordinator --queue /shared/run.sqlite --games 100000
+    python distributed.py worker --queue /shared/run.sqlite       # on each host
+
+`--spawn N` makes the coordinator start N local workers itself, for a run on
+one machine. Restarting the coordinator on an existing queue resumes it.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+import traceback
+
+from agents import AGENTS
+from game.workqueue import WorkQueue
+from tournament import GameResult, TournamentStats, play_shard, seatings, shard_jobs
+
+
+def coordinate(
+    queue_path: str,
+    agent_names: list[str],
+    player_counts: list[int],
+    num_games: int,
+    seed: int = 0,
+    shard_size: int = 50,
+    spawn: int = 0,
+    max_attempts: int = 3,
+    poll: float = 1.0,
+    progress: bool = False,
+) -> TournamentStats:
+    config = {
+        "agents": agent_names, "player_counts": player_counts, "games": num_games, "seed": seed,
+        "shard_size": shard_size,
+    }
+    with WorkQueue(queue_path) as queue:
+        saved = queue.get_meta("config")
+        if saved is None:
+            schedule = seatings(agent_names, player_counts)
+            queue.add(shard_jobs(schedule, num_games, seed, shard_size), {"config": config}, max_attempts)
+        elif saved != config:
+            raise ValueError(f"{queue_path} holds a different run: {saved}")
+
+        workers = [
+            subprocess.Popen([sys.executable, os.path.abspath(__file__), "worker", "--queue", queue_path])
+            for _ in range(spawn)
+        ]
+        started = time.perf_counter()
+        try:
+            while True:
+                counts = queue.counts()
+                if progress:
+                    rate = counts.done / (time.perf_counter() - started)
+                    print(
+                        f"\r{counts.done}/{counts.total} shards done, {counts.leased} leased ({rate:,.1f}/s)",
+                        end="", file=sys.stderr,
+                    )
+                if not counts.remaining:
+                    break
+                if workers and all(worker.poll() is not None for worker in workers):
+                    # Workers only exit on their own once nothing is left; look again in case they just finished
+                    counts = queue.counts()
+                    if counts.remaining:
+                        codes = ", ".join(str(worker.returncode) for worker in workers)
+                        raise RuntimeError(
+                            f"every spawned worker exited (status {codes}) with {counts.remaining} shards left"
+                        )
+                    break
+                time.sleep(poll)
+        except BaseException:
+            for worker in workers:
+                worker.terminate()
+            raise
+        finally:
+            for worker in workers:
+                worker.wait()
+        if progress:
+            print(file=sys.stderr)
+
+        if counts.failed:
+            failures = list(queue.failures())
+            batch_id, error = failures[0]
+            reason = error.strip().splitlines()[-1] if error else "lease expired"
+            raise RuntimeError(f"{len(failures)} shards ran out of attempts; batch {batch_id}: {reason}")
+
+        stats = TournamentStats()
+        for _, results in queue.results():
+            for game_index, lineup, scores in results:
+                stats.add(GameResult(game_index, tuple(lineup), tuple(scores)))
+        return stats
+
+
+def work(queue_path: str, worker_id: str | None = None, lease_seconds: float = 60.0, poll: float = 1.0) -> int:
+    """Play leased shards until the run is finished; returns the number of shards completed."""
+    worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+    completed = 0
+    with WorkQueue(queue_path) as queue:
+        while True:
+            lease = queue.lease(worker_id, lease_seconds)
+            if lease is None:
+                counts = queue.counts()
+                if counts.total and not counts.remaining:
+                    return completed
+                time.sleep(poll)
+                continue
+
+            stop = threading.Event()
+            heartbeat = threading.Thread(
+                target=_renew_lease, args=(queue_path, lease.batch_id, worker_id, lease_seconds, stop), daemon=True
+            )
+            heartbeat.start()
+            try:
+                jobs = [(game_index, tuple(lineup), seed) for game_index, lineup, seed in lease.payload]
+                results = [[r.game_index, list(r.lineup), list(r.scores)] for r in play_shard(jobs)]
+            except Exception:
+                # Hand the shard back now rather than when the lease runs out
+                error = traceback.format_exc()
+                print(f"{worker_id}: batch {lease.batch_id} failed, attempt {lease.attempts}:", file=sys.stderr)
+                print(error, file=sys.stderr)
+                queue.release(lease.batch_id, worker_id, error)
+                continue
+            finally:
+                stop.set()
+                heartbeat.join()
+            if queue.complete(lease.batch_id, worker_id, results):
+                completed += 1
+            else:
+                print(f"{worker_id}: lease on batch {lease.batch_id} expired, result dropped", file=sys.stderr)
+
+
+def _renew_lease(queue_path: str, batch_id: int, worker_id: str, lease_seconds: float, stop: threading.Event) -> None:
+    # SQLite connections stay on the thread that made them
+    with WorkQueue(queue_path) as queue:
+        while not stop.wait(lease_seconds / 3):
+            if not queue.renew(batch_id, worker_id, lease_seconds):
+                return
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run a tournament across worker processes and hosts.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    coordinator = commands.add_parser("coordinator", help="queue a run, wait for it and report")
+    coordinator.add_argument("--queue", required=True, metavar="PATH", help="SQLite queue on a shared filesystem")
+    coordinator.add_argument("--agents", default=",".join(AGENTS), help="comma-separated agent names")
+    coordinator.add_argument("--players", default="3,4,5,6", help="comma-separated player counts")
+    coordinator.add_argument("--games", type=int, default=1000)
+    coordinator.add_argument("--seed", type=int, default=0)
+    coordinator.add_argument("--shard-size", type=int, default=50)
+    coordinator.add_argument("--spawn", type=int, default=0, help="local worker processes to start")
+    coordinator.add_argument(
+        "--max-attempts", type=int, default=3, help="leases per shard before the run fails; fixed when first queued"
+    )
+    coordinator.add_argument("--json", action="store_true", help="print results as JSON")
+
+    worker = commands.add_parser("worker", help="play leased shards until the run is finished")
+    worker.add_argument("--queue", required=True, metavar="PATH")
+    worker.add_argument("--id", help="worker name, default host:pid")
+    worker.add_argument("--lease", type=float, default=60.0, help="lease length in seconds")
+    args = parser.parse_args()
+
+    if args.command == "worker":
+        work(args.queue, args.id, args.lease)
+        return
+
+    agent_names = args.agents.split(",")
+    for name in agent_names:
+        if name not in AGENTS:
+            parser.error(f"unknown agent {name!r}, choose from {', '.join(AGENTS)}")
+    player_counts = [int(n) for n in args.players.split(",")]
+    if any(n < 3 or n > 6 for n in player_counts):
+        parser.error("player counts must be between 3 and 6")
+    if args.max_attempts < 1:
+        parser.error("--max-attempts must be at least 1")
+
+    stats = coordinate(
+        args.queue,
+        agent_names,
+        player_counts,
+        args.games,
+        args.seed,
+        args.shard_size,
+        args.spawn,
+        args.max_attempts,
+        progress=True,
+    )
+    print(json.dumps(stats.to_dict(), indent=2) if args.json else stats.format())
+
+
+if __name__ == "__main__":
+    main()
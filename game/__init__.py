@@ -1,13 +1,43 @@
-from .core import Action, Agent, GamePhase, Player
+from .aio import AsyncGameEngine
+from .core import Action, Agent, BatchAgent, GamePhase, Player, SeedableAgent
 from .engine import Game, GameEngine
+from .equity import EquityTracker
+from .events import ConsoleSink, EventSink, NullSink
+from .mutable import MutableState
+from .record import GameRecord, RecordingSink, RecordWriter, read_records
+from .remote import AgentClient, AgentServer, RemoteAgent
+from .scheduler import BatchScheduler, SequentialBatchAgent
+from .seeding import derive_seed, game_seed
 from .state import State
+from .zobrist import TranspositionTable, zobrist_hash
 
 __all__ = [
     "Action",
     "Agent",
+    "AgentClient",
+    "AgentServer",
+    "AsyncGameEngine",
+    "BatchAgent",
+    "BatchScheduler",
+    "ConsoleSink",
+    "EquityTracker",
+    "EventSink",
     "Game",
     "GameEngine",
     "GamePhase",
+    "GameRecord",
+    "MutableState",
+    "NullSink",
     "Player",
+    "RecordWriter",
+    "RecordingSink",
+    "RemoteAgent",
+    "SeedableAgent",
+    "SequentialBatchAgent",
     "State",
+    "TranspositionTable",
+    "derive_seed",
+    "game_seed",
+    "read_records",
+    "zobrist_hash",
 ]
\ No newline at end of file
@@ -0,0 +1,153 @@
+"""asyncio driver for `GameEngine` with per-move deadlines.
+
+`AsyncGameEngine` plays the same game as `GameEngine`, through the same
+phase loops, sink and instrumentation hooks, but awaits each move:
+
+- agents with an `async def move_async(state)` or an `async def move(state)`
+  are awaited on the event loop
+- plain agents run inline, or in a thread pool when the engine has a time
+  limit, so a slow agent cannot block the loop
+- each move gets `time_limit` seconds (one value, or one per seat); on
+  timeout the engine plays `fallback(state)` instead and counts the timeout
+- the moves of a sale round are requested from every seat at once
+
+`play_games` runs many engines concurrently on one loop. A thread that
+overran its deadline keeps running in the background until its agent
+returns, since Python cannot cancel it; coroutine agents are cancelled.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+from collections.abc import Awaitable, Callable, Iterable, Sequence
+from concurrent.futures import Executor
+from typing import TYPE_CHECKING, Protocol
+
+from .core import Action, GamePhase
+from .engine import GameEngine
+
+if TYPE_CHECKING:
+    import random
+
+    from .core import Agent
+    from .engine import PhaseSteps
+    from .events import EventSink
+    from .instrument import EngineInstrumentation
+    from .state import State
+
+
+class AsyncAgent(Protocol):
+    async def move_async(self, state: State) -> Action: ...
+
+
+def default_fallback(state: State) -> Action:
+    """Pass in an auction, play the lowest property in a sale."""
+    if state.phase == GamePhase.SELLING:
+        return Action.play_card(min(state.get_current_player().properties))
+    return Action.pass_turn()
+
+
+class AsyncGameEngine(GameEngine):
+    def __init__(
+        self,
+        agents: list[Agent | AsyncAgent],
+        sink: EventSink | None = None,
+        track_hash: bool = False,
+        seed: int | random.Random | None = None,
+        instrument: EngineInstrumentation | None = None,
+        time_limit: float | Sequence[float | None] | None = None,
+        fallback: Callable[[State], Action] = default_fallback,
+        executor: Executor | None = None,
+        checkpoint: Callable[[GameEngine], None] | None = None,
+        track_equity: bool = False,
+    ):
+        super().__init__(agents, sink, track_hash, seed, instrument, checkpoint, track_equity)
+        if time_limit is None or isinstance(time_limit, (int, float)):
+            time_limit = [time_limit] * len(agents)
+        if len(time_limit) != len(agents):
+            raise ValueError("Need one time limit per seat")
+        self.time_limits = list(time_limit)
+        self.fallback = fallback
+        self.executor = executor
+        # Moves replaced by the fallback, per seat
+        self.timeouts = [0] * len(agents)
+
+    async def play_game_async(self) -> State:
+        """Play to the end, or on from wherever `restore` left the game."""
+        try:
+            if self.state.phase == GamePhase.SETUP:
+                self.sink.phase_started(GamePhase.BIDDING)
+                self._set_phase(GamePhase.BIDDING)
+
+            while self.state.phase != GamePhase.FINISHED:
+                if self.state.phase == GamePhase.BIDDING:
+                    await self._play_bidding_phase_async()
+                elif self.state.phase == GamePhase.SELLING:
+                    await self._play_selling_phase_async()
+
+            return self.state
+        except KeyboardInterrupt:
+            self.sink.game_interrupted(self.state)
+            return self.state
+
+    async def _play_bidding_phase_async(self) -> None:
+        await self._drive_async(self._bidding_phase())
+
+    async def _play_selling_phase_async(self) -> None:
+        await self._drive_async(self._selling_phase())
+
+    async def _drive_async(self, phase: PhaseSteps) -> None:
+        # The sync loops, with every move of a batch awaited at once
+        try:
+            requests = next(phase)
+            while True:
+                if len(requests) == 1:
+                    actions = [await self._move(*requests[0])]
+                else:
+                    actions = await asyncio.gather(*(self._move(seat, view) for seat, view in requests))
+                requests = phase.send(actions)
+        except StopIteration:
+            pass
+
+    async def _move(self, player_idx: int, state: State) -> Action:
+        agent = self.agents[player_idx]
+        time_limit = self.time_limits[player_idx]
+
+        move_async = getattr(agent, "move_async", None)
+        if move_async is not None:
+            pending = move_async(state)
+        elif inspect.iscoroutinefunction(agent.move):
+            pending = agent.move(state)
+        elif time_limit is None:
+            return await _resolve(agent.move(state))
+        else:
+            pending = self._move_in_thread(agent, state)
+
+        if time_limit is None:
+            return await pending
+        try:
+            return await asyncio.wait_for(pending, time_limit)
+        except TimeoutError:
+            self.timeouts[player_idx] += 1
+            return self.fallback(state)
+
+    async def _move_in_thread(self, agent: Agent, state: State) -> Action:
+        return await _resolve(await asyncio.get_running_loop().run_in_executor(self.executor, agent.move, state))
+
+
+async def _resolve(action: Action | Awaitable[Action]) -> Action:
+    # A plain `move` that returns an awaitable, e.g. a wrapped coroutine agent
+    return await action if inspect.isawaitable(action) else action
+
+
+async def play_games(engines: Iterable[AsyncGameEngine], max_concurrent: int | None = None) -> list[State]:
+    """Play every engine's game on the running loop; final states in order."""
+    engines = list(engines)
+    limit = asyncio.Semaphore(max_concurrent or len(engines) or 1)
+
+    async def play(engine: AsyncGameEngine) -> State:
+        async with limit:
+            return await engine.play_game_async()
+
+    return list(await asyncio.gather(*(play(engine) for engine in engines)))
@@ -0,0 +1,289 @@
+"""NumPy batch simulator.
+
+`BatchEngine` holds N games with the same player count as arrays and plays
+them in lockstep: every game runs auction `r` together, one bidding turn at a
+time across the games whose auction is still open, and then sale round `r`
+together. Decisions come from vectorized policies that answer for every game
+at once. The rules are those of `rules.py`, and a batch seeded with the same
+seeds as a `GameEngine` produces the same final scores.
+
+Requires NumPy (`pip install for-sale[batch]`).
+"""
+
+from __future__ import annotations
+
+import random
+from collections.abc import Sequence
+from typing import Protocol
+
+import attrs
+import numpy as np
+
+from . import rules
+from .seeding import AGENT_STREAM, DECK_STREAM, derive_seed
+
+NUM_PROPERTIES = 30
+
+
+@attrs.frozen
+class BiddingView:
+    """The bidding decision of one seat in a subset of the batch's games."""
+
+    games: np.ndarray  # (k,) indices into the batch
+    player_idx: int
+    money: np.ndarray  # (k,) acting player's money
+    high_bid: np.ndarray  # (k,) current highest bid, 0 if none
+    auction_properties: np.ndarray  # (k, 31) bool mask of the cards on offer
+
+
+@attrs.frozen
+class SellingView:
+    """The sale decision of one seat across every game of the batch."""
+
+    games: np.ndarray  # (N,)
+    player_idx: int
+    hand: np.ndarray  # (N, 31) bool mask of the seat's properties
+    acquired: np.ndarray  # (N, 31) acquisition order of each held card, -1 if not held
+    current_checks: np.ndarray  # (N, num_players) checks on offer
+
+
+class BatchPolicy(Protocol):
+    def bid(self, view: BiddingView) -> np.ndarray:
+        """Bid amount per game, 0 to pass."""
+        ...
+
+    def play(self, view: SellingView) -> np.ndarray:
+        """Property to play per game."""
+        ...
+
+
+def min_bids(high_bid: np.ndarray) -> np.ndarray:
+    # Bids must be in increments of $1000
+    return (high_bid // 1000 + 1) * 1000
+
+
+def highest_card(mask: np.ndarray) -> np.ndarray:
+    return mask.shape[-1] - 1 - np.argmax(mask[..., ::-1], axis=-1)
+
+
+def lowest_card(mask: np.ndarray) -> np.ndarray:
+    return np.argmax(mask, axis=-1)
+
+
+class ConservativeBatchPolicy:
+    """Vectorized `agents.simple.ConservativeAgent`."""
+
+    def bid(self, view: BiddingView) -> np.ndarray:
+        min_bid = min_bids(view.high_bid)
+        wants = (view.money >= 3000) & (min_bid <= view.money) & (min_bid <= view.money // 3)
+        return np.where(wants, min_bid, 0)
+
+    def play(self, view: SellingView) -> np.ndarray:
+        return highest_card(view.hand)
+
+
+class AggressiveBatchPolicy:
+    """Vectorized `agents.simple.AggressiveAgent`."""
+
+    def bid(self, view: BiddingView) -> np.ndarray:
+        money = view.money
+        min_bid = min_bids(view.high_bid)
+        max_legal = min_bid + (money - min_bid) // 1000 * 1000
+        max_affordable = np.minimum(money * 4 // 10, max_legal)
+        wants = (
+            (highest_card(view.auction_properties) >= 25)
+            & (min_bid <= money)
+            & (money > 5000)
+            & (max_affordable >= min_bid)
+        )
+        return np.where(wants, min_bid + (max_affordable - min_bid) // 1000 * 1000, 0)
+
+    def play(self, view: SellingView) -> np.ndarray:
+        best = highest_card(view.hand)
+        # Otherwise the middle card of the sorted hand
+        counts = view.hand.sum(axis=1)
+        ranks = np.cumsum(view.hand, axis=1)
+        middle = np.argmax(view.hand & (ranks == (counts // 2 + 1)[:, None]), axis=1)
+        return np.where(view.current_checks.max(axis=1) > 10000, best, middle)
+
+
+class RandomBatchPolicy:
+    """`agents.simple.RandomAgent`, one RNG per game.
+
+    Kept exact rather than fast: each game draws from the same stream a seeded
+    `GameEngine` would give the agent, in a Python loop.
+    """
+
+    def __init__(self) -> None:
+        self.rngs: list[random.Random] = []
+
+    def bind(self, seeds: Sequence[int], seat: int) -> None:
+        self.rngs = [random.Random(derive_seed(seed, AGENT_STREAM, seat)) for seed in seeds]
+
+    def bid(self, view: BiddingView) -> np.ndarray:
+        min_bid = min_bids(view.high_bid)
+        num_bids = np.maximum(0, (view.money - min_bid) // 1000 + 1)
+        choices = np.array([self.rngs[g].randrange(n + 1) for g, n in zip(view.games.tolist(), num_bids.tolist())])
+        # Choice 0 is PASS, then bids in ascending order
+        return np.where(choices > 0, min_bid + (choices - 1) * 1000, 0)
+
+    def play(self, view: SellingView) -> np.ndarray:
+        plays = np.empty(len(view.games), dtype=np.int64)
+        for k, g in enumerate(view.games.tolist()):
+            held = np.flatnonzero(view.hand[k])
+            in_hand_order = held[np.argsort(view.acquired[k, held])]
+            plays[k] = in_hand_order[self.rngs[g].randrange(len(in_hand_order))]
+        return plays
+
+
+class BatchEngine:
+    def __init__(self, num_players: int, seeds: Sequence[int], policies: Sequence[BatchPolicy]):
+        if num_players < 3 or num_players > 6:
+            raise ValueError("For Sale requires 3-6 players")
+        if len(policies) != num_players:
+            raise ValueError("Need one policy per seat")
+
+        self.num_players = num_players
+        self.seeds = list(seeds)
+        self.policies = list(policies)
+        for seat, policy in enumerate(self.policies):
+            bind = getattr(policy, "bind", None)
+            if bind is not None:
+                bind(self.seeds, seat)
+
+        # Same decks a GameEngine with these seeds would deal
+        states = [rules.new_game(num_players, random.Random(derive_seed(seed, DECK_STREAM))) for seed in self.seeds]
+        self.property_deck = np.array([s.property_deck for s in states], dtype=np.int64)
+        self.check_deck = np.array([s.check_deck for s in states], dtype=np.int64)
+
+        num_games = len(self.seeds)
+        self.num_games = num_games
+        self.money = np.full((num_games, num_players), rules.initial_money(num_players), dtype=np.int64)
+        self.acquired = np.full((num_games, num_players, NUM_PROPERTIES + 1), -1, dtype=np.int64)
+        self.check_totals = np.zeros((num_games, num_players), dtype=np.int64)
+        self._clock = 0
+
+    @property
+    def holdings(self) -> np.ndarray:
+        return self.acquired >= 0
+
+    def scores(self) -> np.ndarray:
+        return self.money + self.check_totals
+
+    def run(self) -> np.ndarray:
+        """Play every game to the end and return the (N, num_players) scores."""
+        rounds = self.property_deck.shape[1] // self.num_players
+        for r in range(rounds):
+            self._play_auction(r)
+        for r in range(rounds):
+            self._play_sale(r)
+        return self.scores()
+
+    def _acquire(self, games: np.ndarray, players: np.ndarray, properties: np.ndarray) -> None:
+        self.acquired[games, players, properties] = self._clock
+        self._clock += 1
+
+    # Auctions
+    def _play_auction(self, auction_round: int) -> None:
+        n = self.num_players
+        num_games = self.num_games
+        all_games = np.arange(num_games)
+
+        auction_properties = np.zeros((num_games, NUM_PROPERTIES + 1), dtype=bool)
+        drawn = self.property_deck[:, auction_round * n:(auction_round + 1) * n]
+        auction_properties[all_games[:, None], drawn] = True
+
+        bids = np.zeros((num_games, n), dtype=np.int64)
+        high_bid = np.zeros(num_games, dtype=np.int64)
+        passed = np.zeros((num_games, n), dtype=bool)
+        current = np.zeros(num_games, dtype=np.int64)
+        open_auction = np.ones(num_games, dtype=bool)
+
+        while open_auction.any():
+            actions = np.zeros(num_games, dtype=np.int64)
+            acting = np.flatnonzero(open_auction)
+            for seat, policy in enumerate(self.policies):
+                games = acting[current[acting] == seat]
+                if not len(games):
+                    continue
+                view = BiddingView(
+                    games=games,
+                    player_idx=seat,
+                    money=self.money[games, seat],
+                    high_bid=high_bid[games],
+                    auction_properties=auction_properties[games],
+                )
+                actions[games] = policy.bid(view)
+
+            players = current[acting]
+            amounts = actions[acting]
+
+            # Bids
+            bidding = amounts > 0
+            bid_games = acting[bidding]
+            bid_amounts = amounts[bidding]
+            bid_players = players[bidding]
+            if (bid_amounts > self.money[bid_games, bid_players]).any():
+                raise ValueError("Insufficient funds")
+            if (bid_amounts % 1000).any():
+                raise ValueError("Bids must be in increments of $1000")
+            if (bid_amounts <= high_bid[bid_games]).any():
+                raise ValueError("Bid must be higher than current bid")
+            bids[bid_games, bid_players] = bid_amounts
+            high_bid[bid_games] = bid_amounts
+
+            # Passes: take the lowest card and half the bid back
+            pass_games = acting[~bidding]
+            pass_players = players[~bidding]
+            lowest = lowest_card(auction_properties[pass_games])
+            auction_properties[pass_games, lowest] = False
+            self._acquire(pass_games, pass_players, lowest)
+            self.money[pass_games, pass_players] += bids[pass_games, pass_players] // 2
+            passed[pass_games, pass_players] = True
+
+            # The last bidder takes the highest card and pays in full
+            finished = acting[n - passed[acting].sum(axis=1) <= 1]
+            if len(finished):
+                winners = np.argmin(passed[finished], axis=1)
+                highest = highest_card(auction_properties[finished])
+                self.money[finished, winners] -= bids[finished, winners]
+                self._acquire(finished, winners, highest)
+                auction_properties[finished, highest] = False
+                open_auction[finished] = False
+
+            # Everyone else moves on to the next player still bidding
+            moving = np.flatnonzero(open_auction)
+            start = current[moving]
+            found = np.zeros(len(moving), dtype=bool)
+            for step in range(1, n + 1):
+                candidate = (start + step) % n
+                take = ~found & ~passed[moving, candidate]
+                current[moving[take]] = candidate[take]
+                found |= take
+
+    # Sales
+    def _play_sale(self, sale_round: int) -> None:
+        n = self.num_players
+        all_games = np.arange(self.num_games)
+        current_checks = self.check_deck[:, sale_round * n:(sale_round + 1) * n]
+        holdings = self.holdings
+
+        plays = np.empty((self.num_games, n), dtype=np.int64)
+        for seat, policy in enumerate(self.policies):
+            view = SellingView(
+                games=all_games,
+                player_idx=seat,
+                hand=holdings[:, seat],
+                acquired=self.acquired[:, seat],
+                current_checks=current_checks,
+            )
+            plays[:, seat] = policy.play(view)
+
+        if not holdings[all_games[:, None], np.arange(n)[None, :], plays].all():
+            raise ValueError("Player played a property they do not hold")
+
+        # Highest property takes the highest check
+        order = np.argsort(-plays, axis=1)
+        sorted_checks = -np.sort(-current_checks, axis=1)
+        self.check_totals[all_games[:, None], order] += sorted_checks
+        self.acquired[all_games[:, None], np.arange(n)[None, :], plays] = -1
@@ -0,0 +1,53 @@
+"""Durable snapshots of games in progress.
+
+`GameEngine.snapshot` captures a game between two auctions or sale rounds:
+the exact `State`, including hand order, and the state of every agent RNG.
+Restoring it into an engine built with the same agents and calling
+`play_game` finishes the game exactly as the uninterrupted run would have.
+Other agent state, such as search trees and caches, is not saved; agents
+treat it as a cache and rebuild it.
+
+`atomic_write` replaces a file so that a crash leaves either the old or the
+new contents, never a mix; `save_pickle` writes any picklable progress
+record that way.
+"""
+
+from __future__ import annotations
+
+import os
+import pickle
+from typing import TYPE_CHECKING, Any
+
+import attrs
+
+if TYPE_CHECKING:
+    from .state import State
+
+
+@attrs.frozen
+class GameSnapshot:
+    state: State
+    # random.Random.getstate() per seat, None for agents without an RNG
+    agent_rng_states: tuple[Any, ...]
+    seed: int | None
+    auction_round: int
+    sale_round: int
+
+
+def atomic_write(path: str | os.PathLike, data: bytes) -> None:
+    path = os.fspath(path)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def save_pickle(path: str | os.PathLike, obj: object) -> None:
+    atomic_write(path, pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def load_pickle(path: str | os.PathLike) -> Any:
+    with open(path, "rb") as f:
+        return pickle.load(f)
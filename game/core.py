@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 import enum
+import random
+from collections.abc import Sequence
 from typing import Protocol
 
 import attrs
@@ -16,17 +18,30 @@ class Action:
     type: Type
     value: int | None = None
 
+    # The constructors below return one shared instance per distinct action,
+    # so hot loops neither allocate nor compare field by field.
     @classmethod
     def bid(cls, amount: int) -> Action:
-        return cls(Action.Type.BID, amount)
+        action = _BIDS.get(amount)
+        if action is None:
+            action = _BIDS[amount] = cls(Action.Type.BID, amount)
+        return action
 
     @classmethod
     def pass_turn(cls) -> Action:
-        return cls(Action.Type.PASS)
+        return _PASS
 
     @classmethod
     def play_card(cls, value: int) -> Action:
-        return cls(Action.Type.PLAY, value)
+        action = _PLAYS.get(value)
+        if action is None:
+            action = _PLAYS[value] = cls(Action.Type.PLAY, value)
+        return action
+
+
+_PASS = Action(Action.Type.PASS)
+_BIDS: dict[int, Action] = {amount: Action(Action.Type.BID, amount) for amount in range(1000, 16001, 1000)}
+_PLAYS: dict[int, Action] = {value: Action(Action.Type.PLAY, value) for value in range(1, 31)}
 
 
 @attrs.frozen
@@ -62,4 +77,14 @@ class Agent(Protocol):
     def move(self, state: State) -> Action: ...
 
 
+class SeedableAgent(Agent, Protocol):
+    # A seeded GameEngine hands each such agent its own derived RNG stream
+    def set_rng(self, rng: random.Random) -> None: ...
+
+
+class BatchAgent(Protocol):
+    # Decides many positions in one call, e.g. one forward pass of a model
+    def move_batch(self, states: Sequence[State]) -> list[Action]: ...
+
+
 # Forward reference for State will be resolved when state.py imports this
\ No newline at end of file
@@ -0,0 +1,373 @@
+"""Training data export: (observation, action, outcome) rows in memory-mapped arrays.
+
+`encode_observation` turns the state a player decides in into a fixed-width
+float32 vector (see `OBSERVATION_LAYOUT`). `DatasetSink` records one row per
+decision as the engine plays, and `encode_record` does the same for a stored
+`GameRecord`. Rows are appended with `DatasetWriter`, which keeps one raw
+binary file per column and grows them `chunk_rows` rows at a time, and read
+back with `load_dataset` as read-only `np.memmap` views, so a training
+loader slices them without copying. `BackgroundExporter` moves the writing
+onto a thread so generation never waits on the disk.
+
+Requires NumPy (`pip install for-sale[dataset]`).
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import queue
+import threading
+from collections.abc import Callable, Iterable
+
+import attrs
+import numpy as np
+
+from . import rules
+from .checkpoint import atomic_write
+from .core import Action, GamePhase
+from .events import NullSink
+from .record import GameRecord
+from .state import State
+
+NUM_PROPERTIES = 30
+NUM_CHECK_VALUES = 16
+
+# Feature name -> width, in order
+OBSERVATION_LAYOUT = {
+    "phase": 2,  # one-hot: bidding, selling
+    "num_players": 4,  # one-hot: 3 to 6
+    "money": 1,  # in thousands
+    "properties": NUM_PROPERTIES,  # held properties, 1 to 30
+    "checks": NUM_CHECK_VALUES,  # count of held checks per value / 1000
+    "auction_properties": NUM_PROPERTIES,
+    "high_bid": 1,  # in thousands
+    "own_bid": 1,  # in thousands
+    "players_in_auction": 1,
+    "current_checks": NUM_CHECK_VALUES,  # count of checks on offer per value / 1000
+}
+OBSERVATION_OFFSETS = {}
+_offset = 0
+for _name, _width in OBSERVATION_LAYOUT.items():
+    OBSERVATION_OFFSETS[_name] = _offset
+    _offset += _width
+OBSERVATION_SIZE = _offset
+
+_PHASE = OBSERVATION_OFFSETS["phase"]
+_NUM_PLAYERS = OBSERVATION_OFFSETS["num_players"]
+_MONEY = OBSERVATION_OFFSETS["money"]
+_PROPERTIES = OBSERVATION_OFFSETS["properties"]
+_CHECKS = OBSERVATION_OFFSETS["checks"]
+_AUCTION_PROPERTIES = OBSERVATION_OFFSETS["auction_properties"]
+_HIGH_BID = OBSERVATION_OFFSETS["high_bid"]
+_OWN_BID = OBSERVATION_OFFSETS["own_bid"]
+_PLAYERS_IN_AUCTION = OBSERVATION_OFFSETS["players_in_auction"]
+_CURRENT_CHECKS = OBSERVATION_OFFSETS["current_checks"]
+
+
+def encode_observation(state: State, out: np.ndarray | None = None) -> np.ndarray:
+    """Features of `state` from the point of view of `state.current_player_idx`."""
+    if out is None:
+        out = np.zeros(OBSERVATION_SIZE, dtype=np.float32)
+    else:
+        out[:] = 0
+
+    player_idx = state.current_player_idx
+    player = state.players[player_idx]
+    out[_PHASE + (state.phase == GamePhase.SELLING)] = 1
+    out[_NUM_PLAYERS + len(state.players) - 3] = 1
+    out[_MONEY] = player.money / 1000
+    for p in player.properties:
+        out[_PROPERTIES + p - 1] = 1
+    for c in player.checks:
+        out[_CHECKS + c // 1000] += 1
+
+    auction_state = state.auction_state
+    if auction_state is not None:
+        for p in auction_state.current_properties:
+            out[_AUCTION_PROPERTIES + p - 1] = 1
+        out[_HIGH_BID] = max(auction_state.current_bids.values(), default=0) / 1000
+        out[_OWN_BID] = auction_state.current_bids.get(player_idx, 0) / 1000
+        out[_PLAYERS_IN_AUCTION] = len(state.players) - len(auction_state.players_passed)
+
+    sale_state = state.sale_state
+    if sale_state is not None:
+        for c in sale_state.current_checks:
+            out[_CURRENT_CHECKS + c // 1000] += 1
+    return out
+
+
+def encode_action(action: Action) -> int:
+    """Bid / 1000 (0 for a pass) in the bidding phase, the card played when selling."""
+    if action.type == Action.Type.BID:
+        return action.value // 1000
+    if action.type == Action.Type.PASS:
+        return 0
+    return action.value
+
+
+@attrs.frozen
+class GameRows:
+    """Dataset rows, one per decision; usually one game or a shard of games."""
+
+    observations: np.ndarray  # (k, OBSERVATION_SIZE) float32
+    actions: np.ndarray  # (k,) int16, see `encode_action`
+    players: np.ndarray  # (k,) int8 seat of the deciding player
+    scores: np.ndarray  # (k,) int32 final score of the deciding player
+    outcomes: np.ndarray  # (k,) float32 deciding player's share of the win
+    games: np.ndarray  # (k,) int64 game index
+
+    def __len__(self) -> int:
+        return len(self.actions)
+
+    @classmethod
+    def concatenate(cls, parts: Iterable[GameRows]) -> GameRows:
+        parts = list(parts)
+        return cls(*(np.concatenate([getattr(p, name) for p in parts]) for name in COLUMNS))
+
+    @classmethod
+    def from_decisions(
+        cls, decisions: list[tuple[State, Action]], final_scores: tuple[int, ...], game_index: int
+    ) -> GameRows:
+        observations = np.zeros((len(decisions), OBSERVATION_SIZE), dtype=np.float32)
+        for row, (state, _) in enumerate(decisions):
+            encode_observation(state, observations[row])
+        players = np.array([state.current_player_idx for state, _ in decisions], dtype=np.int8)
+
+        scores = np.array(final_scores, dtype=np.int32)
+        best = scores.max()
+        win_shares = (scores == best) / np.count_nonzero(scores == best)
+        return cls(
+            observations=observations,
+            actions=np.array([encode_action(action) for _, action in decisions], dtype=np.int16),
+            players=players,
+            scores=scores[players],
+            outcomes=win_shares.astype(np.float32)[players],
+            games=np.full(len(decisions), game_index, dtype=np.int64),
+        )
+
+
+# Column name -> (dtype, per-row shape)
+COLUMNS = {
+    "observations": (np.float32, (OBSERVATION_SIZE,)),
+    "actions": (np.int16, ()),
+    "players": (np.int8, ()),
+    "scores": (np.int32, ()),
+    "outcomes": (np.float32, ()),
+    "games": (np.int64, ()),
+}
+
+
+def encode_record(record: GameRecord, game_index: int) -> GameRows:
+    """Rows for every decision in a stored game, one per seat in sale rounds."""
+    decisions = []
+    final = None
+    for state, decision in record.decisions():
+        if isinstance(decision, Action):
+            decisions.append((state, decision))
+        else:
+            decisions.extend((rules.player_view(state, i), play) for i, play in enumerate(decision))
+        final = rules.apply(state, decision)
+    if final is None:
+        raise ValueError("Record has no decisions")
+    return GameRows.from_decisions(decisions, rules.scores(final), game_index)
+
+
+class DatasetSink(NullSink):
+    """Event sink that turns every finished game into `GameRows` for `submit`.
+
+    `submit` is a callable or a `DatasetWriter` to append to. Game indices
+    count up from `first_game`, by default from the writer's `next_game` so
+    games appended to an existing dataset keep distinct indices (or from 0
+    for a callable). Interrupted games are dropped.
+    """
+
+    def __init__(self, submit: Callable[[GameRows], None] | DatasetWriter, first_game: int | None = None):
+        if isinstance(submit, DatasetWriter):
+            next_game = submit.next_game
+            submit = submit.append
+        else:
+            next_game = 0
+        self.submit = submit
+        self.game_index = first_game if first_game is not None else next_game
+        self._decisions: list[tuple[State, Action]] = []
+
+    def game_started(self, state: State, seed: int | None) -> None:
+        self._decisions = []
+
+    def bid_made(self, state: State, player_idx: int, action: Action) -> None:
+        self._decisions.append((state, action))
+
+    def property_played(self, state: State, player_idx: int, action: Action) -> None:
+        self._decisions.append((state, action))
+
+    def game_finished(self, state: State) -> None:
+        self.submit(GameRows.from_decisions(self._decisions, rules.scores(state), self.game_index))
+        self.game_index += 1
+        self._decisions = []
+
+    def game_interrupted(self, state: State) -> None:
+        self._decisions = []
+
+
+class DatasetWriter:
+    """Appends rows to one raw binary file per column in `directory`.
+
+    Files grow `chunk_rows` rows at a time and are trimmed to the row count on
+    `close`, which also writes `meta.json`. `commit` writes it without
+    closing, so a crash loses only the rows since the last commit; `progress`
+    is stored alongside for the producer to resume from. Opening an existing
+    dataset appends to it; `next_game` is one past the highest game index
+    stored, for numbering the games of a new run.
+    """
+
+    def __init__(self, directory: str | os.PathLike, chunk_rows: int = 1 << 16):
+        self.directory = os.fspath(directory)
+        self.chunk_rows = chunk_rows
+        os.makedirs(self.directory, exist_ok=True)
+        meta = _read_meta(self.directory) if os.path.exists(self._meta_path) else {}
+        self.rows = meta.get("rows", 0)
+        self.progress: dict | None = meta.get("progress")
+        self.capacity = 0
+        self._arrays: dict[str, np.memmap] = {}
+        self._grow(self.rows)
+        if "next_game" in meta:
+            self.next_game: int = meta["next_game"]
+        else:
+            self.next_game = int(self._arrays["games"][:self.rows].max()) + 1 if self.rows else 0
+
+    @property
+    def _meta_path(self) -> str:
+        return os.path.join(self.directory, "meta.json")
+
+    def __enter__(self) -> DatasetWriter:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def append(self, rows: GameRows) -> None:
+        end = self.rows + len(rows)
+        if end > self.capacity:
+            self._grow(end)
+        for name, array in self._arrays.items():
+            array[self.rows:end] = getattr(rows, name)
+        self.rows = end
+        if len(rows):
+            self.next_game = max(self.next_game, int(rows.games.max()) + 1)
+
+    def flush(self) -> None:
+        for array in self._arrays.values():
+            array.flush()
+
+    def commit(self, progress: dict | None = None) -> None:
+        """Flush the rows so far and record them, and `progress`, in `meta.json`."""
+        self.flush()
+        if progress is not None:
+            self.progress = progress
+        self._write_meta()
+
+    def close(self) -> None:
+        self._resize(self.rows)
+        self._arrays = {}
+        self._write_meta()
+
+    def _write_meta(self) -> None:
+        meta = {
+            "rows": self.rows,
+            "next_game": self.next_game,
+            "observation_layout": OBSERVATION_LAYOUT,
+            "columns": {name: [np.dtype(dtype).str, list(shape)] for name, (dtype, shape) in COLUMNS.items()},
+        }
+        if self.progress is not None:
+            meta["progress"] = self.progress
+        atomic_write(self._meta_path, json.dumps(meta, indent=2).encode())
+
+    def _grow(self, min_rows: int) -> None:
+        chunks = max(1, -(-min_rows // self.chunk_rows))
+        self._resize(chunks * self.chunk_rows)
+
+    def _resize(self, capacity: int) -> None:
+        for array in self._arrays.values():
+            array.flush()
+        self._arrays = {}
+        for name, (dtype, shape) in COLUMNS.items():
+            path = os.path.join(self.directory, f"{name}.bin")
+            row_bytes = np.dtype(dtype).itemsize * int(np.prod(shape))
+            with open(path, "ab") as f:
+                f.truncate(capacity * row_bytes)
+            if capacity:
+                self._arrays[name] = np.memmap(path, dtype=dtype, mode="r+", shape=(capacity, *shape))
+        self.capacity = capacity
+
+
+def _read_meta(directory: str) -> dict:
+    with open(os.path.join(directory, "meta.json")) as f:
+        return json.load(f)
+
+
+def load_dataset(directory: str | os.PathLike) -> dict[str, np.ndarray]:
+    """Read-only memory-mapped columns of a closed dataset."""
+    directory = os.fspath(directory)
+    meta = _read_meta(directory)
+    rows = meta["rows"]
+    columns = {}
+    for name, (dtype, shape) in meta["columns"].items():
+        path = os.path.join(directory, f"{name}.bin")
+        if rows:
+            columns[name] = np.memmap(path, dtype=np.dtype(dtype), mode="r", shape=(rows, *shape))
+        else:
+            columns[name] = np.zeros((0, *shape), dtype=np.dtype(dtype))
+    return columns
+
+
+class BackgroundExporter:
+    """Feeds a `DatasetWriter` from a thread.
+
+    `submit` only enqueues; once `max_pending` batches are waiting it blocks,
+    so a writer that falls behind slows generation instead of buffering
+    without bound. Errors on the writing thread are raised from the next
+    `submit` or from `close`, which drains the queue and closes the writer.
+    """
+
+    _STOP = object()
+
+    def __init__(self, writer: DatasetWriter, max_pending: int = 64):
+        self.writer = writer
+        self._queue: queue.Queue = queue.Queue(max_pending)
+        self._error: BaseException | None = None
+        self._thread = threading.Thread(target=self._run, name="dataset-export", daemon=True)
+        self._thread.start()
+
+    def __enter__(self) -> BackgroundExporter:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def submit(self, rows: GameRows, progress: dict | None = None) -> None:
+        """Queue `rows`; with `progress`, commit it once they are written."""
+        if self._error is not None:
+            raise RuntimeError("Dataset export failed") from self._error
+        self._queue.put((rows, progress))
+
+    def close(self) -> None:
+        self._queue.put(self._STOP)
+        self._thread.join()
+        if self._error is not None:
+            raise RuntimeError("Dataset export failed") from self._error
+        self.writer.close()
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is self._STOP:
+                return
+            if self._error is None:
+                try:
+                    rows, progress = item
+                    self.writer.append(rows)
+                    if progress is not None:
+                        self.writer.commit(progress)
+                except BaseException as e:
+                    self._error = e
@@ -5,66 +5,85 @@ from typing import TYPE_CHECKING
 
 import attrs
 
-from .core import Action, AuctionState, GamePhase, Player, SaleState
+from . import rules
+from .checkpoint import GameSnapshot
+from .core import Action, GamePhase
+from .equity import EquityTracker
+from .events import NullSink
+from .seeding import AGENT_STREAM, DECK_STREAM, derive_seed
 from .state import State
+from .zobrist import ZOBRIST
 
 if TYPE_CHECKING:
+    from collections.abc import Callable, Generator
+
     from .core import Agent
+    from .events import EventSink
+    from .instrument import EngineInstrumentation
+
+    PhaseSteps = Generator[list[tuple[int, State]], list[Action], None]
 
 
 class GameEngine:
-    def __init__(self, agents: list[Agent]):
+    def __init__(
+        self,
+        agents: list[Agent],
+        sink: EventSink | None = None,
+        track_hash: bool = False,
+        seed: int | random.Random | None = None,
+        instrument: EngineInstrumentation | None = None,
+        checkpoint: Callable[[GameEngine], None] | None = None,
+        track_equity: bool = False,
+    ):
         if len(agents) < 3 or len(agents) > 6:
             raise ValueError("For Sale requires 3-6 players")
 
         self.agents = agents
+        self.sink = sink if sink is not None else NullSink()
+
+        # With a seed the deck shuffle and every agent's RNG stream derive from
+        # it; without one the shuffle uses the global random module.
+        if isinstance(seed, random.Random):
+            seed = seed.getrandbits(64)
+        self.seed = seed
+        self.rng = random.Random(derive_seed(seed, DECK_STREAM)) if seed is not None else None
+        if seed is not None:
+            for seat, agent in enumerate(agents):
+                set_rng = getattr(agent, "set_rng", None)
+                if set_rng is not None:
+                    set_rng(random.Random(derive_seed(seed, AGENT_STREAM, seat)))
+
+        # Wraps this engine's methods, agents and sink; nothing changes without it
+        self.instrument = instrument
+        if instrument is not None:
+            instrument.attach(self)
+
         self.state = self._initialize_game()
+        self.auction_round = 1
+        self.sale_round = 1
 
-    def _initialize_game(self) -> State:
-        print("🎲 Initializing For Sale game...")
-        num_players = len(self.agents)
-
-        # Money distribution: 2x $2000 coins + 10x $1000 coins (3-4 players)
-        # or 2x $2000 coins + 10x $1000 coins (5-6 players)
-        if num_players <= 4:
-            initial_money = 16000  # 2x2000 + 14x1000
-        else:
-            initial_money = 14000  # 2x2000 + 10x1000
-
-        players = tuple(
-            Player(money=initial_money, properties=(), checks=())
-            for _ in range(num_players)
-        )
+        # Called before every auction and sale round, where `snapshot` can be resumed from
+        self.checkpoint = checkpoint
 
-        # Create and shuffle decks
-        property_deck = tuple(range(1, 31))
-        check_deck = (0, 2000, 3000, 4000, 5000, 6000, 7000, 8000, 9000, 10000, 11000, 12000, 13000, 14000, 15000) * 2
-
-        shuffled_properties = list(property_deck)
-        random.shuffle(shuffled_properties)
-
-        shuffled_checks = list(check_deck)
-        random.shuffle(shuffled_checks)
-
-        if num_players <= 4:
-            print(f"👥 {num_players} players, each starting with $16,000 (2×$2000 + 14×$1000 coins)")
-        else:
-            print(f"👥 {num_players} players, each starting with $14,000 (2×$2000 + 10×$1000 coins)")
-        print()
-
-        return State(
-            players=players,
-            current_player_idx=0,
-            phase=GamePhase.SETUP,
-            round_number=0,
-            property_deck=tuple(shuffled_properties),
-            check_deck=tuple(shuffled_checks)
-        )
+        # Running scores and equity, updated by every transition that moves money
+        # or cards when enabled; `restore` resyncs it, other writes to `state` do not
+        self.equity = EquityTracker(self.state) if track_equity else None
+
+        # Zobrist hash of self.state, updated by every transition when enabled
+        self.zobrist = ZOBRIST if track_hash else None
+        self.state_hash = self.zobrist.hash_state(self.state) if self.zobrist else None
+
+    def _initialize_game(self) -> State:
+        state = rules.new_game(len(self.agents), self.rng)
+        self.sink.game_started(state, self.seed)
+        return state
 
     def play_game(self) -> State:
+        """Play to the end, or on from wherever `restore` left the game."""
         try:
-            print("🏠 Starting BIDDING PHASE")
-            self.state = attrs.evolve(self.state, phase=GamePhase.BIDDING)
+            if self.state.phase == GamePhase.SETUP:
+                self.sink.phase_started(GamePhase.BIDDING)
+                self._set_phase(GamePhase.BIDDING)
 
             while self.state.phase != GamePhase.FINISHED:
                 if self.state.phase == GamePhase.BIDDING:
@@ -74,87 +93,117 @@ class GameEngine:
 
             return self.state
         except KeyboardInterrupt:
-            print("\n\n🛑 Game interrupted by user!")
-            print("Current game state:")
-            print(self.state.display_state())
+            self.sink.game_interrupted(self.state)
             return self.state
 
     def _play_bidding_phase(self) -> None:
-        auction_round = 1
+        self._drive(self._bidding_phase())
+
+    def _play_selling_phase(self) -> None:
+        self._drive(self._selling_phase())
+
+    def _drive(self, phase: PhaseSteps) -> None:
+        # Answers each batch of move requests by calling the agents in seat order
+        try:
+            requests = next(phase)
+            while True:
+                requests = phase.send([self.agents[seat].move(view) for seat, view in requests])
+        except StopIteration:
+            pass
+
+    # Phase loops, shared with the async driver: each yields the (seat, view)
+    # pairs it needs moves for and is sent back their actions, in order
+    def _bidding_phase(self) -> PhaseSteps:
         while len(self.state.property_deck) > 0:
-            print(f"\n--- Auction Round {auction_round} ---")
+            if self.checkpoint is not None:
+                self.checkpoint(self)
             num_properties = len(self.agents)
             self.state = self._start_auction(num_properties)
-
-            print(self.state.display_state())
+            self.sink.auction_started(self.auction_round, self.state)
 
             while self.state.auction_state is not None:
-                current_agent = self.agents[self.state.current_player_idx]
+                player_idx = self.state.current_player_idx
+                (action,) = yield [(player_idx, self.state)]
+                self.sink.bid_made(self.state, player_idx, action)
 
-                action = current_agent.move(self.state)
-                print(f"Player {self.state.current_player_idx} {action.type.lower()}s", end="")
-                if action.value is not None:
-                    print(f" ${action.value:,}")
-                else:
-                    print()
+                self.state = self._process_bid(player_idx, action)
 
-                self.state = self._process_bid(self.state.current_player_idx, action)
+            self.auction_round += 1
 
-            auction_round += 1
+        self.sink.phase_started(GamePhase.SELLING)
+        self._set_phase(GamePhase.SELLING)
 
-        print("\n💰 Starting SELLING PHASE")
-        self.state = attrs.evolve(self.state, phase=GamePhase.SELLING)
-
-    def _play_selling_phase(self) -> None:
-        sale_round = 1
+    def _selling_phase(self) -> PhaseSteps:
         while len(self.state.check_deck) > 0:
-            print(f"\n--- Sale Round {sale_round} ---")
+            if self.checkpoint is not None:
+                self.checkpoint(self)
             num_checks = len(self.agents)
             self.state = self._start_sale_round(num_checks)
+            self.sink.sale_started(self.sale_round, self.state)
 
-            print(self.state.display_state())
+            views = [rules.player_view(self.state, i) for i in range(len(self.agents))]
+            actions = yield list(enumerate(views))
 
             plays = {}
-            print("Players simultaneously choose properties to play:")
-            for i, agent in enumerate(self.agents):
-                action = agent.move(self.state)
+            for i, (view, action) in enumerate(zip(views, actions)):
                 if action.type != Action.Type.PLAY:
                     raise ValueError(f"Expected PLAY action in selling phase, got {action.type}")
                 plays[i] = action.value
-                print(f"Player {i} plays property {action.value}")
+                self.sink.property_played(view, i, action)
 
             self.state = self._collect_plays(plays)
             self.state = self._resolve_sale()
-            print(self.state.display_state())
-
-            sale_round += 1
-
-        print("\n🏁 Game Complete!")
-        self.state = attrs.evolve(self.state, phase=GamePhase.FINISHED)
-
-    # Auction Management
-    def _start_auction(self, num_properties: int) -> State:
-        if len(self.state.property_deck) < num_properties:
-            num_properties = len(self.state.property_deck)
 
-        current_properties = self.state.property_deck[:num_properties]
-        remaining_deck = self.state.property_deck[num_properties:]
+            self.sale_round += 1
 
-        auction_state = AuctionState(
-            current_properties=current_properties,
-            current_bids={},
-            players_passed=set(),
-            properties_taken={}
-        )
+        self._set_phase(GamePhase.FINISHED)
+        self.sink.game_finished(self.state)
 
-        return attrs.evolve(
+    # Snapshots
+    def snapshot(self) -> GameSnapshot:
+        """The game between two auctions or sale rounds, with every agent RNG's state."""
+        if self.state.auction_state is not None or self.state.sale_state is not None:
+            raise ValueError("Snapshots are taken between auctions and sale rounds")
+        return GameSnapshot(
             self.state,
-            property_deck=remaining_deck,
-            auction_state=auction_state,
-            phase=GamePhase.BIDDING,
-            current_player_idx=0
+            tuple(_agent_rng(agent).getstate() if _agent_rng(agent) else None for agent in self.agents),
+            self.seed,
+            self.auction_round,
+            self.sale_round,
         )
 
+    def restore(self, snapshot: GameSnapshot) -> None:
+        """Continue from `snapshot`; the agents must be the ones it was taken with."""
+        if len(snapshot.state.players) != len(self.agents):
+            raise ValueError("Snapshot has a different number of players")
+        for agent, rng_state in zip(self.agents, snapshot.agent_rng_states):
+            if rng_state is not None:
+                _agent_rng(agent).setstate(rng_state)
+        if self.state.phase != GamePhase.FINISHED:
+            # The game this engine was holding is abandoned unfinished
+            self.sink.game_interrupted(self.state)
+        self.seed = snapshot.seed
+        self.state = snapshot.state
+        self.auction_round = snapshot.auction_round
+        self.sale_round = snapshot.sale_round
+        if self.equity is not None:
+            self.equity.reset(self.state)
+        if self.zobrist is not None:
+            self.state_hash = self.zobrist.hash_state(self.state)
+
+    def _set_phase(self, phase: GamePhase) -> None:
+        new_state = attrs.evolve(self.state, phase=phase)
+        if self.zobrist is not None:
+            self.state_hash ^= self.zobrist.phase_changed(self.state, new_state)
+        self.state = new_state
+
+    # Auction Management
+    def _start_auction(self, num_properties: int) -> State:
+        new_state = rules.start_auction(self.state, num_properties)
+        if self.zobrist is not None:
+            self.state_hash ^= self.zobrist.auction_started(self.state, new_state)
+        return new_state
+
     def _process_bid(self, player_idx: int, action: Action) -> State:
         if not self.state.auction_state:
             raise ValueError("No active auction")
@@ -167,215 +216,102 @@ class GameEngine:
         raise ValueError(f"Invalid action for bidding phase: {action}")
 
     def _process_pass(self, player_idx: int) -> State:
-        if not self.state.auction_state:
-            raise ValueError("No active auction")
-
-        auction_state = self.state.auction_state
-        new_passed = auction_state.players_passed | {player_idx}
-
-        lowest_property = min(auction_state.current_properties)
-        remaining_properties = tuple(p for p in auction_state.current_properties if p != lowest_property)
+        new_state = rules.pass_player(self.state, player_idx)
+        if self.zobrist is not None:
+            self.state_hash ^= self.zobrist.player_passed(self.state, new_state, player_idx)
 
-        player_bid = auction_state.current_bids.get(player_idx, 0)
-        refund = player_bid // 2
-
-        current_player = self.state.players[player_idx]
-        updated_player = attrs.evolve(
-            current_player,
-            money=current_player.money + refund,
-            properties=current_player.properties + (lowest_property,)
-        )
-
-        updated_players = tuple(
-            updated_player if i == player_idx else player
-            for i, player in enumerate(self.state.players)
-        )
-
-        new_auction_state = attrs.evolve(
-            auction_state,
-            current_properties=remaining_properties,
-            players_passed=new_passed,
-            properties_taken=auction_state.properties_taken | {player_idx: lowest_property}
-        )
-
-        new_state = attrs.evolve(
-            self.state,
-            players=updated_players,
-            auction_state=new_auction_state
-        )
-
-        print(f"  → Gets property {lowest_property}, refund ${refund:,}")
+        player = new_state.players[player_idx]
+        refund = player.money - self.state.players[player_idx].money
+        if self.equity is not None:
+            self.equity.property_taken(player_idx, player.properties[-1], refund)
+        self.sink.property_taken(player_idx, player.properties[-1], refund)
 
         return self._advance_turn_or_finish_auction(new_state)
 
     def _process_bid_action(self, player_idx: int, bid_amount: int) -> State:
-        if not self.state.auction_state:
-            raise ValueError("No active auction")
-
-        current_player = self.state.players[player_idx]
-        if bid_amount > current_player.money:
-            raise ValueError("Insufficient funds")
-
-        # Validate bid is in $1000 increments
-        if bid_amount % 1000 != 0:
-            raise ValueError("Bids must be in increments of $1000")
-
-        current_bid = max(self.state.auction_state.current_bids.values(), default=0)
-        if bid_amount <= current_bid:
-            raise ValueError("Bid must be higher than current bid")
-
-        new_bids = self.state.auction_state.current_bids.copy()
-        new_bids[player_idx] = bid_amount
-
-        new_auction_state = attrs.evolve(
-            self.state.auction_state,
-            current_bids=new_bids
-        )
-
-        new_state = attrs.evolve(
-            self.state,
-            auction_state=new_auction_state
-        )
-
+        new_state = rules.place_bid(self.state, player_idx, bid_amount)
+        if self.zobrist is not None:
+            self.state_hash ^= self.zobrist.bid_placed(self.state, new_state, player_idx)
         return self._advance_turn_or_finish_auction(new_state)
 
     def _advance_turn_or_finish_auction(self, state: State) -> State:
         if not state.auction_state:
             return state
 
-        active_players = [
-            i for i in range(len(state.players))
-            if i not in state.auction_state.players_passed
-        ]
-
-        if len(active_players) <= 1:
+        if rules.auction_over(state):
             return self._finish_auction(state)
 
-        next_player = (state.current_player_idx + 1) % len(state.players)
-        while next_player in state.auction_state.players_passed:
-            next_player = (next_player + 1) % len(state.players)
-
-        return attrs.evolve(state, current_player_idx=next_player)
+        new_state = rules.advance_turn(state)
+        if self.zobrist is not None:
+            self.state_hash ^= self.zobrist.turn_advanced(state, new_state)
+        return new_state
 
     def _finish_auction(self, state: State) -> State:
-        if not state.auction_state:
-            return state
-
-        auction_state = state.auction_state
-        active_players = [
-            i for i in range(len(state.players))
-            if i not in auction_state.players_passed
-        ]
-
-        if len(active_players) == 1:
-            winner_idx = active_players[0]
-            highest_property = max(auction_state.current_properties)
-            winning_bid = auction_state.current_bids.get(winner_idx, 0)
+        winner_idx = rules.auction_winner(state)
+        new_state = rules.finish_auction(state)
+        if self.zobrist is not None:
+            self.state_hash ^= self.zobrist.auction_finished(state, new_state, winner_idx)
 
-            winner = state.players[winner_idx]
-            updated_winner = attrs.evolve(
-                winner,
-                money=winner.money - winning_bid,
-                properties=winner.properties + (highest_property,)
-            )
+        if winner_idx is not None:
+            winner = new_state.players[winner_idx]
+            winning_bid = state.players[winner_idx].money - winner.money
+            if self.equity is not None:
+                self.equity.auction_won(winner_idx, winner.properties[-1], winning_bid)
+            self.sink.auction_won(winner_idx, winner.properties[-1], winning_bid)
 
-            updated_players = tuple(
-                updated_winner if i == winner_idx else player
-                for i, player in enumerate(state.players)
-            )
-
-            print(f"Player {winner_idx} wins property {highest_property} for ${winning_bid:,}")
-
-            return attrs.evolve(
-                state,
-                players=updated_players,
-                auction_state=None
-            )
-
-        return attrs.evolve(state, auction_state=None)
+        return new_state
 
     # Sale Management
     def _start_sale_round(self, num_checks: int) -> State:
-        if len(self.state.check_deck) < num_checks:
-            num_checks = len(self.state.check_deck)
-
-        current_checks = self.state.check_deck[:num_checks]
-        remaining_deck = self.state.check_deck[num_checks:]
-
-        sale_state = SaleState(
-            current_checks=current_checks,
-            played_properties={}
-        )
-
-        return attrs.evolve(
-            self.state,
-            check_deck=remaining_deck,
-            sale_state=sale_state,
-            phase=GamePhase.SELLING
-        )
+        new_state = rules.start_sale_round(self.state, num_checks)
+        if self.zobrist is not None:
+            self.state_hash ^= self.zobrist.sale_started(self.state, new_state)
+        return new_state
 
     def _collect_plays(self, plays: dict[int, int]) -> State:
-        if not self.state.sale_state:
-            raise ValueError("No active sale round")
-
-        sale_state = attrs.evolve(
-            self.state.sale_state,
-            played_properties=plays
-        )
-
-        return attrs.evolve(self.state, sale_state=sale_state)
+        new_state = rules.collect_plays(self.state, plays)
+        if self.zobrist is not None:
+            self.state_hash ^= self.zobrist.plays_collected(self.state, new_state)
+        return new_state
 
     def _resolve_sale(self) -> State:
         if not self.state.sale_state:
             raise ValueError("No active sale round")
 
-        sale_state = self.state.sale_state
-        sorted_plays = sorted(
-            sale_state.played_properties.items(),
-            key=lambda x: x[1],
-            reverse=True
-        )
-
-        sorted_checks = sorted(sale_state.current_checks, reverse=True)
-
-        updated_players = list(self.state.players)
-
-        print("Sale results:")
-        for rank, (player_idx, property_value) in enumerate(sorted_plays):
-            if rank < len(sorted_checks):
-                check_value = sorted_checks[rank]
-                player = updated_players[player_idx]
-
-                updated_player = attrs.evolve(
-                    player,
-                    properties=tuple(p for p in player.properties if p != property_value),
-                    checks=player.checks + (check_value,)
-                )
-                updated_players[player_idx] = updated_player
-
-                print(f"  Player {player_idx}: Property {property_value} → Check ${check_value:,}")
-
-        return attrs.evolve(
-            self.state,
-            players=tuple(updated_players),
-            sale_state=None
-        )
+        results = rules.sale_results(self.state.sale_state)
+        new_state = rules.apply_sale_results(self.state, results)
+        if self.zobrist is not None:
+            self.state_hash ^= self.zobrist.sale_resolved(self.state, new_state, results)
+        if self.equity is not None:
+            self.equity.sale_resolved(results)
+        self.sink.sale_resolved(new_state, results)
+        return new_state
 
     def get_scores(self) -> dict[int, int]:
-        scores = {}
-        for i, player in enumerate(self.state.players):
-            score = player.money + sum(player.checks)
-            scores[i] = score
-        return scores
+        if self.equity is not None:
+            return dict(enumerate(self.equity.scores))
+        return {i: player.money + sum(player.checks) for i, player in enumerate(self.state.players)}
+
+    def get_equity(self) -> dict[int, int]:
+        """Scores plus the expected sale value of held properties."""
+        equity = self.equity if self.equity is not None else EquityTracker(self.state)
+        return dict(enumerate(equity.equities()))
 
     def get_winner(self) -> int:
         scores = self.get_scores()
         return max(scores.keys(), key=lambda k: scores[k])
 
 
+def _agent_rng(agent: Agent) -> random.Random | None:
+    rng = getattr(agent, "rng", None)
+    return rng if isinstance(rng, random.Random) else None
+
+
 class Game:
-    def __init__(self, agents: list[Agent]):
-        self.engine = GameEngine(agents)
+    def __init__(
+        self, agents: list[Agent], sink: EventSink | None = None, seed: int | random.Random | None = None
+    ):
+        self.engine = GameEngine(agents, sink, seed=seed)
 
     def play(self) -> dict[str, any]:
         try:
@@ -383,24 +319,17 @@ class Game:
             scores = self.engine.get_scores()
             winner = self.engine.get_winner()
 
-            if final_state.phase == GamePhase.FINISHED:
-                print("\n🏆 FINAL RESULTS:")
-                for i, score in scores.items():
-                    status = " (WINNER!)" if i == winner else ""
-                    print(f"Player {i}: ${score:,}{status}")
-            else:
-                print("\n📊 PARTIAL RESULTS (Game Interrupted):")
-                scores = self.engine.get_scores()
-                for i, score in scores.items():
-                    print(f"Player {i}: ${score:,}")
+            if final_state.phase != GamePhase.FINISHED:
+                winner = None
+            self.engine.sink.game_results(scores, winner)
 
             return {
                 "final_state": final_state,
                 "scores": scores,
-                "winner": winner if final_state.phase == GamePhase.FINISHED else None
+                "winner": winner
             }
         except KeyboardInterrupt:
-            print("\n\n🛑 Game terminated!")
+            self.engine.sink.game_interrupted(self.engine.state)
             return {
                 "final_state": self.engine.state,
                 "scores": {},
@@ -0,0 +1,321 @@
+"""Reset/step environments for self-play training.
+
+Every decision maps to one index of a fixed discrete action space:
+
+- 0: pass
+- 1 to 16: bid the minimum plus $0 to $15,000 (`BID_OFFSET + raise / 1000`)
+- 17 to 46: play property 1 to 30 (`PLAY_OFFSET + property - 1`)
+
+Bids are relative to the minimum legal bid because money is unbounded in
+practice (a pass refunds half a bid that was never paid), so absolute bid
+actions would need hundreds of mostly dead indices. Raises of more than
+$15,000 over the minimum are not expressible.
+
+`ForSaleEnv` serves all seats of one game in turn, the way self-play uses it:
+each step is made by the seat in `info["player"]` and the observation is
+that seat's view (`dataset.encode_observation`). The simultaneous plays of a
+sale round are asked for one seat at a time and applied together once every
+seat has chosen, so no seat sees another's play. The step reward is a
+`(num_players,)` array: zero until the game ends, then each seat's share of
+the win.
+
+`VectorEnv` steps K games with preallocated arrays and resets finished games
+automatically; `SubprocVectorEnv` spreads the K games over worker processes.
+Both deal each episode from `derive_seed(seed, env index, episode)`, so the
+two produce the same games.
+
+Requires NumPy (`pip install for-sale[dataset]`).
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import random
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from . import rules
+from .core import Action, GamePhase
+from .dataset import OBSERVATION_SIZE, encode_observation
+from .seeding import DECK_STREAM, derive_seed
+
+if TYPE_CHECKING:
+    from multiprocessing.connection import Connection
+
+    from .state import State
+
+NUM_RAISES = 16
+NUM_PROPERTIES = 30
+
+PASS_ACTION = 0
+BID_OFFSET = 1
+PLAY_OFFSET = BID_OFFSET + NUM_RAISES
+NUM_ACTIONS = PLAY_OFFSET + NUM_PROPERTIES
+
+_PASS = Action.pass_turn()
+_PLAYS = tuple(Action.play_card(p) for p in range(1, NUM_PROPERTIES + 1))
+
+
+def min_bid(state: State) -> int:
+    # Bids must be in increments of $1000
+    return (max(state.auction_state.current_bids.values(), default=0) // 1000 + 1) * 1000
+
+
+def index_to_action(index: int, state: State) -> Action:
+    if not 0 <= index < NUM_ACTIONS:
+        raise ValueError(f"Action index {index} out of range")
+    if index == PASS_ACTION:
+        return _PASS
+    if index < PLAY_OFFSET:
+        return Action.bid(min_bid(state) + 1000 * (index - BID_OFFSET))
+    return _PLAYS[index - PLAY_OFFSET]
+
+
+def action_to_index(action: Action, state: State) -> int:
+    if action.type == Action.Type.PASS:
+        return PASS_ACTION
+    if action.type == Action.Type.BID:
+        return BID_OFFSET + (action.value - min_bid(state)) // 1000
+    return PLAY_OFFSET + action.value - 1
+
+
+def action_mask(state: State, out: np.ndarray | None = None) -> np.ndarray:
+    """The legal actions of the current player as a `(NUM_ACTIONS,)` bool mask.
+
+    The first `NUM_RAISES` actions of `state.get_legal_actions()`, set by
+    slices rather than by building the list.
+    """
+    if out is None:
+        out = np.zeros(NUM_ACTIONS, dtype=bool)
+    else:
+        out[:] = False
+
+    player = state.players[state.current_player_idx]
+    if state.phase == GamePhase.BIDDING:
+        auction_state = state.auction_state
+        if auction_state is not None and state.current_player_idx not in auction_state.players_passed:
+            out[PASS_ACTION] = True
+            raises = (player.money - min_bid(state)) // 1000 + 1
+            if raises > 0:
+                out[BID_OFFSET:BID_OFFSET + min(raises, NUM_RAISES)] = True
+    elif state.phase == GamePhase.SELLING:
+        for p in player.properties:
+            out[PLAY_OFFSET + p - 1] = True
+    return out
+
+
+class ForSaleEnv:
+    def __init__(self, num_players: int, seed: int | None = None, env_index: int = 0):
+        if num_players < 3 or num_players > 6:
+            raise ValueError("For Sale requires 3-6 players")
+        self.num_players = num_players
+        self.seed = seed
+        self.env_index = env_index
+        self.episode = 0
+        self.state: State | None = None
+        self._view: State | None = None
+        self._plays: list[Action] = []
+
+    @property
+    def current_player(self) -> int:
+        return self._view.current_player_idx
+
+    def reset(self, seed: int | None = None) -> tuple[np.ndarray, dict]:
+        obs = np.zeros(OBSERVATION_SIZE, dtype=np.float32)
+        mask = np.zeros(NUM_ACTIONS, dtype=bool)
+        self._reset(obs, mask, seed)
+        return obs, {"action_mask": mask, "player": self.current_player}
+
+    def step(self, action: int) -> tuple[np.ndarray, np.ndarray, bool, bool, dict]:
+        obs = np.zeros(OBSERVATION_SIZE, dtype=np.float32)
+        mask = np.zeros(NUM_ACTIONS, dtype=bool)
+        rewards = np.zeros(self.num_players, dtype=np.float32)
+        terminated = self._step(action, obs, mask, rewards)
+        return obs, rewards, terminated, False, {"action_mask": mask, "player": self.current_player}
+
+    def _reset(self, obs: np.ndarray, mask: np.ndarray, seed: int | None = None) -> None:
+        if seed is not None:
+            self.seed = seed
+            self.episode = 0
+        rng = None
+        if self.seed is not None:
+            game = derive_seed(self.seed, self.env_index, self.episode)
+            rng = random.Random(derive_seed(game, DECK_STREAM))
+        self.episode += 1
+        self.state = rules.begin(rules.new_game(self.num_players, rng))
+        self._plays = []
+        self._observe(obs, mask)
+
+    def _step(self, action: int, obs: np.ndarray, mask: np.ndarray, rewards: np.ndarray) -> bool:
+        """Apply `action` for the current player; returns True when the game is over."""
+        if self.state.phase == GamePhase.FINISHED:
+            raise ValueError("Game is over, call reset()")
+        if not 0 <= action < NUM_ACTIONS or not action_mask(self._view, mask)[action]:
+            raise ValueError(f"Illegal action index {action} for player {self.current_player}")
+
+        if self.state.phase == GamePhase.BIDDING:
+            self.state = rules.apply(self.state, index_to_action(action, self.state))
+        else:
+            self._plays.append(_PLAYS[action - PLAY_OFFSET])
+            if len(self._plays) == self.num_players:
+                self.state = rules.apply(self.state, tuple(self._plays))
+                self._plays = []
+
+        if self.state.phase == GamePhase.FINISHED:
+            scores = np.array(rules.scores(self.state))
+            winners = scores == scores.max()
+            rewards[:] = winners / np.count_nonzero(winners)
+            obs[:] = 0
+            mask[:] = False
+            return True
+
+        self._observe(obs, mask)
+        return False
+
+    def _observe(self, obs: np.ndarray, mask: np.ndarray) -> None:
+        state = self.state
+        if state.phase == GamePhase.SELLING:
+            state = rules.player_view(state, len(self._plays))
+        self._view = state
+        encode_observation(state, obs)
+        action_mask(state, mask)
+
+
+class VectorEnv:
+    """K games of the same player count, stepped together in one process.
+
+    Arrays are preallocated and refilled in place; copy what you keep. A game
+    that ends is reset in the same step: its row of `rewards` holds the final
+    win shares, `terminated` is set, `info["final_scores"]` holds its scores
+    and the observation is already the first one of the next game.
+    """
+
+    def __init__(self, num_envs: int, num_players: int, seed: int | None = None, first_env: int = 0):
+        self.num_envs = num_envs
+        self.num_players = num_players
+        self.envs = [ForSaleEnv(num_players, seed, first_env + k) for k in range(num_envs)]
+        self.observations = np.zeros((num_envs, OBSERVATION_SIZE), dtype=np.float32)
+        self.action_masks = np.zeros((num_envs, NUM_ACTIONS), dtype=bool)
+        self.players = np.zeros(num_envs, dtype=np.int64)
+        self.rewards = np.zeros((num_envs, num_players), dtype=np.float32)
+        self.terminated = np.zeros(num_envs, dtype=bool)
+        self.final_scores = np.zeros((num_envs, num_players), dtype=np.int64)
+        self._no_truncation = np.zeros(num_envs, dtype=bool)
+
+    def reset(self, seed: int | None = None) -> tuple[np.ndarray, dict]:
+        for k, env in enumerate(self.envs):
+            env._reset(self.observations[k], self.action_masks[k], seed)
+            self.players[k] = env.current_player
+        return self.observations, self._info()
+
+    def step(self, actions: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, dict]:
+        self.rewards[:] = 0
+        self.terminated[:] = False
+        for k, (env, action) in enumerate(zip(self.envs, actions.tolist())):
+            if env._step(action, self.observations[k], self.action_masks[k], self.rewards[k]):
+                self.terminated[k] = True
+                self.final_scores[k] = rules.scores(env.state)
+                env._reset(self.observations[k], self.action_masks[k])
+            self.players[k] = env.current_player
+        return self.observations, self.rewards, self.terminated, self._no_truncation, self._info()
+
+    def _info(self) -> dict:
+        return {"action_mask": self.action_masks, "player": self.players, "final_scores": self.final_scores}
+
+    def close(self) -> None:
+        pass
+
+
+def _subproc_worker(conn: Connection, num_envs: int, num_players: int, seed: int | None, first_env: int) -> None:
+    env = VectorEnv(num_envs, num_players, seed, first_env)
+    while True:
+        try:
+            command, payload = conn.recv()
+        except EOFError:
+            return
+        if command == "close":
+            return
+        try:
+            if command == "reset":
+                obs, info = env.reset(payload)
+                reply = (obs, None, None, info)
+            else:
+                obs, rewards, terminated, _, info = env.step(payload)
+                reply = (obs, rewards, terminated, info)
+            conn.send(("ok", reply))
+        except Exception as e:
+            conn.send(("error", e))
+
+
+class SubprocVectorEnv:
+    """`VectorEnv` split into contiguous slices, one per worker process.
+
+    Returns freshly concatenated arrays each step, with the same layout and
+    the same games as a `VectorEnv` with the same arguments.
+    """
+
+    def __init__(self, num_envs: int, num_players: int, seed: int | None = None, workers: int | None = None):
+        workers = min(workers or multiprocessing.cpu_count(), num_envs)
+        self.num_envs = num_envs
+        self.num_players = num_players
+        bounds = [num_envs * w // workers for w in range(workers + 1)]
+        self._slices = [slice(lo, hi) for lo, hi in zip(bounds, bounds[1:])]
+        self._connections: list[Connection] = []
+        self._processes: list[multiprocessing.Process] = []
+        for part in self._slices:
+            parent_conn, child_conn = multiprocessing.Pipe()
+            process = multiprocessing.Process(
+                target=_subproc_worker,
+                args=(child_conn, part.stop - part.start, num_players, seed, part.start),
+                daemon=True,
+            )
+            process.start()
+            child_conn.close()
+            self._connections.append(parent_conn)
+            self._processes.append(process)
+
+    def __enter__(self) -> SubprocVectorEnv:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def reset(self, seed: int | None = None) -> tuple[np.ndarray, dict]:
+        for conn in self._connections:
+            conn.send(("reset", seed))
+        obs, _, _, info = self._gather()
+        return obs, info
+
+    def step(self, actions: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, dict]:
+        for conn, part in zip(self._connections, self._slices):
+            conn.send(("step", actions[part]))
+        obs, rewards, terminated, info = self._gather()
+        return obs, rewards, terminated, np.zeros(self.num_envs, dtype=bool), info
+
+    def _gather(self) -> tuple:
+        replies = []
+        for conn in self._connections:
+            status, payload = conn.recv()
+            if status == "error":
+                raise payload
+            replies.append(payload)
+        obs = np.concatenate([r[0] for r in replies])
+        rewards = np.concatenate([r[1] for r in replies]) if replies[0][1] is not None else None
+        terminated = np.concatenate([r[2] for r in replies]) if replies[0][2] is not None else None
+        info = {key: np.concatenate([r[3][key] for r in replies]) for key in replies[0][3]}
+        return obs, rewards, terminated, info
+
+    def close(self) -> None:
+        for conn in self._connections:
+            try:
+                conn.send(("close", None))
+            except OSError:
+                pass
+            conn.close()
+        for process in self._processes:
+            process.join(timeout=1)
+            if process.is_alive():
+                process.terminate()
+        self._connections = []
+        self._processes = []
@@ -0,0 +1,110 @@
+"""Running scores and equity, kept current by `GameEngine(track_equity=True)`.
+
+A player's score is money plus checks; their equity adds the expected sale
+value of the properties they hold. The expected value of a property is the
+check it fetches if every property still in play sells in rank order: the
+k-th lowest property in play gets the k-th lowest check left. The rules
+deal equally many properties and checks, so this is defined throughout the
+game.
+
+`property_value` is a table indexed by property. Which properties and
+checks are in play only changes when a sale resolves, so passes and
+auctions update scores and equity in O(1); a resolved sale reprices the
+table with one walk over the at most 30 cards left, kept as a property
+bitmask and per-value check counts rather than sorted lists.
+
+`position_equities` computes the same equities from scratch for a
+`MutableState`, for search agents that evaluate positions they walk to.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .mutable import MutableState
+    from .state import State
+
+DECK_SIZE = 30
+NUM_CHECK_VALUES = 16  # $0 to $15,000
+
+
+class EquityTracker:
+    __slots__ = ("scores", "holdings", "property_value", "owner", "_in_play", "_check_counts")
+
+    def __init__(self, state: State):
+        self.reset(state)
+
+    def reset(self, state: State) -> None:
+        """Recompute everything from `state`, e.g. after replacing `GameEngine.state`."""
+        self.scores = [p.money + sum(p.checks) for p in state.players]
+        # Seat holding each property, -1 if none
+        self.owner = [-1] * (DECK_SIZE + 1)
+        in_play = 0
+        for player_idx, player in enumerate(state.players):
+            for p in player.properties:
+                self.owner[p] = player_idx
+                in_play |= 1 << p
+        for p in state.property_deck:
+            in_play |= 1 << p
+        if state.auction_state:
+            for p in state.auction_state.current_properties:
+                in_play |= 1 << p
+        self._in_play = in_play
+
+        self._check_counts = [0] * NUM_CHECK_VALUES
+        for check in state.check_deck + (state.sale_state.current_checks if state.sale_state else ()):
+            self._check_counts[check // 1000] += 1
+        self._reprice()
+
+    def equity(self, player_idx: int) -> int:
+        return self.scores[player_idx] + self.holdings[player_idx]
+
+    def equities(self) -> list[int]:
+        return [score + held for score, held in zip(self.scores, self.holdings)]
+
+    def _reprice(self) -> None:
+        value = [0] * (DECK_SIZE + 1)
+        holdings = [0] * len(self.scores)
+        owner = self.owner
+        checks = [v * 1000 for v, n in enumerate(self._check_counts) for _ in range(n)]
+        mask = self._in_play
+        in_play = [p for p in range(1, DECK_SIZE + 1) if mask >> p & 1]
+        for p, check in zip(in_play, checks):
+            value[p] = check
+            if owner[p] >= 0:
+                holdings[owner[p]] += check
+        self.property_value = value
+        self.holdings = holdings
+
+    # Updates, one per engine transition that moves money, checks or cards
+    def property_taken(self, player_idx: int, property_value: int, refund: int) -> None:
+        self.scores[player_idx] += refund
+        self.owner[property_value] = player_idx
+        self.holdings[player_idx] += self.property_value[property_value]
+
+    def auction_won(self, player_idx: int, property_value: int, price: int) -> None:
+        self.scores[player_idx] -= price
+        self.owner[property_value] = player_idx
+        self.holdings[player_idx] += self.property_value[property_value]
+
+    def sale_resolved(self, results: tuple[tuple[int, int, int], ...]) -> None:
+        for player_idx, property_value, check in results:
+            self.scores[player_idx] += check
+            self.owner[property_value] = -1
+            self._in_play &= ~(1 << property_value)
+            self._check_counts[check // 1000] -= 1
+        self._reprice()
+
+
+def position_equities(position: MutableState) -> list[int]:
+    """Every seat's equity in `position`, as `EquityTracker.equities` gives it."""
+    in_play = [p for hand in position.properties for p in hand]
+    in_play += position.auction_properties
+    in_play += position.property_deck[position.property_pos:]
+    checks = sorted(position.check_deck[position.check_pos:] + position.sale_checks)
+    value = dict(zip(sorted(in_play), checks))
+    return [
+        money + sum(held) + sum(value[p] for p in hand)
+        for money, held, hand in zip(position.money, position.checks, position.properties)
+    ]
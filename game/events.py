@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Protocol
+
+from .core import GamePhase
+
+if TYPE_CHECKING:
+    from .core import Action
+    from .state import State
+
+
+class EventSink(Protocol):
+    """Receives narration events from the engine.
+
+    Events carry raw game data only; any formatting happens inside the sink,
+    so a headless engine (the default `NullSink`) never builds a string.
+    """
+
+    def game_started(self, state: State, seed: int | None) -> None: ...
+
+    def phase_started(self, phase: GamePhase) -> None: ...
+
+    def auction_started(self, auction_round: int, state: State) -> None: ...
+
+    def bid_made(self, state: State, player_idx: int, action: Action) -> None: ...
+
+    def property_taken(self, player_idx: int, property_value: int, refund: int) -> None: ...
+
+    def auction_won(self, player_idx: int, property_value: int, winning_bid: int) -> None: ...
+
+    def sale_started(self, sale_round: int, state: State) -> None: ...
+
+    def property_played(self, state: State, player_idx: int, action: Action) -> None: ...
+
+    def sale_resolved(self, state: State, results: tuple[tuple[int, int, int], ...]) -> None: ...
+
+    def game_finished(self, state: State) -> None: ...
+
+    def game_interrupted(self, state: State) -> None: ...
+
+    def game_results(self, scores: dict[int, int], winner: int | None) -> None: ...
+
+
+class NullSink:
+    """Discards every event. Used for headless simulation."""
+
+    def game_started(self, state: State, seed: int | None) -> None:
+        pass
+
+    def phase_started(self, phase: GamePhase) -> None:
+        pass
+
+    def auction_started(self, auction_round: int, state: State) -> None:
+        pass
+
+    def bid_made(self, state: State, player_idx: int, action: Action) -> None:
+        pass
+
+    def property_taken(self, player_idx: int, property_value: int, refund: int) -> None:
+        pass
+
+    def auction_won(self, player_idx: int, property_value: int, winning_bid: int) -> None:
+        pass
+
+    def sale_started(self, sale_round: int, state: State) -> None:
+        pass
+
+    def property_played(self, state: State, player_idx: int, action: Action) -> None:
+        pass
+
+    def sale_resolved(self, state: State, results: tuple[tuple[int, int, int], ...]) -> None:
+        pass
+
+    def game_finished(self, state: State) -> None:
+        pass
+
+    def game_interrupted(self, state: State) -> None:
+        pass
+
+    def game_results(self, scores: dict[int, int], winner: int | None) -> None:
+        pass
+
+
+class ConsoleSink:
+    """Narrates the game to stdout."""
+
+    def game_started(self, state: State, seed: int | None) -> None:
+        print("🎲 Initializing For Sale game...")
+        num_players = len(state.players)
+        if num_players <= 4:
+            print(f"👥 {num_players} players, each starting with $16,000 (2×$2000 + 14×$1000 coins)")
+        else:
+            print(f"👥 {num_players} players, each starting with $14,000 (2×$2000 + 10×$1000 coins)")
+        print()
+
+    def phase_started(self, phase: GamePhase) -> None:
+        if phase == GamePhase.BIDDING:
+            print("🏠 Starting BIDDING PHASE")
+        elif phase == GamePhase.SELLING:
+            print("\n💰 Starting SELLING PHASE")
+
+    def auction_started(self, auction_round: int, state: State) -> None:
+        print(f"\n--- Auction Round {auction_round} ---")
+        print(state.display_state())
+
+    def bid_made(self, state: State, player_idx: int, action: Action) -> None:
+        print(f"Player {player_idx} {action.type.lower()}s", end="")
+        if action.value is not None:
+            print(f" ${action.value:,}")
+        else:
+            print()
+
+    def property_taken(self, player_idx: int, property_value: int, refund: int) -> None:
+        print(f"  → Gets property {property_value}, refund ${refund:,}")
+
+    def auction_won(self, player_idx: int, property_value: int, winning_bid: int) -> None:
+        print(f"Player {player_idx} wins property {property_value} for ${winning_bid:,}")
+
+    def sale_started(self, sale_round: int, state: State) -> None:
+        print(f"\n--- Sale Round {sale_round} ---")
+        print(state.display_state())
+        print("Players simultaneously choose properties to play:")
+
+    def property_played(self, state: State, player_idx: int, action: Action) -> None:
+        print(f"Player {player_idx} plays property {action.value}")
+
+    def sale_resolved(self, state: State, results: tuple[tuple[int, int, int], ...]) -> None:
+        print("Sale results:")
+        for player_idx, property_value, check_value in results:
+            print(f"  Player {player_idx}: Property {property_value} → Check ${check_value:,}")
+        print(state.display_state())
+
+    def game_finished(self, state: State) -> None:
+        print("\n🏁 Game Complete!")
+
+    def game_interrupted(self, state: State) -> None:
+        print("\n\n🛑 Game interrupted by user!")
+        print("Current game state:")
+        print(state.display_state())
+
+    def game_results(self, scores: dict[int, int], winner: int | None) -> None:
+        if winner is not None:
+            print("\n🏆 FINAL RESULTS:")
+            for i, score in scores.items():
+                status = " (WINNER!)" if i == winner else ""
+                print(f"Player {i}: ${score:,}{status}")
+        else:
+            print("\n📊 PARTIAL RESULTS (Game Interrupted):")
+            for i, score in scores.items():
+                print(f"Player {i}: ${score:,}")
@@ -0,0 +1,318 @@
+"""Optional timing, counting and profiling of `GameEngine` runs.
+
+`EngineInstrumentation` attaches to an engine by wrapping that engine's own
+bound methods, its agents' `move` and its sink, so an engine built without
+one runs exactly the code it always did. One instrumentation object can be
+attached to any number of engines and aggregates over all of them:
+
+- decision latency per agent, as a log2-bucketed histogram
+- wall time of the bidding and selling phases
+- call count and time of every engine transition
+- time spent in the event sink (narration and formatting)
+- with `track_allocations`, the net number of memory blocks each
+  transition and agent call leaves allocated (`sys.getallocatedblocks`)
+
+`to_dict` exports everything as plain data. `cprofile` and
+`SamplingProfiler` capture a profile of whatever runs inside them, e.g. a
+batch of games.
+"""
+
+from __future__ import annotations
+
+import collections
+import cProfile
+import functools
+import inspect
+import io
+import pstats
+import sys
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .engine import GameEngine
+
+TRANSITIONS = (
+    "_set_phase",
+    "_start_auction",
+    "_process_bid",
+    "_process_pass",
+    "_process_bid_action",
+    "_advance_turn_or_finish_auction",
+    "_finish_auction",
+    "_start_sale_round",
+    "_collect_plays",
+    "_resolve_sale",
+)
+
+PHASES = {
+    "_play_bidding_phase": "bidding",
+    "_play_selling_phase": "selling",
+    "_play_bidding_phase_async": "bidding",
+    "_play_selling_phase_async": "selling",
+}
+
+SINK_EVENTS = (
+    "game_started", "phase_started", "auction_started", "bid_made", "property_taken", "auction_won",
+    "sale_started", "property_played", "sale_resolved", "game_finished", "game_interrupted", "game_results",
+)
+
+
+class LatencyHistogram:
+    """Durations in nanoseconds, bucketed by bit length (powers of two)."""
+
+    __slots__ = ("count", "total_ns", "min_ns", "max_ns", "buckets")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total_ns = 0
+        self.min_ns = 0
+        self.max_ns = 0
+        self.buckets = [0] * 64
+
+    def add(self, ns: int) -> None:
+        if not self.count or ns < self.min_ns:
+            self.min_ns = ns
+        if ns > self.max_ns:
+            self.max_ns = ns
+        self.count += 1
+        self.total_ns += ns
+        self.buckets[ns.bit_length()] += 1
+
+    @property
+    def mean_ns(self) -> float:
+        return self.total_ns / self.count if self.count else 0.0
+
+    def percentile(self, q: float) -> int:
+        """Upper edge of the bucket holding the `q` quantile, in nanoseconds."""
+        if not self.count:
+            return 0
+        target = q * self.count
+        seen = 0
+        for bits, n in enumerate(self.buckets):
+            seen += n
+            if seen >= target:
+                return min(1 << bits, self.max_ns)
+        return self.max_ns
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "total_s": self.total_ns / 1e9,
+            "mean_us": self.mean_ns / 1e3,
+            "min_us": self.min_ns / 1e3,
+            "p50_us": self.percentile(0.5) / 1e3,
+            "p90_us": self.percentile(0.9) / 1e3,
+            "p99_us": self.percentile(0.99) / 1e3,
+            "max_us": self.max_ns / 1e3,
+            # Upper bucket edge in microseconds -> count
+            "buckets": {f"{(1 << bits) / 1e3:g}": n for bits, n in enumerate(self.buckets) if n},
+        }
+
+
+class EngineInstrumentation:
+    def __init__(self, track_allocations: bool = False):
+        self.track_allocations = track_allocations
+        self.games = 0
+        self.agents: dict[str, LatencyHistogram] = {}
+        self.phases: dict[str, LatencyHistogram] = {}
+        self.transitions: dict[str, LatencyHistogram] = {}
+        self.sink = LatencyHistogram()
+        # Net allocated blocks left behind, by agent name or transition
+        self.allocations: collections.Counter[str] = collections.Counter()
+
+    def attach(self, engine: GameEngine) -> None:
+        self.games += 1
+        for name in TRANSITIONS:
+            setattr(engine, name, self._timed(getattr(engine, name), self.transitions, name))
+        for name, phase in PHASES.items():
+            # The async phases exist on `AsyncGameEngine` only
+            if hasattr(engine, name):
+                setattr(engine, name, self._timed(getattr(engine, name), self.phases, phase, count_blocks=False))
+
+        engine.agents = [_TimedAgent(agent, self, _agent_name(agent, seat)) for seat, agent in enumerate(engine.agents)]
+        engine.sink = _TimedSink(engine.sink, self.sink)
+
+    def _timed(
+        self, fn: Callable, table: dict[str, LatencyHistogram], key: str, count_blocks: bool = True
+    ) -> Callable:
+        histogram = table.setdefault(key, LatencyHistogram())
+        allocations = self.allocations if self.track_allocations and count_blocks else None
+        perf_counter_ns = time.perf_counter_ns
+
+        # Coroutine functions stay coroutine functions, timed up to their result
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                started = perf_counter_ns()
+                try:
+                    return await fn(*args, **kwargs)
+                finally:
+                    histogram.add(perf_counter_ns() - started)
+
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if allocations is not None:
+                blocks = sys.getallocatedblocks()
+            started = perf_counter_ns()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                histogram.add(perf_counter_ns() - started)
+                if allocations is not None:
+                    allocations[key] += sys.getallocatedblocks() - blocks
+
+        return wrapper
+
+    def to_dict(self) -> dict:
+        return {
+            "games": self.games,
+            "agents": {name: h.to_dict() for name, h in sorted(self.agents.items())},
+            "phases": {name: h.to_dict() for name, h in self.phases.items()},
+            "transitions": {name: h.to_dict() for name, h in self.transitions.items() if h.count},
+            "sink": self.sink.to_dict(),
+            "allocated_blocks": dict(self.allocations) if self.track_allocations else None,
+        }
+
+    def format(self) -> str:
+        lines = [f"{self.games} games"]
+
+        def table(title: str, rows: dict[str, LatencyHistogram]) -> None:
+            lines.append("")
+            lines.append(title)
+            lines.append(f"  {'':<32}{'calls':>10}{'total s':>10}{'mean µs':>10}{'p50 µs':>10}{'p99 µs':>10}")
+            for name, h in sorted(rows.items(), key=lambda item: -item[1].total_ns):
+                if h.count:
+                    lines.append(
+                        f"  {name:<32}{h.count:>10}{h.total_ns / 1e9:>10.3f}{h.mean_ns / 1e3:>10.1f}"
+                        f"{h.percentile(0.5) / 1e3:>10.1f}{h.percentile(0.99) / 1e3:>10.1f}"
+                    )
+
+        table("Phases", self.phases)
+        table("Agent decisions", self.agents)
+        table("Transitions (nested calls are included in their callers)", self.transitions)
+        table("Event sink", {"all events": self.sink})
+        if self.track_allocations:
+            lines.append("")
+            lines.append("Net allocated blocks")
+            for name, blocks in self.allocations.most_common():
+                lines.append(f"  {name:<32}{blocks:>10}")
+        return "\n".join(lines)
+
+
+def _agent_name(agent: object, seat: int) -> str:
+    return getattr(agent, "name", None) or f"{type(agent).__name__}#{seat}"
+
+
+class _TimedAgent:
+    def __init__(self, agent: Any, instrumentation: EngineInstrumentation, name: str):
+        self.agent = agent
+        self.name = name
+        self.move = instrumentation._timed(agent.move, instrumentation.agents, name)
+        if hasattr(agent, "move_async"):
+            self.move_async = instrumentation._timed(agent.move_async, instrumentation.agents, name)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.agent, name)
+
+
+class _TimedSink:
+    def __init__(self, sink: Any, histogram: LatencyHistogram):
+        self.sink = sink
+        perf_counter_ns = time.perf_counter_ns
+        for event in SINK_EVENTS:
+            method = getattr(sink, event)
+
+            def timed(*args: Any, method: Callable = method) -> None:
+                started = perf_counter_ns()
+                method(*args)
+                histogram.add(perf_counter_ns() - started)
+
+            setattr(self, event, timed)
+
+
+# Profiling
+@contextmanager
+def cprofile(path: str | None = None) -> Iterator[cProfile.Profile]:
+    """Deterministic profile of the enclosed block, dumped to `path` if given."""
+    profile = cProfile.Profile()
+    profile.enable()
+    try:
+        yield profile
+    finally:
+        profile.disable()
+        if path is not None:
+            profile.dump_stats(path)
+
+
+def format_cprofile(profile: cProfile.Profile, limit: int = 30) -> str:
+    out = io.StringIO()
+    pstats.Stats(profile, stream=out).sort_stats("cumulative").print_stats(limit)
+    return out.getvalue()
+
+
+class SamplingProfiler:
+    """Samples the calling thread's stack every `interval` seconds.
+
+    Much lower overhead than cProfile and no distortion of cheap, frequently
+    called functions. Stacks are counted in collapsed form (`outer;inner`),
+    the input format of flame graph tools.
+    """
+
+    def __init__(self, interval: float = 0.001):
+        self.interval = interval
+        self.stacks: collections.Counter[str] = collections.Counter()
+        self.samples = 0
+        self._target = threading.get_ident()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def __enter__(self) -> SamplingProfiler:
+        self._target = threading.get_ident()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._target)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_qualname} ({code.co_filename.rsplit('/', 1)[-1]}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+                self.samples += 1
+
+    def top_functions(self, limit: int = 30) -> list[tuple[str, int, int]]:
+        """(function, self samples, total samples), by total samples."""
+        own: collections.Counter[str] = collections.Counter()
+        total: collections.Counter[str] = collections.Counter()
+        for stack, n in self.stacks.items():
+            frames = stack.split(";")
+            own[frames[-1]] += n
+            for name in set(frames):
+                total[name] += n
+        return [(name, own[name], n) for name, n in total.most_common(limit)]
+
+    def format(self, limit: int = 30) -> str:
+        lines = [f"{self.samples} samples every {self.interval * 1000:g} ms", f"{'self %':>8}{'total %':>9}  function"]
+        for name, own, n in self.top_functions(limit):
+            lines.append(f"{own / self.samples:>8.1%}{n / self.samples:>9.1%}  {name}")
+        return "\n".join(lines)
+
+    def write_collapsed(self, path: str) -> None:
+        with open(path, "w") as f:
+            for stack, n in self.stacks.most_common():
+                f.write(f"{stack} {n}\n")
@@ -0,0 +1,314 @@
+"""Mutable make/unmake fast path.
+
+`MutableState` holds a position in plain lists and ints and updates it in
+place. Every `make_move` pushes an undo record so `unmake_move` can restore
+the previous position exactly, which lets tree searches walk up and down a
+line without allocating a new `State` per action. Transitions follow
+`rules.apply`: after any move the position is at the next decision point,
+and `to_state()` returns the same `State` that `rules.apply` would have
+produced.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from .core import Action, AuctionState, GamePhase, Player, SaleState
+from .state import State
+
+if TYPE_CHECKING:
+    from .rules import JointAction
+
+_BID = 0
+_PASS = 1
+_SALE = 2
+
+
+class MutableState:
+    __slots__ = (
+        "num_players", "money", "properties", "checks", "player_passed",
+        "current_player_idx", "phase", "round_number",
+        "property_deck", "property_pos", "check_deck", "check_pos",
+        "auction_active", "auction_properties", "bids", "high_bid", "passed_mask", "properties_taken",
+        "sale_active", "sale_checks", "played_properties",
+        "_undo",
+    )
+
+    def __init__(self, state: State):
+        players = state.players
+        self.num_players = len(players)
+        self.money = [p.money for p in players]
+        self.properties = [list(p.properties) for p in players]
+        self.checks = [list(p.checks) for p in players]
+        self.player_passed = tuple(p.passed for p in players)
+        self.current_player_idx = state.current_player_idx
+        self.phase = state.phase
+        self.round_number = state.round_number
+
+        self.property_deck = state.property_deck
+        self.property_pos = 0
+        self.check_deck = state.check_deck
+        self.check_pos = 0
+
+        auction_state = state.auction_state
+        self.auction_active = auction_state is not None
+        self.auction_properties = list(auction_state.current_properties) if auction_state else []
+        self.bids = [0] * self.num_players
+        self.properties_taken = [0] * self.num_players
+        self.passed_mask = 0
+        if auction_state:
+            for i, bid in auction_state.current_bids.items():
+                self.bids[i] = bid
+            for i, property_value in auction_state.properties_taken.items():
+                self.properties_taken[i] = property_value
+            for i in auction_state.players_passed:
+                self.passed_mask |= 1 << i
+        self.high_bid = max(self.bids)
+
+        sale_state = state.sale_state
+        self.sale_active = sale_state is not None
+        self.sale_checks = sale_state.current_checks if sale_state else ()
+        self.played_properties = dict(sale_state.played_properties) if sale_state else {}
+
+        self._undo: list[tuple] = []
+
+    @classmethod
+    def from_state(cls, state: State) -> MutableState:
+        return cls(state)
+
+    def to_state(self) -> State:
+        num_players = self.num_players
+        players = tuple(
+            Player(self.money[i], tuple(self.properties[i]), tuple(self.checks[i]), self.player_passed[i])
+            for i in range(num_players)
+        )
+
+        auction_state = None
+        if self.auction_active:
+            auction_state = AuctionState(
+                tuple(self.auction_properties),
+                {i: bid for i, bid in enumerate(self.bids) if bid},
+                {i for i in range(num_players) if self.passed_mask >> i & 1},
+                {i: p for i, p in enumerate(self.properties_taken) if p}
+            )
+
+        sale_state = None
+        if self.sale_active:
+            sale_state = SaleState(self.sale_checks, dict(self.played_properties))
+
+        return State(
+            players, self.current_player_idx, self.phase, self.round_number,
+            self.property_deck[self.property_pos:], self.check_deck[self.check_pos:],
+            auction_state, sale_state
+        )
+
+    def is_terminal(self) -> bool:
+        return self.phase == GamePhase.FINISHED
+
+    def scores(self) -> tuple[int, ...]:
+        return tuple(self.money[i] + sum(self.checks[i]) for i in range(self.num_players))
+
+    def legal_actions(self, player_idx: int | None = None) -> list[Action]:
+        if player_idx is None:
+            player_idx = self.current_player_idx
+        if self.phase == GamePhase.BIDDING:
+            if not self.auction_active or self.passed_mask >> player_idx & 1:
+                return []
+            actions = [Action.pass_turn()]
+            actions.extend(
+                Action.bid(amount)
+                for amount in range((self.high_bid // 1000 + 1) * 1000, self.money[player_idx] + 1, 1000)
+            )
+            return actions
+        if self.phase == GamePhase.SELLING:
+            return [Action.play_card(p) for p in self.properties[player_idx]]
+        return []
+
+    @property
+    def depth(self) -> int:
+        """Number of moves that can be unmade."""
+        return len(self._undo)
+
+    # Make / unmake
+    def make_move(self, action: Action | JointAction) -> None:
+        if self.phase == GamePhase.BIDDING:
+            if not isinstance(action, Action):
+                raise ValueError(f"Expected a single action in bidding phase, got {action}")
+            if not self.auction_active:
+                raise ValueError("No active auction")
+            if action.type == Action.Type.PASS:
+                self._make_pass()
+            elif action.type == Action.Type.BID:
+                self._make_bid(action.value)
+            else:
+                raise ValueError(f"Invalid action for bidding phase: {action}")
+        elif self.phase == GamePhase.SELLING:
+            if isinstance(action, Action) or len(action) != self.num_players:
+                raise ValueError(f"Expected one PLAY action per player in selling phase, got {action}")
+            self._make_sale(action)
+        else:
+            raise ValueError(f"No decision to make in phase {self.phase}")
+
+    def unmake_move(self) -> None:
+        record = self._undo.pop()
+        kind = record[0]
+        if kind == _BID:
+            _, player_idx, previous_bid, previous_high, previous_player, finished = record
+            if finished is not None:
+                self._unfinish_auction(finished)
+            self.bids[player_idx] = previous_bid
+            self.high_bid = previous_high
+            self.current_player_idx = previous_player
+        elif kind == _PASS:
+            _, player_idx, lowest, lowest_pos, refund, previous_taken, previous_player, finished = record
+            if finished is not None:
+                self._unfinish_auction(finished)
+            self.auction_properties.insert(lowest_pos, lowest)
+            self.money[player_idx] -= refund
+            self.properties[player_idx].pop()
+            self.passed_mask &= ~(1 << player_idx)
+            self.properties_taken[player_idx] = previous_taken
+            self.current_player_idx = previous_player
+        else:
+            _, results, previous = record
+            self.sale_checks, self.check_pos, self.phase, self.sale_active, self.played_properties = previous
+            for player_idx, property_value, position in reversed(results):
+                self.checks[player_idx].pop()
+                self.properties[player_idx].insert(position, property_value)
+
+    def _make_bid(self, bid_amount: int) -> None:
+        player_idx = self.current_player_idx
+        if bid_amount > self.money[player_idx]:
+            raise ValueError("Insufficient funds")
+        if bid_amount % 1000 != 0:
+            raise ValueError("Bids must be in increments of $1000")
+        if bid_amount <= self.high_bid:
+            raise ValueError("Bid must be higher than current bid")
+
+        previous_bid = self.bids[player_idx]
+        previous_high = self.high_bid
+        self.bids[player_idx] = bid_amount
+        self.high_bid = bid_amount
+        finished = self._advance_turn_or_finish_auction()
+        self._undo.append((_BID, player_idx, previous_bid, previous_high, player_idx, finished))
+
+    def _make_pass(self) -> None:
+        player_idx = self.current_player_idx
+        auction_properties = self.auction_properties
+        lowest = min(auction_properties)
+        lowest_pos = auction_properties.index(lowest)
+        del auction_properties[lowest_pos]
+
+        refund = self.bids[player_idx] // 2
+        self.money[player_idx] += refund
+        self.properties[player_idx].append(lowest)
+        self.passed_mask |= 1 << player_idx
+        previous_taken = self.properties_taken[player_idx]
+        self.properties_taken[player_idx] = lowest
+
+        finished = self._advance_turn_or_finish_auction()
+        self._undo.append((_PASS, player_idx, lowest, lowest_pos, refund, previous_taken, player_idx, finished))
+
+    def _advance_turn_or_finish_auction(self) -> tuple | None:
+        num_players = self.num_players
+        passed_mask = self.passed_mask
+        if num_players - passed_mask.bit_count() <= 1:
+            return self._finish_auction()
+
+        next_player = (self.current_player_idx + 1) % num_players
+        while passed_mask >> next_player & 1:
+            next_player = (next_player + 1) % num_players
+        self.current_player_idx = next_player
+        return None
+
+    def _finish_auction(self) -> tuple:
+        num_players = self.num_players
+        snapshot = (
+            tuple(self.auction_properties), tuple(self.bids), self.high_bid, self.passed_mask,
+            tuple(self.properties_taken), self.current_player_idx, self.phase,
+            self.property_pos, self.check_pos, self.sale_active, self.sale_checks, self.played_properties
+        )
+
+        winner_idx = None
+        winning_bid = 0
+        if num_players - self.passed_mask.bit_count() == 1:
+            winner_idx = next(i for i in range(num_players) if not self.passed_mask >> i & 1)
+            winning_bid = self.bids[winner_idx]
+            self.money[winner_idx] -= winning_bid
+            self.properties[winner_idx].append(max(self.auction_properties))
+
+        if self.property_pos < len(self.property_deck):
+            # Start the next auction
+            end = min(self.property_pos + num_players, len(self.property_deck))
+            self.auction_properties = list(self.property_deck[self.property_pos:end])
+            self.property_pos = end
+            self.bids = [0] * num_players
+            self.high_bid = 0
+            self.passed_mask = 0
+            self.properties_taken = [0] * num_players
+            self.current_player_idx = 0
+            self.phase = GamePhase.BIDDING
+        else:
+            self.auction_active = False
+            self.auction_properties = []
+            self.bids = [0] * num_players
+            self.high_bid = 0
+            self.passed_mask = 0
+            self.properties_taken = [0] * num_players
+            self._start_sale_round()
+
+        return (winner_idx, winning_bid, snapshot)
+
+    def _unfinish_auction(self, finished: tuple) -> None:
+        winner_idx, winning_bid, snapshot = finished
+        (
+            auction_properties, bids, self.high_bid, self.passed_mask,
+            properties_taken, self.current_player_idx, self.phase,
+            self.property_pos, self.check_pos, self.sale_active, self.sale_checks, self.played_properties
+        ) = snapshot
+        self.auction_properties = list(auction_properties)
+        self.bids = list(bids)
+        self.properties_taken = list(properties_taken)
+        self.auction_active = True
+        if winner_idx is not None:
+            self.money[winner_idx] += winning_bid
+            self.properties[winner_idx].pop()
+
+    def _start_sale_round(self) -> None:
+        end = min(self.check_pos + self.num_players, len(self.check_deck))
+        self.sale_checks = self.check_deck[self.check_pos:end]
+        self.check_pos = end
+        self.sale_active = True
+        self.played_properties = {}
+        self.phase = GamePhase.SELLING
+
+    def _make_sale(self, plays: JointAction) -> None:
+        properties = self.properties
+        for i, play in enumerate(plays):
+            if play.type != Action.Type.PLAY:
+                raise ValueError(f"Expected PLAY action in selling phase, got {play.type}")
+            if play.value not in properties[i]:
+                raise ValueError(f"Player {i} does not hold property {play.value}")
+
+        previous = (self.sale_checks, self.check_pos, self.phase, self.sale_active, self.played_properties)
+
+        order = sorted(range(self.num_players), key=lambda i: plays[i].value, reverse=True)
+        sorted_checks = sorted(self.sale_checks, reverse=True)
+        results = []
+        for player_idx, check_value in zip(order, sorted_checks):
+            property_value = plays[player_idx].value
+            hand = properties[player_idx]
+            position = hand.index(property_value)
+            del hand[position]
+            self.checks[player_idx].append(check_value)
+            results.append((player_idx, property_value, position))
+
+        if self.check_pos < len(self.check_deck):
+            self._start_sale_round()
+        else:
+            self.sale_active = False
+            self.sale_checks = ()
+            self.played_properties = {}
+            self.phase = GamePhase.FINISHED
+
+        self._undo.append((_SALE, results, previous))
@@ -0,0 +1,230 @@
+"""Compact bytes encoding of `State`.
+
+A packed state is a fixed-size `bytes` object (`PACKED_SIZE` bytes for any
+player count), so copying is a reference copy, hashing is cached by Python,
+and millions of positions fit comfortably in memory or on disk.
+
+Layout (little-endian):
+
+- header: player count, phase, current player, flags, round number and the
+  remaining length of both decks
+- six player slots: money and bid as u32, held properties as a 30-bit mask,
+  held checks as 2-bit counts per check value, plus the property taken in the
+  current auction and the property played in the current sale
+- auction: current properties as a 30-bit mask and passed players as a bitmask
+- sale: the current checks, in order
+- decks: the property deck at 5 bits per card and the check deck at 4 bits
+  per card, in draw order
+
+Deck order and every quantity the rules look at round-trip exactly. Hands,
+held checks and the cards in the current auction are sets as far as the
+rules are concerned; `unpack` returns them in ascending order, which is what
+`canonical` produces, so `unpack(pack(s)) == canonical(s)`.
+"""
+
+from __future__ import annotations
+
+import struct
+
+from .core import AuctionState, GamePhase, Player, SaleState
+from .state import State
+
+PackedState = bytes
+
+MAX_PLAYERS = 6
+DECK_SIZE = 30
+
+_HEADER = struct.Struct("<BBBBHBB")
+_PLAYER = struct.Struct("<IIIIBB")
+_AUCTION = struct.Struct("<IB")
+_SALE_CHECKS = MAX_PLAYERS
+_PROPERTY_DECK_BYTES = (DECK_SIZE * 5 + 7) // 8
+_CHECK_DECK_BYTES = (DECK_SIZE * 4 + 7) // 8
+
+_PLAYERS_OFFSET = _HEADER.size
+_AUCTION_OFFSET = _PLAYERS_OFFSET + MAX_PLAYERS * _PLAYER.size
+_SALE_OFFSET = _AUCTION_OFFSET + _AUCTION.size
+_PROPERTY_DECK_OFFSET = _SALE_OFFSET + _SALE_CHECKS
+_CHECK_DECK_OFFSET = _PROPERTY_DECK_OFFSET + _PROPERTY_DECK_BYTES
+
+PACKED_SIZE = _CHECK_DECK_OFFSET + _CHECK_DECK_BYTES
+
+_AUCTION_ACTIVE = 1
+_SALE_ACTIVE = 2
+
+_PHASES = tuple(GamePhase)
+_PHASE_CODES = {phase: code for code, phase in enumerate(_PHASES)}
+
+
+def properties_to_mask(properties: tuple[int, ...] | list[int]) -> int:
+    mask = 0
+    for p in properties:
+        mask |= 1 << (p - 1)
+    return mask
+
+
+def mask_to_properties(mask: int) -> tuple[int, ...]:
+    properties = []
+    while mask:
+        low = mask & -mask
+        properties.append(low.bit_length())
+        mask ^= low
+    return tuple(properties)
+
+
+def checks_to_counts(checks: tuple[int, ...] | list[int]) -> int:
+    counts = 0
+    for c in checks:
+        counts += 1 << (c // 1000 * 2)
+    return counts
+
+
+def counts_to_checks(counts: int) -> tuple[int, ...]:
+    checks = []
+    value = 0
+    while counts:
+        checks.extend((value * 1000,) * (counts & 3))
+        counts >>= 2
+        value += 1
+    return tuple(checks)
+
+
+def canonical(state: State) -> State:
+    """`state` with every order-free collection sorted."""
+    players = tuple(
+        Player(p.money, tuple(sorted(p.properties)), tuple(sorted(p.checks)), p.passed)
+        for p in state.players
+    )
+    auction_state = state.auction_state
+    if auction_state is not None:
+        auction_state = AuctionState(
+            tuple(sorted(auction_state.current_properties)),
+            dict(auction_state.current_bids),
+            set(auction_state.players_passed),
+            dict(auction_state.properties_taken)
+        )
+    sale_state = state.sale_state
+    if sale_state is not None:
+        sale_state = SaleState(sale_state.current_checks, dict(sale_state.played_properties))
+    return State(
+        players, state.current_player_idx, state.phase, state.round_number,
+        state.property_deck, state.check_deck, auction_state, sale_state
+    )
+
+
+def pack(state: State) -> PackedState:
+    num_players = len(state.players)
+    auction_state = state.auction_state
+    sale_state = state.sale_state
+    buffer = bytearray(PACKED_SIZE)
+
+    flags = (_AUCTION_ACTIVE if auction_state is not None else 0) | (_SALE_ACTIVE if sale_state is not None else 0)
+    _HEADER.pack_into(
+        buffer, 0, num_players, _PHASE_CODES[state.phase], state.current_player_idx, flags,
+        state.round_number, len(state.property_deck), len(state.check_deck)
+    )
+
+    bids = auction_state.current_bids if auction_state else {}
+    taken = auction_state.properties_taken if auction_state else {}
+    played = sale_state.played_properties if sale_state else {}
+    for i, player in enumerate(state.players):
+        _PLAYER.pack_into(
+            buffer, _PLAYERS_OFFSET + i * _PLAYER.size,
+            player.money, properties_to_mask(player.properties), checks_to_counts(player.checks),
+            bids.get(i, 0), taken.get(i, 0), played.get(i, 0)
+        )
+
+    if auction_state is not None:
+        passed_mask = 0
+        for i in auction_state.players_passed:
+            passed_mask |= 1 << i
+        _AUCTION.pack_into(buffer, _AUCTION_OFFSET, properties_to_mask(auction_state.current_properties), passed_mask)
+
+    if sale_state is not None:
+        for i, c in enumerate(sale_state.current_checks):
+            buffer[_SALE_OFFSET + i] = c // 1000 + 1
+
+    deck = 0
+    for i, p in enumerate(state.property_deck):
+        deck |= p << (i * 5)
+    buffer[_PROPERTY_DECK_OFFSET:_CHECK_DECK_OFFSET] = deck.to_bytes(_PROPERTY_DECK_BYTES, "little")
+
+    deck = 0
+    for i, c in enumerate(state.check_deck):
+        deck |= (c // 1000) << (i * 4)
+    buffer[_CHECK_DECK_OFFSET:] = deck.to_bytes(_CHECK_DECK_BYTES, "little")
+
+    return bytes(buffer)
+
+
+def unpack(data: PackedState) -> State:
+    num_players, phase, current_player_idx, flags, round_number, property_len, check_len = _HEADER.unpack_from(data, 0)
+
+    players = []
+    bids = {}
+    taken = {}
+    played = {}
+    for i in range(num_players):
+        money, properties, checks, bid, property_taken, property_played = _PLAYER.unpack_from(
+            data, _PLAYERS_OFFSET + i * _PLAYER.size
+        )
+        players.append(Player(money, mask_to_properties(properties), counts_to_checks(checks)))
+        if bid:
+            bids[i] = bid
+        if property_taken:
+            taken[i] = property_taken
+        if property_played:
+            played[i] = property_played
+
+    auction_state = None
+    if flags & _AUCTION_ACTIVE:
+        current_properties, passed_mask = _AUCTION.unpack_from(data, _AUCTION_OFFSET)
+        auction_state = AuctionState(
+            mask_to_properties(current_properties),
+            bids,
+            {i for i in range(num_players) if passed_mask >> i & 1},
+            taken
+        )
+
+    sale_state = None
+    if flags & _SALE_ACTIVE:
+        current_checks = tuple(
+            (b - 1) * 1000 for b in data[_SALE_OFFSET:_SALE_OFFSET + _SALE_CHECKS] if b
+        )
+        sale_state = SaleState(current_checks, played)
+
+    deck = int.from_bytes(data[_PROPERTY_DECK_OFFSET:_CHECK_DECK_OFFSET], "little")
+    property_deck = tuple((deck >> (i * 5)) & 31 for i in range(property_len))
+
+    deck = int.from_bytes(data[_CHECK_DECK_OFFSET:PACKED_SIZE], "little")
+    check_deck = tuple(((deck >> (i * 4)) & 15) * 1000 for i in range(check_len))
+
+    return State(
+        tuple(players), current_player_idx, _PHASES[phase], round_number,
+        property_deck, check_deck, auction_state, sale_state
+    )
+
+
+# Field access without unpacking the whole state
+def num_players(data: PackedState) -> int:
+    return data[0]
+
+
+def phase(data: PackedState) -> GamePhase:
+    return _PHASES[data[1]]
+
+
+def current_player(data: PackedState) -> int:
+    return data[2]
+
+
+def money(data: PackedState, player_idx: int) -> int:
+    return _PLAYER.unpack_from(data, _PLAYERS_OFFSET + player_idx * _PLAYER.size)[0]
+
+
+def properties_mask(data: PackedState, player_idx: int) -> int:
+    return _PLAYER.unpack_from(data, _PLAYERS_OFFSET + player_idx * _PLAYER.size)[1]
+
+
+def passed_mask(data: PackedState) -> int:
+    return _AUCTION.unpack_from(data, _AUCTION_OFFSET)[1]
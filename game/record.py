@@ -0,0 +1,299 @@
+"""Append-only binary game records.
+
+A record file starts with `MAGIC` followed by any number of records, each a
+little-endian u32 payload length and the payload:
+
+- player count (u8), flags (u8, bit 0 set if the game was seeded) and the
+  seed (u64, modulo 2**64 as in `game.seeding`, 0 if unseeded)
+- the property deck as a length byte and one byte per card, in draw order
+- the check deck as a length byte and one byte per check (value / 1000)
+- the actions in play order: one LEB128 varint per bidding decision (0 for
+  a pass, otherwise the bid / 1000, so one byte below $128,000), then one
+  byte per seat for every sale round
+
+The decks are stored even for seeded games so a record replays without the
+seed derivation, and the actions need no tags since the phase at each step
+says how many bytes the next decision takes. A typical game is under 200
+bytes. Files are only ever appended to and are read one record at a time,
+so neither writing nor reading keeps more than one game in memory. A record
+torn by a crash mid-append is ignored by readers and cut off by the next
+`RecordWriter`.
+
+    with RecordWriter("games.fsr") as writer:
+        GameEngine(agents, RecordingSink(writer), seed=seed).play_game()
+
+    for record in read_records("games.fsr"):
+        final = record.final_state()
+"""
+
+from __future__ import annotations
+
+import os
+import struct
+from collections.abc import Iterator
+from typing import IO, TYPE_CHECKING
+
+import attrs
+
+from . import rules
+from .core import Action, GamePhase, Player
+from .events import NullSink
+from .state import State
+
+if TYPE_CHECKING:
+    from .events import EventSink
+
+MAGIC = b"FSREC\x01"
+
+_LENGTH = struct.Struct("<I")
+_HEADER = struct.Struct("<BBQ")
+_SEEDED = 1
+_SEED_MASK = (1 << 64) - 1
+
+Decision = Action | rules.JointAction
+
+
+@attrs.frozen
+class GameRecord:
+    num_players: int
+    seed: int | None
+    property_deck: tuple[int, ...]
+    check_deck: tuple[int, ...]
+    actions: bytes  # encoded as described in the module docstring
+
+    def encode(self) -> bytes:
+        flags = _SEEDED if self.seed is not None else 0
+        return b"".join((
+            _HEADER.pack(self.num_players, flags, (self.seed or 0) & _SEED_MASK),
+            bytes((len(self.property_deck), *self.property_deck)),
+            bytes((len(self.check_deck), *(c // 1000 for c in self.check_deck))),
+            self.actions,
+        ))
+
+    @classmethod
+    def decode(cls, payload: bytes) -> GameRecord:
+        num_players, flags, seed = _HEADER.unpack_from(payload, 0)
+        offset = _HEADER.size
+        property_len = payload[offset]
+        property_deck = tuple(payload[offset + 1:offset + 1 + property_len])
+        offset += 1 + property_len
+        check_len = payload[offset]
+        check_deck = tuple(c * 1000 for c in payload[offset + 1:offset + 1 + check_len])
+        offset += 1 + check_len
+        return cls(num_players, seed if flags & _SEEDED else None, property_deck, check_deck, payload[offset:])
+
+    def initial_state(self) -> State:
+        """The dealt game, in the SETUP phase."""
+        money = rules.initial_money(self.num_players)
+        return State(
+            players=tuple(Player(money=money, properties=(), checks=()) for _ in range(self.num_players)),
+            current_player_idx=0,
+            phase=GamePhase.SETUP,
+            round_number=0,
+            property_deck=self.property_deck,
+            check_deck=self.check_deck
+        )
+
+    def decisions(self) -> Iterator[tuple[State, Decision]]:
+        """Every decision point of the game with the decision taken there."""
+        state = rules.begin(self.initial_state())
+        actions = self.actions
+        offset = 0
+        while offset < len(actions):
+            if state.phase == GamePhase.BIDDING:
+                code, offset = _read_varint(actions, offset)
+                decision = Action.bid(code * 1000) if code else Action.pass_turn()
+            else:
+                decision = tuple(Action.play_card(p) for p in actions[offset:offset + self.num_players])
+                offset += self.num_players
+            yield state, decision
+            state = rules.apply(state, decision)
+
+    def states(self) -> Iterator[State]:
+        """The state at every decision point, then the final state."""
+        state = None
+        for state, decision in self.decisions():
+            yield state
+        if state is not None:
+            yield rules.apply(state, decision)
+
+    def state_at(self, ply: int) -> State:
+        """The state before decision `ply`, or the final state if `ply` is past the end."""
+        state = None
+        for i, state in enumerate(self.states()):
+            if i == ply:
+                break
+        if state is None:
+            raise ValueError("Record has no decisions")
+        return state
+
+    def final_state(self) -> State:
+        state = None
+        for state in self.states():
+            pass
+        if state is None:
+            raise ValueError("Record has no decisions")
+        return state
+
+
+def _write_varint(out: bytearray, value: int) -> None:
+    while value >= 0x80:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data: bytes, offset: int) -> tuple[int, int]:
+    value = 0
+    shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+class RecordWriter:
+    """Appends records to a binary file, writing `MAGIC` if the file is new."""
+
+    def __init__(self, file: str | os.PathLike | IO[bytes]):
+        if isinstance(file, (str, os.PathLike)):
+            self._file = open(file, "ab")
+            self._owns_file = True
+            if self._file.tell() > 0:
+                with open(file, "rb") as existing:
+                    end = _complete_length(existing)
+                self._file.truncate(end)
+                self._file.seek(end)
+        else:
+            self._file = file
+            self._owns_file = False
+        if self._file.tell() == 0:
+            self._file.write(MAGIC)
+        self.records = 0
+
+    def __enter__(self) -> RecordWriter:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def write(self, record: GameRecord) -> None:
+        payload = record.encode()
+        self._file.write(_LENGTH.pack(len(payload)))
+        self._file.write(payload)
+        self.records += 1
+
+    def flush(self) -> None:
+        self._file.flush()
+
+    def close(self) -> None:
+        if self._owns_file:
+            self._file.close()
+        else:
+            self._file.flush()
+
+
+def iter_records(file: IO[bytes]) -> Iterator[GameRecord]:
+    """Stream records from an open binary file positioned at its start.
+
+    Stops at the end of the file or at a torn trailing record.
+    """
+    if file.read(len(MAGIC)) != MAGIC:
+        raise ValueError("Not a game record file")
+    while True:
+        prefix = file.read(_LENGTH.size)
+        if len(prefix) < _LENGTH.size:
+            return
+        (length,) = _LENGTH.unpack(prefix)
+        payload = file.read(length)
+        if len(payload) < length:
+            return
+        yield GameRecord.decode(payload)
+
+
+def _complete_length(file: IO[bytes]) -> int:
+    """Length of the file up to the end of its last complete record."""
+    if file.read(len(MAGIC)) != MAGIC:
+        raise ValueError("Not a game record file")
+    end = file.tell()
+    size = file.seek(0, os.SEEK_END)
+    file.seek(end)
+    while True:
+        prefix = file.read(_LENGTH.size)
+        if len(prefix) < _LENGTH.size:
+            return end
+        (length,) = _LENGTH.unpack(prefix)
+        if end + _LENGTH.size + length > size:
+            return end
+        end = file.seek(length, os.SEEK_CUR)
+
+
+def read_records(path: str | os.PathLike) -> Iterator[GameRecord]:
+    with open(path, "rb") as file:
+        yield from iter_records(file)
+
+
+class RecordingSink:
+    """Event sink that writes each finished game to a `RecordWriter`.
+
+    Interrupted games are dropped, as are games continued by
+    `GameEngine.restore`, whose deal and early moves this sink never saw.
+    Every event is also forwarded to `inner`, so a game can be narrated and
+    recorded at once.
+    """
+
+    def __init__(self, writer: RecordWriter, inner: EventSink | None = None):
+        self.writer = writer
+        self.inner = inner if inner is not None else NullSink()
+        self._header: tuple[int, int | None, tuple[int, ...], tuple[int, ...]] | None = None
+        self._actions = bytearray()
+        self._plays: list[int] = []
+
+    def game_started(self, state: State, seed: int | None) -> None:
+        self._header = (len(state.players), seed, state.property_deck, state.check_deck)
+        self._actions = bytearray()
+        self._plays = [0] * len(state.players)
+        self.inner.game_started(state, seed)
+
+    def phase_started(self, phase: GamePhase) -> None:
+        self.inner.phase_started(phase)
+
+    def auction_started(self, auction_round: int, state: State) -> None:
+        self.inner.auction_started(auction_round, state)
+
+    def bid_made(self, state: State, player_idx: int, action: Action) -> None:
+        _write_varint(self._actions, action.value // 1000 if action.type == Action.Type.BID else 0)
+        self.inner.bid_made(state, player_idx, action)
+
+    def property_taken(self, player_idx: int, property_value: int, refund: int) -> None:
+        self.inner.property_taken(player_idx, property_value, refund)
+
+    def auction_won(self, player_idx: int, property_value: int, winning_bid: int) -> None:
+        self.inner.auction_won(player_idx, property_value, winning_bid)
+
+    def sale_started(self, sale_round: int, state: State) -> None:
+        self.inner.sale_started(sale_round, state)
+
+    def property_played(self, state: State, player_idx: int, action: Action) -> None:
+        self._plays[player_idx] = action.value
+        self.inner.property_played(state, player_idx, action)
+
+    def sale_resolved(self, state: State, results: tuple[tuple[int, int, int], ...]) -> None:
+        self._actions.extend(self._plays)
+        self.inner.sale_resolved(state, results)
+
+    def game_finished(self, state: State) -> None:
+        if self._header is not None:
+            self.writer.write(GameRecord(*self._header, bytes(self._actions)))
+            self._header = None
+        self.inner.game_finished(state)
+
+    def game_interrupted(self, state: State) -> None:
+        self._header = None
+        self.inner.game_interrupted(state)
+
+    def game_results(self, scores: dict[int, int], winner: int | None) -> None:
+        self.inner.game_results(scores, winner)
@@ -0,0 +1,471 @@
+"""Agents served from another process over a Unix socket or localhost TCP.
+
+`AgentServer` serves agents by name; `RemoteAgent` implements `Agent` (and
+`AsyncAgent`) by asking the server. Each `RemoteAgent` is one seat: it owns
+one agent instance on the server, so agents that keep state between moves
+(search trees, RNG streams) behave as they would locally, and `set_rng`
+reseeds that instance. An `AgentClient` holds a pool of persistent
+connections shared by the agents it makes and pipelines requests on them:
+any number of threads or coroutines, e.g. the games of one
+`aio.play_games` call, can have moves in flight at once, each connection
+carrying many requests and a reader thread matching replies to requests by
+id.
+
+Wire protocol (little-endian):
+
+- hello, client to server: `MAGIC`
+- hello reply: status (u8, 0 = ok), message length (u32), message
+- request: request id (u32), session id (u32), operation (u8), then
+  - open: agent name length (u8) and agent name, creating the session's agent
+  - seed: the state of the RNG for the agent's `set_rng` (`random.Random`
+    internal state: 625 u32 words, then a flag byte and a double for the
+    cached gaussian)
+  - move: the state packed with `packed.pack`
+  - close: nothing
+- reply: request id (u32), status (u8), action type (u8), value (u32); on
+  an error status the value is the length of the message that follows
+
+Sessions belong to a connection, which the server answers in order; a
+`RemoteAgent` keeps its session on one connection, and sessions are spread
+over the client's connections as they open. Server-side RNG state is not
+part of `GameEngine.snapshot`.
+
+Addresses are a socket path (`"/tmp/agents.sock"`) or a `(host, port)` pair.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import os
+import random
+import socket
+import socketserver
+import stat
+import struct
+import threading
+import traceback
+from collections.abc import Callable, Mapping
+from concurrent.futures import Future
+from typing import TYPE_CHECKING
+
+from .core import Action
+from .packed import PACKED_SIZE, pack, unpack
+
+if TYPE_CHECKING:
+    from .core import Agent
+    from .state import State
+
+Address = str | tuple[str, int]
+
+MAGIC = b"FSAGT\x02"
+
+_STATUS = struct.Struct("<BI")
+_REQUEST = struct.Struct("<IIB")
+_RNG_STATE = struct.Struct("<625I?d")
+_REPLY = struct.Struct("<IBBI")
+
+_OK = 0
+_ERROR = 1
+
+# Request operations
+_OPEN = 0
+_SET_RNG = 1
+_MOVE = 2
+_CLOSE = 3
+
+_TYPES = tuple(Action.Type)
+_TYPE_CODES = {t: code for code, t in enumerate(_TYPES)}
+
+
+class RemoteAgentError(Exception):
+    """The server could not produce a move; carries the server's message."""
+
+
+def _connect(address: Address, timeout: float | None) -> socket.socket:
+    if isinstance(address, str):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    else:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    sock.settimeout(timeout)
+    try:
+        sock.connect(address)
+    except OSError:
+        sock.close()
+        raise
+    sock.settimeout(None)
+    return sock
+
+
+def _read_exact(stream, size: int) -> bytes:
+    data = stream.read(size)
+    if len(data) != size:
+        raise ConnectionError("Connection closed")
+    return data
+
+
+def _after(first: Future[Action], then: Future[Action]) -> Future[Action]:
+    """`then`'s outcome, or `first`'s error if it failed."""
+    future: Future[Action] = Future()
+
+    def settle(_: Future[Action]) -> None:
+        error = first.exception() or then.exception()
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(then.result())
+
+    first.add_done_callback(lambda _: then.add_done_callback(settle))
+    return future
+
+
+def encode_action(action: Action) -> tuple[int, int]:
+    return _TYPE_CODES[action.type], action.value or 0
+
+
+def decode_action(type_code: int, value: int) -> Action:
+    action_type = _TYPES[type_code]
+    if action_type == Action.Type.PASS:
+        return Action.pass_turn()
+    if action_type == Action.Type.BID:
+        return Action.bid(value)
+    return Action.play_card(value)
+
+
+# Client
+class _Connection:
+    """One socket with any number of requests in flight."""
+
+    def __init__(self, address: Address, timeout: float | None):
+        self.sock = _connect(address, timeout)
+        self.stream = self.sock.makefile("rb")
+        self.pending: dict[int, Future[Action]] = {}
+        self.ids = itertools.count()
+        self.lock = threading.Lock()
+        self.closed = False
+        # Sessions open on this connection, for spreading new ones
+        self.sessions = 0
+
+        self.sock.sendall(MAGIC)
+        status, length = _STATUS.unpack(_read_exact(self.stream, _STATUS.size))
+        message = _read_exact(self.stream, length).decode()
+        if status != _OK:
+            self.close()
+            raise RemoteAgentError(message)
+
+        self.reader = threading.Thread(target=self._read_replies, name="remote-agent-reader", daemon=True)
+        self.reader.start()
+
+    def request(self, session: int, operation: int, payload: bytes = b"") -> Future[Action]:
+        future: Future[Action] = Future()
+        with self.lock:
+            if self.closed:
+                raise ConnectionError("Connection closed")
+            request_id = next(self.ids) & 0xFFFFFFFF
+            self.pending[request_id] = future
+            try:
+                self.sock.sendall(_REQUEST.pack(request_id, session, operation) + payload)
+            except OSError:
+                del self.pending[request_id]
+                raise
+        return future
+
+    def _read_replies(self) -> None:
+        error: BaseException = ConnectionError("Connection closed")
+        try:
+            while True:
+                request_id, status, type_code, value = _REPLY.unpack(_read_exact(self.stream, _REPLY.size))
+                if status == _OK:
+                    result: Action | BaseException = decode_action(type_code, value)
+                else:
+                    result = RemoteAgentError(_read_exact(self.stream, value).decode())
+                with self.lock:
+                    future = self.pending.pop(request_id)
+                if isinstance(result, BaseException):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+        except (OSError, ValueError) as e:
+            error = e if isinstance(e, ConnectionError) else ConnectionError(str(e))
+        finally:
+            with self.lock:
+                self.closed = True
+                pending, self.pending = self.pending, {}
+            for future in pending.values():
+                future.set_exception(error)
+
+    def close(self) -> None:
+        with self.lock:
+            self.closed = True
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.sock.close()
+
+
+class AgentClient:
+    """Up to `connections` connections to an `AgentServer`, shared by the agents it makes.
+
+    Connections are opened lazily: a new session goes to a new connection
+    while there are fewer than `connections`, otherwise to the one with the
+    fewest sessions. A connection that fails is dropped; its agents open new
+    sessions on their next move, and requests that were in flight on it
+    raise `ConnectionError`.
+    """
+
+    def __init__(self, address: Address, connections: int = 1, timeout: float | None = None):
+        if connections < 1:
+            raise ValueError("connections must be at least 1")
+        self.address = address
+        self.max_connections = connections
+        self.timeout = timeout
+        self._connections: list[_Connection] = []
+        self._sessions = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def agent(self, agent_name: str, name: str | None = None) -> RemoteAgent:
+        return RemoteAgent(self, agent_name, name)
+
+    def _open_session(self) -> tuple[_Connection, int]:
+        with self._lock:
+            self._connections = [c for c in self._connections if not c.closed]
+            if len(self._connections) < self.max_connections:
+                self._connections.append(_Connection(self.address, self.timeout))
+                connection = self._connections[-1]
+            else:
+                connection = min(self._connections, key=lambda c: c.sessions)
+            connection.sessions += 1
+            return connection, next(self._sessions) & 0xFFFFFFFF
+
+    def close(self) -> None:
+        with self._lock:
+            for connection in self._connections:
+                connection.close()
+            self._connections = []
+
+    def __enter__(self) -> AgentClient:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+class RemoteAgent:
+    """An `Agent` whose moves are made by one `agent_name` instance on an `AgentServer`.
+
+    `server` is an `AgentClient` to share connections with other agents, or
+    an address for a client of this agent's own. The server-side agent is
+    created on the first move; `set_rng` hands it a copy of the given RNG,
+    so seeded games play as they would locally on `packed.canonical` states:
+    hands cross the wire as sets, so an agent that depends on their order
+    (e.g. `RandomAgent` picking a card to sell) can choose differently.
+    """
+
+    def __init__(
+        self,
+        server: Address | AgentClient,
+        agent_name: str,
+        name: str | None = None,
+        timeout: float | None = None,
+    ):
+        if isinstance(server, AgentClient):
+            self.client = server
+            self._owns_client = False
+        else:
+            self.client = AgentClient(server, timeout=timeout)
+            self._owns_client = True
+        self.agent_name = agent_name
+        self.name = name or f"Remote {agent_name}"
+        self.timeout = timeout if timeout is not None else self.client.timeout
+        self._connection: _Connection | None = None
+        self._session = 0
+        self._rng_state: bytes | None = None
+        # The last reseed's reply, until a move reports its error
+        self._seeded: Future[Action] | None = None
+        self._lock = threading.Lock()
+
+    def set_rng(self, rng: random.Random) -> None:
+        _, words, gauss = rng.getstate()
+        with self._lock:
+            self._rng_state = _RNG_STATE.pack(*words, gauss is not None, gauss or 0.0)
+            if self._connection is not None and not self._connection.closed:
+                self._seeded = self._connection.request(self._session, _SET_RNG, self._rng_state)
+
+    def submit(self, state: State) -> Future[Action]:
+        with self._lock:
+            if self._connection is None or self._connection.closed:
+                self._connection, self._session = self.client._open_session()
+                name = self.agent_name.encode()
+                # Pipelined: a failed open fails the move after it
+                self._connection.request(self._session, _OPEN, bytes([len(name)]) + name)
+                if self._rng_state is not None:
+                    self._seeded = self._connection.request(self._session, _SET_RNG, self._rng_state)
+            seeded, self._seeded = self._seeded, None
+            move = self._connection.request(self._session, _MOVE, pack(state))
+        # Pipelined too: a failed reseed fails the move after it
+        return move if seeded is None else _after(seeded, move)
+
+    def move(self, state: State) -> Action:
+        return self.submit(state).result(self.timeout)
+
+    async def move_async(self, state: State) -> Action:
+        return await asyncio.wrap_future(self.submit(state))
+
+    def close(self) -> None:
+        """Drop the server-side agent, and close the connections if the client is this agent's own."""
+        with self._lock:
+            connection, self._connection = self._connection, None
+        if connection is not None and not connection.closed:
+            connection.sessions -= 1
+            try:
+                connection.request(self._session, _CLOSE)
+            except OSError:
+                pass
+        if self._owns_client:
+            self.client.close()
+
+    def __enter__(self) -> RemoteAgent:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+# Server
+class _AgentHandler(socketserver.StreamRequestHandler):
+    server: _ThreadingServer
+
+    def setup(self) -> None:
+        super().setup()
+        if self.request.family != socket.AF_UNIX:
+            self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def handle(self) -> None:
+        try:
+            if _read_exact(self.rfile, len(MAGIC)) != MAGIC:
+                self._status(_ERROR, "Not a remote agent client")
+                return
+            self._status(_OK, "")
+        except ConnectionError:
+            return
+
+        # Session id -> its agent, or the reason it could not be opened
+        sessions: dict[int, Agent | str] = {}
+        while True:
+            header = self.rfile.read(_REQUEST.size)
+            if len(header) != _REQUEST.size:
+                return
+            request_id, session, operation = _REQUEST.unpack(header)
+            try:
+                if operation == _OPEN:
+                    name = _read_exact(self.rfile, _read_exact(self.rfile, 1)[0]).decode()
+                    factory = self.server.agents.get(name)
+                    if factory is None:
+                        sessions[session] = f"Unknown agent {name!r}, choose from {', '.join(self.server.agents)}"
+                    else:
+                        sessions[session] = factory()
+                    reply = self._reply(request_id, sessions[session], None)
+                elif operation == _SET_RNG:
+                    *words, has_gauss, gauss = _RNG_STATE.unpack(_read_exact(self.rfile, _RNG_STATE.size))
+                    agent = sessions.get(session, "Session not open")
+                    set_rng = getattr(agent, "set_rng", None)
+                    if set_rng is not None:
+                        rng = random.Random()
+                        rng.setstate((3, tuple(words), gauss if has_gauss else None))
+                        set_rng(rng)
+                    reply = self._reply(request_id, agent, None)
+                elif operation == _MOVE:
+                    state = unpack(_read_exact(self.rfile, PACKED_SIZE))
+                    agent = sessions.get(session, "Session not open")
+                    reply = self._reply(request_id, agent, agent.move(state) if not isinstance(agent, str) else None)
+                elif operation == _CLOSE:
+                    sessions.pop(session, None)
+                    reply = _REPLY.pack(request_id, _OK, 0, 0)
+                else:
+                    return
+            except ConnectionError:
+                return
+            except Exception:
+                error = traceback.format_exc().encode()
+                reply = _REPLY.pack(request_id, _ERROR, 0, len(error)) + error
+            try:
+                self.wfile.write(reply)
+            except OSError:
+                return
+
+    @staticmethod
+    def _reply(request_id: int, agent: Agent | str, action: Action | None) -> bytes:
+        if isinstance(agent, str):
+            error = agent.encode()
+            return _REPLY.pack(request_id, _ERROR, 0, len(error)) + error
+        return _REPLY.pack(request_id, _OK, *(encode_action(action) if action is not None else (0, 0)))
+
+    def _status(self, status: int, message: str) -> None:
+        data = message.encode()
+        self.wfile.write(_STATUS.pack(status, len(data)) + data)
+
+
+class _ThreadingServer(socketserver.ThreadingMixIn, socketserver.BaseServer):
+    daemon_threads = True
+    agents: Mapping[str, Callable[[], Agent]]
+
+
+class _UnixServer(_ThreadingServer, socketserver.UnixStreamServer):
+    pass
+
+
+class _TCPServer(_ThreadingServer, socketserver.TCPServer):
+    allow_reuse_address = True
+
+
+class AgentServer:
+    """Serves agents by name, one instance per client session.
+
+    `agents` maps the names clients ask for to zero-argument factories. Use
+    port 0 to bind any free port; `address` holds the bound address. A
+    stale socket file at a Unix `address` is replaced; any other file there
+    is an error.
+    """
+
+    def __init__(self, address: Address, agents: Mapping[str, Callable[[], Agent]]):
+        if isinstance(address, str):
+            try:
+                mode = os.stat(address).st_mode
+            except FileNotFoundError:
+                pass
+            else:
+                if not stat.S_ISSOCK(mode):
+                    raise FileExistsError(f"{address} exists and is not a socket")
+                os.unlink(address)
+            self._server: _ThreadingServer = _UnixServer(address, _AgentHandler)
+        else:
+            self._server = _TCPServer(address, _AgentHandler)
+        self._server.agents = dict(agents)
+        self.address: Address = self._server.server_address
+        self._thread: threading.Thread | None = None
+
+    def serve_forever(self) -> None:
+        self._server.serve_forever()
+
+    def start(self) -> AgentServer:
+        """Serve from a background thread."""
+        self._thread = threading.Thread(target=self._server.serve_forever, name="agent-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def close(self) -> None:
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+        if isinstance(self.address, str) and os.path.exists(self.address):
+            os.unlink(self.address)
+
+    def __enter__(self) -> AgentServer:
+        return self.start()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
@@ -0,0 +1,385 @@
+"""Pure game rules.
+
+Every function here takes a `State` and returns a new one without touching
+its argument, so search agents and external drivers can advance positions
+without a `GameEngine`. Transitions build `State`, `AuctionState` and
+`SaleState` directly instead of going through `attrs.evolve`, which keeps
+them cheap enough for rollouts.
+
+`apply` and `legal_actions` form the step interface: after `begin`, a state
+is always a decision point. In the bidding phase the current player acts
+with a single `Action`; in the selling phase all players act at once with a
+`JointAction`, one PLAY action per seat.
+"""
+
+from __future__ import annotations
+
+import itertools
+import random
+from collections.abc import Iterator
+
+from .core import Action, AuctionState, GamePhase, Player, SaleState
+from .state import State
+
+JointAction = tuple[Action, ...]
+
+PROPERTY_DECK = tuple(range(1, 31))
+CHECK_DECK = (0, 2000, 3000, 4000, 5000, 6000, 7000, 8000, 9000, 10000, 11000, 12000, 13000, 14000, 15000) * 2
+
+
+def _max_money() -> int:
+    # Bids are only paid by the auction winner, yet a pass refunds half the
+    # standing bid, so a player can grow their money by half in every auction.
+    money = 16000
+    for _ in range(len(PROPERTY_DECK) // 3):
+        money += money // 2
+    return money
+
+
+# Upper bound on any player's money, and hence on any bid
+MAX_MONEY = _max_money()
+
+
+def initial_money(num_players: int) -> int:
+    # Money distribution: 2x $2000 coins + 14x $1000 coins (3-4 players)
+    # or 2x $2000 coins + 10x $1000 coins (5-6 players)
+    return 16000 if num_players <= 4 else 14000
+
+
+def new_game(num_players: int, rng: random.Random | None = None) -> State:
+    """Deal a fresh game in the SETUP phase.
+
+    Both decks are trimmed to a multiple of the player count after shuffling,
+    so every auction and sale round has exactly one card per player. With four
+    players two of each card type are left out, as in the printed rules. With
+    three players the printed rules leave out six of each, but this deal keeps
+    all 30 and plays ten rounds instead of eight.
+    """
+    if num_players < 3 or num_players > 6:
+        raise ValueError("For Sale requires 3-6 players")
+    shuffle = rng.shuffle if rng is not None else random.shuffle
+
+    shuffled_properties = list(PROPERTY_DECK)
+    shuffle(shuffled_properties)
+
+    shuffled_checks = list(CHECK_DECK)
+    shuffle(shuffled_checks)
+
+    deck_size = len(PROPERTY_DECK) - len(PROPERTY_DECK) % num_players
+    money = initial_money(num_players)
+
+    return State(
+        players=tuple(Player(money=money, properties=(), checks=()) for _ in range(num_players)),
+        current_player_idx=0,
+        phase=GamePhase.SETUP,
+        round_number=0,
+        property_deck=tuple(shuffled_properties[:deck_size]),
+        check_deck=tuple(shuffled_checks[:deck_size])
+    )
+
+
+def begin(state: State) -> State:
+    """Move a SETUP state to the first auction."""
+    if state.phase != GamePhase.SETUP:
+        raise ValueError(f"Game already started: {state.phase}")
+    return start_auction(state, len(state.players))
+
+
+# Step interface
+def legal_actions(state: State, player_idx: int | None = None) -> list[Action]:
+    """Legal actions for `player_idx` (default: the current player).
+
+    In the selling phase every player may act, so any seat can be queried.
+    """
+    if player_idx is None or player_idx == state.current_player_idx:
+        return state.get_legal_actions()
+    if state.phase == GamePhase.SELLING:
+        return [Action.play_card(p) for p in state.players[player_idx].properties]
+    return []
+
+
+def joint_actions(state: State) -> Iterator[JointAction]:
+    """Lazily enumerate every joint play of a sale round."""
+    if state.phase != GamePhase.SELLING or not state.sale_state:
+        return iter(())
+    return itertools.product(*(
+        [Action.play_card(p) for p in player.properties] for player in state.players
+    ))
+
+
+def apply(state: State, action: Action | JointAction) -> State:
+    """Apply one decision and advance to the next decision point."""
+    if state.phase == GamePhase.BIDDING:
+        if not isinstance(action, Action):
+            raise ValueError(f"Expected a single action in bidding phase, got {action}")
+        state = process_bid(state, state.current_player_idx, action)
+        if state.auction_state is not None:
+            return state
+        if state.property_deck:
+            return start_auction(state, len(state.players))
+        return start_sale_round(state, len(state.players))
+
+    if state.phase == GamePhase.SELLING:
+        if isinstance(action, Action) or len(action) != len(state.players):
+            raise ValueError(f"Expected one PLAY action per player in selling phase, got {action}")
+        plays = {}
+        for i, play in enumerate(action):
+            if play.type != Action.Type.PLAY:
+                raise ValueError(f"Expected PLAY action in selling phase, got {play.type}")
+            plays[i] = play.value
+        state = resolve_sale(collect_plays(state, plays))
+        if state.check_deck:
+            return start_sale_round(state, len(state.players))
+        return finish_game(state)
+
+    raise ValueError(f"No decision to make in phase {state.phase}")
+
+
+def is_terminal(state: State) -> bool:
+    return state.phase == GamePhase.FINISHED
+
+
+def scores(state: State) -> tuple[int, ...]:
+    return tuple(player.money + sum(player.checks) for player in state.players)
+
+
+def player_view(state: State, player_idx: int) -> State:
+    """The state as seen by `player_idx` during simultaneous sale plays."""
+    if state.current_player_idx == player_idx:
+        return state
+    return State(
+        state.players, player_idx, state.phase, state.round_number,
+        state.property_deck, state.check_deck, state.auction_state, state.sale_state
+    )
+
+
+def _replace_player(players: tuple[Player, ...], idx: int, player: Player) -> tuple[Player, ...]:
+    return players[:idx] + (player,) + players[idx + 1:]
+
+
+# Auction Management
+def start_auction(state: State, num_properties: int) -> State:
+    if len(state.property_deck) < num_properties:
+        num_properties = len(state.property_deck)
+
+    auction_state = AuctionState(
+        current_properties=state.property_deck[:num_properties],
+        current_bids={},
+        players_passed=set(),
+        properties_taken={}
+    )
+
+    return State(
+        state.players, 0, GamePhase.BIDDING, state.round_number,
+        state.property_deck[num_properties:], state.check_deck, auction_state, state.sale_state
+    )
+
+
+def process_bid(state: State, player_idx: int, action: Action) -> State:
+    if action.type == Action.Type.PASS:
+        return advance_turn_or_finish_auction(pass_player(state, player_idx))
+    elif action.type == Action.Type.BID:
+        return advance_turn_or_finish_auction(place_bid(state, player_idx, action.value))
+
+    raise ValueError(f"Invalid action for bidding phase: {action}")
+
+
+def pass_player(state: State, player_idx: int) -> State:
+    """Drop out of the auction, taking the lowest card and half the bid back."""
+    auction_state = state.auction_state
+    if not auction_state:
+        raise ValueError("No active auction")
+
+    current_properties = auction_state.current_properties
+    lowest_property = min(current_properties)
+    remaining_properties = tuple(p for p in current_properties if p != lowest_property)
+
+    refund = auction_state.current_bids.get(player_idx, 0) // 2
+
+    player = state.players[player_idx]
+    updated_player = Player(
+        player.money + refund, player.properties + (lowest_property,), player.checks, player.passed
+    )
+
+    properties_taken = auction_state.properties_taken.copy()
+    properties_taken[player_idx] = lowest_property
+    new_auction_state = AuctionState(
+        remaining_properties,
+        auction_state.current_bids,
+        auction_state.players_passed | {player_idx},
+        properties_taken
+    )
+
+    return State(
+        _replace_player(state.players, player_idx, updated_player), state.current_player_idx,
+        state.phase, state.round_number, state.property_deck, state.check_deck,
+        new_auction_state, state.sale_state
+    )
+
+
+def place_bid(state: State, player_idx: int, bid_amount: int) -> State:
+    auction_state = state.auction_state
+    if not auction_state:
+        raise ValueError("No active auction")
+
+    if bid_amount > state.players[player_idx].money:
+        raise ValueError("Insufficient funds")
+
+    # Validate bid is in $1000 increments
+    if bid_amount % 1000 != 0:
+        raise ValueError("Bids must be in increments of $1000")
+
+    current_bid = max(auction_state.current_bids.values(), default=0)
+    if bid_amount <= current_bid:
+        raise ValueError("Bid must be higher than current bid")
+
+    new_bids = auction_state.current_bids.copy()
+    new_bids[player_idx] = bid_amount
+
+    new_auction_state = AuctionState(
+        auction_state.current_properties, new_bids,
+        auction_state.players_passed, auction_state.properties_taken
+    )
+
+    return State(
+        state.players, state.current_player_idx, state.phase, state.round_number,
+        state.property_deck, state.check_deck, new_auction_state, state.sale_state
+    )
+
+
+def auction_winner(state: State) -> int | None:
+    """The last player still bidding, once everyone else has passed."""
+    if not state.auction_state:
+        return None
+    players_passed = state.auction_state.players_passed
+    num_players = len(state.players)
+    if num_players - len(players_passed) != 1:
+        return None
+    return next(i for i in range(num_players) if i not in players_passed)
+
+
+def auction_over(state: State) -> bool:
+    return bool(state.auction_state) and len(state.players) - len(state.auction_state.players_passed) <= 1
+
+
+def advance_turn_or_finish_auction(state: State) -> State:
+    if not state.auction_state:
+        return state
+
+    if auction_over(state):
+        return finish_auction(state)
+
+    return advance_turn(state)
+
+
+def advance_turn(state: State) -> State:
+    players_passed = state.auction_state.players_passed
+    num_players = len(state.players)
+
+    next_player = (state.current_player_idx + 1) % num_players
+    while next_player in players_passed:
+        next_player = (next_player + 1) % num_players
+
+    return State(
+        state.players, next_player, state.phase, state.round_number,
+        state.property_deck, state.check_deck, state.auction_state, state.sale_state
+    )
+
+
+def finish_auction(state: State) -> State:
+    """Give the highest card to the last bidder, who pays their full bid."""
+    if not state.auction_state:
+        return state
+
+    players = state.players
+    winner_idx = auction_winner(state)
+    if winner_idx is not None:
+        auction_state = state.auction_state
+        highest_property = max(auction_state.current_properties)
+        winning_bid = auction_state.current_bids.get(winner_idx, 0)
+
+        winner = players[winner_idx]
+        updated_winner = Player(
+            winner.money - winning_bid, winner.properties + (highest_property,), winner.checks, winner.passed
+        )
+        players = _replace_player(players, winner_idx, updated_winner)
+
+    return State(
+        players, state.current_player_idx, state.phase, state.round_number,
+        state.property_deck, state.check_deck, None, state.sale_state
+    )
+
+
+# Sale Management
+def start_sale_round(state: State, num_checks: int) -> State:
+    if len(state.check_deck) < num_checks:
+        num_checks = len(state.check_deck)
+
+    sale_state = SaleState(
+        current_checks=state.check_deck[:num_checks],
+        played_properties={}
+    )
+
+    return State(
+        state.players, state.current_player_idx, GamePhase.SELLING, state.round_number,
+        state.property_deck, state.check_deck[num_checks:], state.auction_state, sale_state
+    )
+
+
+def collect_plays(state: State, plays: dict[int, int]) -> State:
+    if not state.sale_state:
+        raise ValueError("No active sale round")
+
+    for player_idx, property_value in plays.items():
+        if property_value not in state.players[player_idx].properties:
+            raise ValueError(f"Player {player_idx} does not hold property {property_value}")
+
+    return State(
+        state.players, state.current_player_idx, state.phase, state.round_number,
+        state.property_deck, state.check_deck, state.auction_state,
+        SaleState(state.sale_state.current_checks, plays)
+    )
+
+
+def sale_results(sale_state: SaleState) -> tuple[tuple[int, int, int], ...]:
+    """(player_idx, property_value, check_value) for every check handed out.
+
+    The highest property played takes the highest check, and so on down.
+    """
+    sorted_plays = sorted(sale_state.played_properties.items(), key=lambda x: x[1], reverse=True)
+    sorted_checks = sorted(sale_state.current_checks, reverse=True)
+    return tuple(
+        (player_idx, property_value, check_value)
+        for (player_idx, property_value), check_value in zip(sorted_plays, sorted_checks)
+    )
+
+
+def resolve_sale(state: State) -> State:
+    if not state.sale_state:
+        raise ValueError("No active sale round")
+    return apply_sale_results(state, sale_results(state.sale_state))
+
+
+def apply_sale_results(state: State, results: tuple[tuple[int, int, int], ...]) -> State:
+    updated_players = list(state.players)
+
+    for player_idx, property_value, check_value in results:
+        player = updated_players[player_idx]
+        updated_players[player_idx] = Player(
+            player.money,
+            tuple(p for p in player.properties if p != property_value),
+            player.checks + (check_value,),
+            player.passed
+        )
+
+    return State(
+        tuple(updated_players), state.current_player_idx, state.phase, state.round_number,
+        state.property_deck, state.check_deck, state.auction_state, None
+    )
+
+
+def finish_game(state: State) -> State:
+    return State(
+        state.players, state.current_player_idx, GamePhase.FINISHED, state.round_number,
+        state.property_deck, state.check_deck, None, None
+    )
@@ -0,0 +1,162 @@
+"""Run many games at once so batched agents see many decisions per call.
+
+`BatchScheduler` keeps up to `max_concurrent` games in flight. Each step it
+collects the pending decision of every game (one bid, or one play per seat
+in a sale round), groups them by agent and asks each agent once, through
+`BatchAgent.move_batch`, for all of its decisions. Games then advance with
+`rules.apply`, finished games are replaced by new ones, and the finished
+ones are yielded as they complete.
+
+Agents are usually shared between games, which is what makes the batches
+large. Agents that only implement `move` are wrapped in `SequentialBatchAgent`.
+Decks are dealt from the game's seed exactly as `GameEngine` deals them, but
+agents are not reseeded since one agent serves many games.
+"""
+
+from __future__ import annotations
+
+import random
+from collections.abc import Iterable, Iterator, Sequence
+from typing import TYPE_CHECKING
+
+from . import rules
+from .core import GamePhase
+from .seeding import DECK_STREAM, derive_seed
+
+if TYPE_CHECKING:
+    from .core import Action, Agent, BatchAgent
+    from .state import State
+
+GameSpec = tuple[Sequence["Agent | BatchAgent"], int | None]
+
+
+class SequentialBatchAgent:
+    """Adapts a one-move-at-a-time `Agent` to `BatchAgent`."""
+
+    def __init__(self, agent: Agent):
+        self.agent = agent
+        self.name = getattr(agent, "name", type(agent).__name__)
+
+    def move(self, state: State) -> Action:
+        return self.agent.move(state)
+
+    def move_batch(self, states: Sequence[State]) -> list[Action]:
+        move = self.agent.move
+        return [move(state) for state in states]
+
+
+def as_batch_agent(agent: Agent | BatchAgent) -> BatchAgent:
+    if hasattr(agent, "move_batch"):
+        return agent
+    return SequentialBatchAgent(agent)
+
+
+class _Game:
+    __slots__ = ("index", "agents", "state")
+
+    def __init__(self, index: int, agents: list[BatchAgent], state: State):
+        self.index = index
+        self.agents = agents
+        self.state = state
+
+
+class BatchScheduler:
+    def __init__(self, max_concurrent: int = 256):
+        if max_concurrent < 1:
+            raise ValueError("max_concurrent must be at least 1")
+        self.max_concurrent = max_concurrent
+        # move_batch calls and the decisions they covered, over every run
+        self.batches = 0
+        self.decisions = 0
+
+    @property
+    def mean_batch_size(self) -> float:
+        return self.decisions / self.batches if self.batches else 0.0
+
+    def run(self, games: Iterable[GameSpec]) -> Iterator[tuple[int, State]]:
+        """Play `(agents, seed)` games, yielding `(index, final state)` as each finishes."""
+        specs = iter(enumerate(games))
+        adapters: dict[int, BatchAgent] = {}
+        active: list[_Game] = []
+        exhausted = False
+
+        while True:
+            while not exhausted and len(active) < self.max_concurrent:
+                spec = next(specs, None)
+                if spec is None:
+                    exhausted = True
+                    break
+                index, (agents, seed) = spec
+                active.append(self._start(index, agents, seed, adapters))
+            if not active:
+                return
+
+            self._step(active)
+
+            still_active = []
+            for game in active:
+                if game.state.phase == GamePhase.FINISHED:
+                    yield game.index, game.state
+                else:
+                    still_active.append(game)
+            active = still_active
+
+    def play(self, games: Iterable[GameSpec]) -> list[State]:
+        """Final states of `games`, in the order given."""
+        finished = dict(self.run(games))
+        return [finished[i] for i in range(len(finished))]
+
+    def _start(
+        self, index: int, agents: Sequence[Agent | BatchAgent], seed: int | None, adapters: dict[int, BatchAgent]
+    ) -> _Game:
+        if len(agents) < 3 or len(agents) > 6:
+            raise ValueError("For Sale requires 3-6 players")
+        batch_agents = []
+        for agent in agents:
+            # One adapter per agent, so an agent's decisions share a batch
+            adapter = adapters.get(id(agent))
+            if adapter is None:
+                adapter = adapters[id(agent)] = as_batch_agent(agent)
+            batch_agents.append(adapter)
+        rng = random.Random(derive_seed(seed, DECK_STREAM)) if seed is not None else None
+        return _Game(index, batch_agents, rules.begin(rules.new_game(len(agents), rng)))
+
+    def _step(self, active: list[_Game]) -> None:
+        # agent id -> (agent, [(game, seat, state)])
+        pending: dict[int, tuple[BatchAgent, list[tuple[_Game, int, State]]]] = {}
+
+        def ask(game: _Game, seat: int, state: State) -> None:
+            agent = game.agents[seat]
+            entry = pending.get(id(agent))
+            if entry is None:
+                entry = pending[id(agent)] = (agent, [])
+            entry[1].append((game, seat, state))
+
+        for game in active:
+            state = game.state
+            if state.phase == GamePhase.BIDDING:
+                ask(game, state.current_player_idx, state)
+            else:
+                for seat in range(len(state.players)):
+                    ask(game, seat, rules.player_view(state, seat))
+
+        sale_plays: dict[int, list[Action | None]] = {}
+        for agent, requests in pending.values():
+            actions = agent.move_batch([state for _, _, state in requests])
+            if len(actions) != len(requests):
+                raise ValueError(f"move_batch returned {len(actions)} actions for {len(requests)} states")
+            self.batches += 1
+            self.decisions += len(requests)
+
+            for (game, seat, _), action in zip(requests, actions):
+                if game.state.phase == GamePhase.BIDDING:
+                    game.state = rules.apply(game.state, action)
+                else:
+                    plays = sale_plays.get(game.index)
+                    if plays is None:
+                        plays = sale_plays[game.index] = [None] * len(game.state.players)
+                    plays[seat] = action
+
+        for game in active:
+            if game.state.phase == GamePhase.SELLING and game.index in sale_plays:
+                game.state = rules.apply(game.state, tuple(sale_plays[game.index]))
@@ -0,0 +1,34 @@
+"""Seed derivation for reproducible batches.
+
+Seeds are mixed with SplitMix64, so nearby inputs such as consecutive game
+indices give unrelated streams. Every game in a batch can be replayed from
+`game_seed(master_seed, game_index)` alone.
+"""
+
+from __future__ import annotations
+
+_MASK = (1 << 64) - 1
+
+
+def _splitmix64(x: int) -> int:
+    x = (x + 0x9E3779B97F4A7C15) & _MASK
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _MASK
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & _MASK
+    return x ^ (x >> 31)
+
+
+def derive_seed(seed: int, *path: int) -> int:
+    """A 64-bit seed for the stream at `path` below `seed`."""
+    x = _splitmix64(seed & _MASK)
+    for part in path:
+        x = _splitmix64(x ^ (part & _MASK))
+    return x
+
+
+def game_seed(master_seed: int, game_index: int) -> int:
+    return derive_seed(master_seed, game_index)
+
+
+# Streams below a game seed
+DECK_STREAM = 0
+AGENT_STREAM = 1
@@ -1,9 +1,15 @@
 from __future__ import annotations
 
+from collections.abc import Iterator
+from typing import TYPE_CHECKING
+
 import attrs
 
 from .core import Action, AuctionState, GamePhase, Player, SaleState
 
+if TYPE_CHECKING:
+    import random
+
 
 @attrs.define
 class State:
@@ -29,35 +35,67 @@ class State:
         return []
 
     def _get_bidding_actions(self) -> list[Action]:
-        if not self.auction_state:
-            return []
-
-        current_player = self.get_current_player()
-        if self.current_player_idx in self.auction_state.players_passed:
+        if not self._can_bid():
             return []
 
         actions = [Action.pass_turn()]
-
-        current_bid = max(self.auction_state.current_bids.values(), default=0)
-        max_bid = current_player.money
-
-        # Bids must be in increments of $1000
-        next_bid = ((current_bid // 1000) + 1) * 1000
-
-        while next_bid <= max_bid:
-            actions.append(Action.bid(next_bid))
-            next_bid += 1000
-
+        actions.extend(Action.bid(amount) for amount in self.bid_range())
         return actions
 
     def _get_selling_actions(self) -> list[Action]:
-        current_player = self.get_current_player()
-        actions = []
+        return [Action.play_card(prop_value) for prop_value in self.get_current_player().properties]
 
-        for prop_value in current_player.properties:
-            actions.append(Action.play_card(prop_value))
+    def _can_bid(self) -> bool:
+        return self.auction_state is not None and self.current_player_idx not in self.auction_state.players_passed
 
-        return actions
+    def bid_range(self) -> range:
+        """Every legal bid amount of the current player, empty if they cannot bid."""
+        if self.phase != GamePhase.BIDDING or not self._can_bid():
+            return range(0)
+        current_bid = max(self.auction_state.current_bids.values(), default=0)
+        # Bids must be in increments of $1000
+        return range((current_bid // 1000 + 1) * 1000, self.get_current_player().money + 1, 1000)
+
+    # The queries below agree with get_legal_actions() without building it
+    def legal_action_count(self) -> int:
+        if self.phase == GamePhase.BIDDING:
+            return 1 + len(self.bid_range()) if self._can_bid() else 0
+        elif self.phase == GamePhase.SELLING:
+            return len(self.get_current_player().properties)
+        return 0
+
+    def legal_action(self, index: int) -> Action:
+        """`get_legal_actions()[index]`."""
+        if index < 0:
+            index += self.legal_action_count()
+            if index < 0:
+                raise IndexError("legal action index out of range")
+        if self.phase == GamePhase.BIDDING and self._can_bid():
+            return Action.pass_turn() if index == 0 else Action.bid(self.bid_range()[index - 1])
+        elif self.phase == GamePhase.SELLING:
+            return Action.play_card(self.get_current_player().properties[index])
+        raise IndexError("legal action index out of range")
+
+    def iter_legal_actions(self) -> Iterator[Action]:
+        if self.phase == GamePhase.BIDDING:
+            if self._can_bid():
+                yield Action.pass_turn()
+                for amount in self.bid_range():
+                    yield Action.bid(amount)
+        elif self.phase == GamePhase.SELLING:
+            for prop_value in self.get_current_player().properties:
+                yield Action.play_card(prop_value)
+
+    def sample_legal_action(self, rng: random.Random) -> Action:
+        """A uniformly random legal action in O(1).
+
+        Draws from `rng` exactly like `rng.choice(state.get_legal_actions())`,
+        so seeded games play out the same either way.
+        """
+        count = self.legal_action_count()
+        if not count:
+            raise ValueError("No legal actions available")
+        return self.legal_action(rng.randrange(count))
 
     def display_state(self) -> str:
         """Display current game state for tracking"""
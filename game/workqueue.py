@@ -0,0 +1,194 @@
+"""A SQLite work queue with expiring leases, shared by processes and hosts.
+
+The coordinator fills the queue with batches, each a JSON payload. Workers
+`lease` one batch at a time for `lease_seconds`, `renew` the lease while
+they work and `complete` it with a JSON result, or `release` it with an
+error. A batch whose lease runs out (its worker died or hung) can be leased
+again by anyone. A completion from a worker that no longer holds the lease
+is ignored, so every batch has at most one result. A batch that has been
+leased `max_attempts` times without completing is marked failed instead of
+being handed out again.
+
+Every operation is a short transaction against one database file. SQLite's
+documentation warns against network filesystems, whose locking is often
+too unreliable to keep the file intact, so keep the file on a local disk
+when the workers share one host. Sharing it between hosts relies on a
+filesystem whose locking you have verified, at your own risk, and on the
+hosts' clocks agreeing to well within a lease.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import time
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+import attrs
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS batches (
+    id INTEGER PRIMARY KEY,
+    payload TEXT NOT NULL,
+    state TEXT NOT NULL DEFAULT 'pending',
+    worker TEXT,
+    lease_expires REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    result TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS batches_state ON batches (state, lease_expires);
+"""
+
+# A lease that ran out counts as pending while attempts are left, else as failed
+_EXPIRED = "state = 'leased' AND lease_expires < :now"
+_PENDING = f"(state = 'pending' OR ({_EXPIRED} AND attempts < max_attempts))"
+_FAILED = f"(state = 'failed' OR ({_EXPIRED} AND attempts >= max_attempts))"
+
+
+@attrs.frozen
+class Lease:
+    batch_id: int
+    payload: Any
+    attempts: int
+
+
+@attrs.frozen
+class QueueCounts:
+    pending: int
+    leased: int
+    done: int
+    failed: int
+
+    @property
+    def remaining(self) -> int:
+        return self.pending + self.leased
+
+    @property
+    def total(self) -> int:
+        return self.pending + self.leased + self.done + self.failed
+
+
+class WorkQueue:
+    def __init__(self, path: str | os.PathLike, timeout: float = 60.0):
+        self.path = os.fspath(path)
+        # Autocommit; transactions are opened explicitly where they matter
+        self._db = sqlite3.connect(self.path, timeout=timeout, isolation_level=None)
+        self._db.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._db.close()
+
+    def __enter__(self) -> WorkQueue:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    # Coordinator side
+    def get_meta(self, key: str) -> Any:
+        row = self._db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row is not None else None
+
+    def set_meta(self, key: str, value: Any) -> None:
+        self._db.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)", (key, json.dumps(value)))
+
+    def add(self, payloads: Iterable[Any], meta: dict[str, Any] | None = None, max_attempts: int = 3) -> None:
+        """Queue batches, each leased at most `max_attempts` times; set `meta` keys in the same transaction."""
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            self._db.executemany(
+                "INSERT INTO batches (payload, max_attempts) VALUES (?, ?)",
+                ((json.dumps(p), max_attempts) for p in payloads),
+            )
+            for key, value in (meta or {}).items():
+                self.set_meta(key, value)
+            self._db.execute("COMMIT")
+        except BaseException:
+            self._db.execute("ROLLBACK")
+            raise
+
+    def counts(self) -> QueueCounts:
+        """Batch counts, counting expired leases as pending, or failed once out of attempts."""
+        pending, leased, done, failed = self._db.execute(
+            f"SELECT COALESCE(SUM({_PENDING}), 0),"
+            " COALESCE(SUM(state = 'leased' AND lease_expires >= :now), 0),"
+            " COALESCE(SUM(state = 'done'), 0),"
+            f" COALESCE(SUM({_FAILED}), 0)"
+            " FROM batches",
+            {"now": time.time()},
+        ).fetchone()
+        return QueueCounts(pending, leased, done, failed)
+
+    def results(self) -> Iterator[tuple[int, Any]]:
+        """`(batch_id, result)` of every completed batch, in batch order."""
+        for batch_id, result in self._db.execute("SELECT id, result FROM batches WHERE state = 'done' ORDER BY id"):
+            yield batch_id, json.loads(result)
+
+    def failures(self) -> Iterator[tuple[int, str | None]]:
+        """`(batch_id, error)` of every failed batch, in batch order; None if its last lease expired."""
+        for batch_id, error in self._db.execute(
+            f"SELECT id, error FROM batches WHERE {_FAILED} ORDER BY id", {"now": time.time()}
+        ):
+            yield batch_id, error
+
+    # Worker side
+    def lease(self, worker: str, lease_seconds: float) -> Lease | None:
+        """Take the oldest pending or expired batch, or None if there is none right now."""
+        now = time.time()
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            row = self._db.execute(
+                f"SELECT id, payload, attempts FROM batches WHERE {_PENDING} ORDER BY id LIMIT 1", {"now": now}
+            ).fetchone()
+            if row is not None:
+                # Clearing the error leaves failures() reporting the last attempt's
+                self._db.execute(
+                    "UPDATE batches SET state = 'leased', worker = ?, lease_expires = ?, attempts = attempts + 1,"
+                    " error = NULL WHERE id = ?",
+                    (worker, now + lease_seconds, row[0]),
+                )
+            self._db.execute("COMMIT")
+        except BaseException:
+            self._db.execute("ROLLBACK")
+            raise
+        if row is None:
+            return None
+        return Lease(row[0], json.loads(row[1]), row[2] + 1)
+
+    def renew(self, batch_id: int, worker: str, lease_seconds: float) -> bool:
+        """Extend a lease; False if `worker` no longer holds it."""
+        cursor = self._db.execute(
+            "UPDATE batches SET lease_expires = ? WHERE id = ? AND state = 'leased' AND worker = ?",
+            (time.time() + lease_seconds, batch_id, worker),
+        )
+        return cursor.rowcount == 1
+
+    def complete(self, batch_id: int, worker: str, result: Any) -> bool:
+        """Store the result; False (and nothing stored) if `worker` no longer holds the lease."""
+        cursor = self._db.execute(
+            "UPDATE batches SET state = 'done', result = ?, lease_expires = NULL"
+            " WHERE id = ? AND state = 'leased' AND worker = ?",
+            (json.dumps(result), batch_id, worker),
+        )
+        return cursor.rowcount == 1
+
+    def release(self, batch_id: int, worker: str, error: str) -> bool:
+        """Give up a lease after an error: the batch is pending again, or failed if out of attempts.
+
+        False if `worker` no longer holds the lease.
+        """
+        cursor = self._db.execute(
+            "UPDATE batches SET"
+            " state = CASE WHEN attempts >= max_attempts THEN 'failed' ELSE 'pending' END,"
+            " worker = NULL, lease_expires = NULL, error = ?"
+            " WHERE id = ? AND state = 'leased' AND worker = ?",
+            (error, batch_id, worker),
+        )
+        return cursor.rowcount == 1
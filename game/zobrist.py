@@ -0,0 +1,282 @@
+"""Zobrist hashing of game states and a bounded transposition table.
+
+`ZobristKeys.hash_state` hashes a `State` from scratch. The delta methods
+return the XOR difference caused by one engine transition, touching only the
+cards, coins and flags that transition changed, so `GameEngine` can keep
+`state_hash` current without rescanning the position. Two states with equal
+hashes are (up to 64-bit collisions) equal positions; the order of cards in a
+hand does not matter, the order of the decks does. `round_number` is not
+hashed since the rules never change it.
+"""
+
+from __future__ import annotations
+
+import random
+from typing import Any
+
+import attrs
+
+from .core import AuctionState, GamePhase, SaleState
+from .rules import MAX_MONEY
+from .state import State
+
+MAX_PLAYERS = 6
+DECK_SIZE = 30
+MAX_CHECK_COPIES = 2
+
+
+class ZobristKeys:
+    def __init__(self, seed: int = 0x466F7253616C65):
+        rng = random.Random(seed)
+
+        def keys(*shape: int) -> Any:
+            if len(shape) == 1:
+                return [rng.getrandbits(64) for _ in range(shape[0])]
+            return [keys(*shape[1:]) for _ in range(shape[0])]
+
+        self.phase = {phase: rng.getrandbits(64) for phase in GamePhase}
+        self.current_player = keys(MAX_PLAYERS)
+        self.money = keys(MAX_PLAYERS, MAX_MONEY // 500 + 1)
+        self.held_property = keys(MAX_PLAYERS, DECK_SIZE + 1)
+        self.held_check = keys(MAX_PLAYERS, 16, MAX_CHECK_COPIES)
+        # Decks are keyed by distance from the bottom, which does not change
+        # as cards are drawn from the top.
+        self.property_deck = keys(DECK_SIZE, DECK_SIZE + 1)
+        self.check_deck = keys(DECK_SIZE, 16)
+
+        self.auction_active = rng.getrandbits(64)
+        self.auction_property = keys(DECK_SIZE + 1)
+        self.bid = keys(MAX_PLAYERS, MAX_MONEY // 1000 + 1)
+        self.passed = keys(MAX_PLAYERS)
+        self.taken = keys(MAX_PLAYERS, DECK_SIZE + 1)
+
+        self.sale_active = rng.getrandbits(64)
+        self.sale_check = keys(16, MAX_CHECK_COPIES)
+        self.played = keys(MAX_PLAYERS, DECK_SIZE + 1)
+
+    def hash_state(self, state: State) -> int:
+        h = self.phase[state.phase] ^ self.current_player[state.current_player_idx]
+
+        for i, player in enumerate(state.players):
+            h ^= self.money[i][player.money // 500]
+            for p in player.properties:
+                h ^= self.held_property[i][p]
+            h ^= self._checks_hash(self.held_check[i], player.checks)
+
+        deck_len = len(state.property_deck)
+        for i, p in enumerate(state.property_deck):
+            h ^= self.property_deck[deck_len - 1 - i][p]
+        deck_len = len(state.check_deck)
+        for i, c in enumerate(state.check_deck):
+            h ^= self.check_deck[deck_len - 1 - i][c // 1000]
+
+        return h ^ self.auction_hash(state.auction_state) ^ self.sale_hash(state.sale_state)
+
+    def auction_hash(self, auction_state: AuctionState | None) -> int:
+        if auction_state is None:
+            return 0
+        h = self.auction_active
+        for p in auction_state.current_properties:
+            h ^= self.auction_property[p]
+        for i, bid in auction_state.current_bids.items():
+            h ^= self.bid[i][bid // 1000]
+        for i in auction_state.players_passed:
+            h ^= self.passed[i]
+        for i, p in auction_state.properties_taken.items():
+            h ^= self.taken[i][p]
+        return h
+
+    def sale_hash(self, sale_state: SaleState | None) -> int:
+        if sale_state is None:
+            return 0
+        h = self.sale_active ^ self._checks_hash(self.sale_check, sale_state.current_checks)
+        for i, p in sale_state.played_properties.items():
+            h ^= self.played[i][p]
+        return h
+
+    @staticmethod
+    def _checks_hash(keys: list[list[int]], checks: tuple[int, ...]) -> int:
+        h = 0
+        seen = [0] * 16
+        for c in checks:
+            value = c // 1000
+            h ^= keys[value][seen[value]]
+            seen[value] += 1
+        return h
+
+    # Transition deltas
+    def phase_changed(self, before: State, after: State) -> int:
+        return self.phase[before.phase] ^ self.phase[after.phase]
+
+    def turn_advanced(self, before: State, after: State) -> int:
+        return self.current_player[before.current_player_idx] ^ self.current_player[after.current_player_idx]
+
+    def auction_started(self, before: State, after: State) -> int:
+        h = self.phase_changed(before, after) ^ self.turn_advanced(before, after)
+        deck = before.property_deck
+        deck_len = len(deck)
+        for i in range(deck_len - len(after.property_deck)):
+            h ^= self.property_deck[deck_len - 1 - i][deck[i]]
+        return h ^ self.auction_hash(before.auction_state) ^ self.auction_hash(after.auction_state)
+
+    def bid_placed(self, before: State, after: State, player_idx: int) -> int:
+        bid_keys = self.bid[player_idx]
+        h = bid_keys[after.auction_state.current_bids[player_idx] // 1000]
+        previous_bid = before.auction_state.current_bids.get(player_idx)
+        if previous_bid is not None:
+            h ^= bid_keys[previous_bid // 1000]
+        return h
+
+    def player_passed(self, before: State, after: State, player_idx: int) -> int:
+        player = after.players[player_idx]
+        lowest_property = player.properties[-1]
+        h = (
+            self.money[player_idx][before.players[player_idx].money // 500]
+            ^ self.money[player_idx][player.money // 500]
+            ^ self.held_property[player_idx][lowest_property]
+            ^ self.auction_property[lowest_property]
+            ^ self.passed[player_idx]
+            ^ self.taken[player_idx][lowest_property]
+        )
+        previous_taken = before.auction_state.properties_taken.get(player_idx)
+        if previous_taken is not None:
+            h ^= self.taken[player_idx][previous_taken]
+        return h
+
+    def auction_finished(self, before: State, after: State, winner_idx: int | None) -> int:
+        h = self.auction_hash(before.auction_state) ^ self.auction_hash(after.auction_state)
+        if winner_idx is not None:
+            winner = after.players[winner_idx]
+            h ^= (
+                self.money[winner_idx][before.players[winner_idx].money // 500]
+                ^ self.money[winner_idx][winner.money // 500]
+                ^ self.held_property[winner_idx][winner.properties[-1]]
+            )
+        return h
+
+    def sale_started(self, before: State, after: State) -> int:
+        h = self.phase_changed(before, after)
+        deck = before.check_deck
+        deck_len = len(deck)
+        for i in range(deck_len - len(after.check_deck)):
+            h ^= self.check_deck[deck_len - 1 - i][deck[i] // 1000]
+        return h ^ self.sale_hash(before.sale_state) ^ self.sale_hash(after.sale_state)
+
+    def plays_collected(self, before: State, after: State) -> int:
+        return self.sale_hash(before.sale_state) ^ self.sale_hash(after.sale_state)
+
+    def sale_resolved(self, before: State, after: State, results: tuple[tuple[int, int, int], ...]) -> int:
+        h = self.sale_hash(before.sale_state) ^ self.sale_hash(after.sale_state)
+        for player_idx, property_value, check_value in results:
+            copy = before.players[player_idx].checks.count(check_value)
+            h ^= (
+                self.held_property[player_idx][property_value]
+                ^ self.held_check[player_idx][check_value // 1000][copy]
+            )
+        return h
+
+
+ZOBRIST = ZobristKeys()
+
+
+def zobrist_hash(state: State) -> int:
+    return ZOBRIST.hash_state(state)
+
+
+@attrs.frozen
+class TableStats:
+    capacity: int
+    entries: int
+    lookups: int
+    hits: int
+    misses: int
+    stores: int
+    replacements: int
+    rejections: int
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.lookups if self.lookups else 0.0
+
+
+class TranspositionTable:
+    """Fixed-size hash table of search results keyed by Zobrist hash.
+
+    The table never grows past `capacity` slots, sized from `max_bytes`. Each
+    key maps to one slot; on a collision the incoming entry replaces the
+    resident one if the resident is from an older generation (see
+    `new_generation`) or was searched no deeper, so expensive results survive
+    cheap ones. Agents may share one table.
+    """
+
+    # Rough CPython cost of one occupied slot: key int, value, depth and tuple.
+    ENTRY_BYTES = 128
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        capacity = 1
+        while capacity * 2 * self.ENTRY_BYTES <= max_bytes:
+            capacity *= 2
+        self.capacity = capacity
+        self._mask = capacity - 1
+        self._slots: list[tuple[int, Any, int, int] | None]
+        self.clear()
+
+    def get(self, key: int, min_depth: int = 0) -> Any | None:
+        """The stored value for `key` if it was searched at least `min_depth` deep."""
+        self.lookups += 1
+        entry = self._slots[key & self._mask]
+        if entry is not None and entry[0] == key and entry[2] >= min_depth:
+            self.hits += 1
+            return entry[1]
+        return None
+
+    def store(self, key: int, value: Any, depth: int = 0) -> bool:
+        """Store `value`; returns False if a deeper current entry was kept instead."""
+        slot = key & self._mask
+        entry = self._slots[slot]
+        if entry is None:
+            self._entries += 1
+        elif entry[0] != key:
+            if entry[3] == self._generation and entry[2] > depth:
+                self.rejections += 1
+                return False
+            self.replacements += 1
+        self._slots[slot] = (key, value, depth, self._generation)
+        self.stores += 1
+        return True
+
+    def new_generation(self) -> None:
+        """Mark every resident entry as replaceable, e.g. once per move."""
+        self._generation += 1
+
+    def clear(self) -> None:
+        """Empty the table and zero its counters."""
+        self._slots = [None] * self.capacity
+        self._generation = 0
+        self._entries = 0
+
+        self.lookups = 0
+        self.hits = 0
+        self.stores = 0
+        self.replacements = 0
+        self.rejections = 0
+
+    def __len__(self) -> int:
+        return self._entries
+
+    def __contains__(self, key: int) -> bool:
+        entry = self._slots[key & self._mask]
+        return entry is not None and entry[0] == key
+
+    @property
+    def stats(self) -> TableStats:
+        return TableStats(
+            capacity=self.capacity,
+            entries=self._entries,
+            lookups=self.lookups,
+            hits=self.hits,
+            misses=self.lookups - self.hits,
+            stores=self.stores,
+            replacements=self.replacements,
+            rejections=self.rejections,
+        )
@@ -1,6 +1,6 @@
 from agents.manual import ManualAgent
 from agents.simple import AggressiveAgent, ConservativeAgent, RandomAgent
-from game import Game
+from game import ConsoleSink, Game
 
 
 def main():
@@ -50,7 +50,7 @@ def main():
     print("(Press Ctrl-C at any time to quit)")
 
     try:
-        game = Game(agents)
+        game = Game(agents, ConsoleSink())
         result = game.play()
 
         print("\n" + "=" * 50)
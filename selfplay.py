@@ -0,0 +1,127 @@
+"""Generate a training dataset by self-play.
+
+Games are scheduled and seeded exactly like `tournament.py`, played on a
+process pool, and every decision is written to a memory-mapped dataset (see
+`game.dataset`) by a background thread while the pool keeps playing:
+
+    python selfplay.py --agents endgame,aggressive,conservative --games 100000 --out data/selfplay
+
+The dataset commits its rows and the finished shards every
+`--checkpoint-interval` seconds. Rerunning an interrupted command resumes it,
+skipping the shards already committed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from agents import AGENTS, make_agent
+from game import GameEngine
+from game.dataset import BackgroundExporter, DatasetSink, DatasetWriter, GameRows
+from tournament import seatings, shard_jobs
+
+
+def play_shard_rows(jobs: list[tuple[int, tuple[str, ...], int]], first_game: int = 0) -> GameRows:
+    parts: list[GameRows] = []
+    for game_index, lineup, seed in jobs:
+        sink = DatasetSink(parts.append, first_game=first_game + game_index)
+        GameEngine([make_agent(name) for name in lineup], sink, seed=seed).play_game()
+    return GameRows.concatenate(parts)
+
+
+def generate(
+    agent_names: list[str],
+    player_counts: list[int],
+    num_games: int,
+    out: str,
+    seed: int = 0,
+    workers: int | None = None,
+    shard_size: int = 50,
+    progress: bool = False,
+    checkpoint_interval: float = 30.0,
+) -> int:
+    """Play `num_games` and append their decisions to the dataset in `out`; returns the row count.
+
+    If the dataset holds an interrupted run with the same arguments, only
+    the shards it has not committed are played. Otherwise the run's game
+    indices start after those already in the dataset.
+    """
+    schedule = seatings(agent_names, player_counts)
+    config = {
+        "agents": agent_names, "player_counts": player_counts, "games": num_games, "seed": seed,
+        "shard_size": shard_size,
+    }
+    writer = DatasetWriter(out)
+    done: set[int] = set()
+    first_game = writer.next_game
+    if writer.progress is not None and writer.progress["config"] == config:
+        done = set(writer.progress["completed_shards"])
+        first_game = writer.progress.get("first_game", 0)
+    started = time.perf_counter()
+    games = sum(min(shard_size, num_games - shard * shard_size) for shard in done)
+    committed = time.monotonic()
+
+    exporter = BackgroundExporter(writer)
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                pool.submit(play_shard_rows, jobs, first_game): (shard, len(jobs))
+                for shard, jobs in enumerate(shard_jobs(schedule, num_games, seed, shard_size))
+                if shard not in done
+            }
+            remaining = len(futures)
+            for future in as_completed(futures):
+                shard, num_jobs = futures[future]
+                done.add(shard)
+                remaining -= 1
+                # Progress rides along with the rows, so it is committed only once they are written
+                shard_progress = None
+                if not remaining or time.monotonic() - committed >= checkpoint_interval:
+                    shard_progress = {"config": config, "first_game": first_game, "completed_shards": sorted(done)}
+                    committed = time.monotonic()
+                exporter.submit(future.result(), shard_progress)
+                games += num_jobs
+                if progress:
+                    rate = games / (time.perf_counter() - started)
+                    print(f"\r{games}/{num_games} games ({rate:,.0f}/s)", end="", file=sys.stderr)
+    finally:
+        exporter.close()
+
+    if progress:
+        print(file=sys.stderr)
+    return exporter.writer.rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Write a self-play training dataset.")
+    parser.add_argument("--agents", default="endgame,aggressive,conservative", help="comma-separated agent names")
+    parser.add_argument("--players", default="3,4,5,6", help="comma-separated player counts")
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--shard-size", type=int, default=50)
+    parser.add_argument("--out", required=True, help="dataset directory, appended to if it exists")
+    parser.add_argument("--checkpoint-interval", type=float, default=30.0, help="seconds between commits")
+    args = parser.parse_args()
+
+    agent_names = args.agents.split(",")
+    for name in agent_names:
+        if name not in AGENTS:
+            parser.error(f"unknown agent {name!r}, choose from {', '.join(AGENTS)}")
+    player_counts = [int(n) for n in args.players.split(",")]
+    if any(n < 3 or n > 6 for n in player_counts):
+        parser.error("player counts must be between 3 and 6")
+
+    rows = generate(
+        agent_names, player_counts, args.games, args.out, args.seed, args.workers, args.shard_size, progress=True,
+        checkpoint_interval=args.checkpoint_interval,
+    )
+    print(f"{rows:,} rows in {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""Serve the built-in agents to `game.remote.RemoteAgent` clients.
+
+    python serve.py --unix /tmp/for-sale-agents.sock
+    python serve.py --port 7070
+
+Clients connect with `RemoteAgent(address, "conservative")`, naming any
+agent in `agents.AGENTS`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import functools
+import sys
+
+from agents import AGENTS, make_agent
+from game.remote import AgentServer
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve For Sale agents over a local socket.")
+    address = parser.add_mutually_exclusive_group(required=True)
+    address.add_argument("--unix", metavar="PATH", help="Unix socket path")
+    address.add_argument("--port", type=int, help="TCP port")
+    parser.add_argument("--host", default="127.0.0.1", help="TCP host to bind")
+    args = parser.parse_args()
+
+    server = AgentServer(
+        args.unix if args.unix else (args.host, args.port),
+        {name: functools.partial(make_agent, name) for name in AGENTS},
+    )
+    print(f"Serving {', '.join(AGENTS)} on {server.address}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+
+
+if __name__ == "__main__":
+    main()
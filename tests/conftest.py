@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+
+import attrs
+import pytest
+
+from agents.simple import AggressiveAgent, ConservativeAgent, RandomAgent
+from game import rules
+from game.core import Agent, GamePhase
+from game.engine import GameEngine
+from game.state import State
+
+
+@pytest.fixture
+def lineup() -> Callable[[int], list[Agent]]:
+    """A mixed table of simple agents for `num_players` seats."""
+
+    def make(num_players: int) -> list[Agent]:
+        agents = [RandomAgent, AggressiveAgent, ConservativeAgent]
+        return [agents[i % len(agents)](f"P{i}") for i in range(num_players)]
+
+    return make
+
+
+@pytest.fixture
+def rich_engine(lineup):
+    """Engines whose players start with `money`, more than the rules deal.
+
+    Refunds can carry money past the initial amount, but rarely far in a dealt
+    game; from $60,000 they push it past what fits in 16 bits.
+    """
+
+    def make(num_players: int, seed: int, money: int = 60_000, **kwargs) -> GameEngine:
+        engine = GameEngine(lineup(num_players), seed=seed, **kwargs)
+        players = tuple(attrs.evolve(player, money=money) for player in engine.state.players)
+        engine.state = attrs.evolve(engine.state, players=players)
+        if engine.zobrist is not None:
+            engine.state_hash = engine.zobrist.hash_state(engine.state)
+        return engine
+
+    return make
+
+
+@pytest.fixture
+def decision_states():
+    """Every decision point of an engine's game and its final state, played with `rules`."""
+
+    def play(engine: GameEngine) -> list[State]:
+        state = rules.begin(engine.state)
+        states = [state]
+        while not rules.is_terminal(state):
+            if state.phase == GamePhase.BIDDING:
+                action = engine.agents[state.current_player_idx].move(state)
+            else:
+                action = tuple(agent.move(rules.player_view(state, i)) for i, agent in enumerate(engine.agents))
+            state = rules.apply(state, action)
+            states.append(state)
+        return states
+
+    return play
@@ -0,0 +1,68 @@
+import asyncio
+import time
+
+from agents.simple import RandomAgent
+from game.aio import AsyncGameEngine, default_fallback, play_games
+from game.core import GamePhase
+from game.engine import GameEngine
+from game.instrument import EngineInstrumentation
+
+
+class SlowAgent(RandomAgent):
+    """Sleeps past any deadline in its first `slow_moves` moves."""
+
+    def __init__(self, name, slow_moves, delay=0.2):
+        super().__init__(name)
+        self.slow_moves = slow_moves
+        self.delay = delay
+
+    def move(self, state):
+        if self.slow_moves > 0:
+            self.slow_moves -= 1
+            time.sleep(self.delay)
+        return super().move(state)
+
+
+class CoroutineAgent(RandomAgent):
+    async def move_async(self, state):
+        await asyncio.sleep(0)
+        return self.move(state)
+
+
+def test_async_engine_plays_the_sync_game(lineup):
+    for seed in range(5):
+        expected = GameEngine(lineup(4), seed=seed).play_game()
+        assert asyncio.run(AsyncGameEngine(lineup(4), seed=seed).play_game_async()) == expected
+
+
+def test_coroutine_agents_are_awaited():
+    sync = GameEngine([RandomAgent(f"P{i}") for i in range(4)], seed=3).play_game()
+    engine = AsyncGameEngine([CoroutineAgent(f"P{i}") for i in range(4)], seed=3, time_limit=5)
+    assert asyncio.run(engine.play_game_async()) == sync
+    assert engine.timeouts == [0] * 4
+
+
+def test_a_move_past_its_deadline_is_replaced_by_the_fallback():
+    fallbacks = []
+
+    def fallback(state):
+        fallbacks.append(state)
+        return default_fallback(state)
+
+    agents = [SlowAgent("slow", slow_moves=2), RandomAgent("P1"), RandomAgent("P2")]
+    engine = AsyncGameEngine(agents, seed=1, time_limit=[0.02, None, None], fallback=fallback)
+    final = asyncio.run(engine.play_game_async())
+    assert final.phase == GamePhase.FINISHED
+    assert engine.timeouts == [2, 0, 0]
+    assert len(fallbacks) == 2
+    # The first auction opens with the slow seat, whose fallback passes
+    assert fallbacks[0].current_player_idx == 0
+
+
+def test_instrumentation_counts_the_async_phases(lineup):
+    instrumentation = EngineInstrumentation()
+    engines = [AsyncGameEngine(lineup(3), seed=seed, instrument=instrumentation) for seed in range(3)]
+    finals = asyncio.run(play_games(engines, max_concurrent=2))
+    assert all(final.phase == GamePhase.FINISHED for final in finals)
+    assert instrumentation.phases["bidding"].count == 3
+    assert instrumentation.phases["selling"].count == 3
@@ -0,0 +1,29 @@
+import pytest
+
+pytest.importorskip("numpy")
+
+from agents.simple import AggressiveAgent, ConservativeAgent, RandomAgent  # noqa: E402
+from game.batch import (  # noqa: E402
+    AggressiveBatchPolicy,
+    BatchEngine,
+    ConservativeBatchPolicy,
+    RandomBatchPolicy,
+)
+from game.engine import GameEngine  # noqa: E402
+
+PAIRS = [
+    (ConservativeAgent, ConservativeBatchPolicy),
+    (AggressiveAgent, AggressiveBatchPolicy),
+    (RandomAgent, RandomBatchPolicy),
+]
+
+
+@pytest.mark.parametrize("num_players", [3, 4, 5, 6])
+def test_batch_matches_scalar_engine(num_players):
+    seats = [PAIRS[i % len(PAIRS)] for i in range(num_players)]
+    seeds = list(range(20))
+    scores = BatchEngine(num_players, seeds, [policy() for _, policy in seats]).run()
+    for row, seed in zip(scores.tolist(), seeds):
+        engine = GameEngine([agent(f"P{i}") for i, (agent, _) in enumerate(seats)], seed=seed)
+        engine.play_game()
+        assert row == list(engine.get_scores().values())
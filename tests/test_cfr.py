@@ -0,0 +1,45 @@
+import pytest
+
+from agents.cfr import CFRAgent, CFRTrainer, StrategyTable
+from agents.simple import ConservativeAgent
+from game.core import GamePhase
+from game.engine import GameEngine
+
+
+def test_checkpoint_round_trip_resumes_the_same_run(tmp_path):
+    path = str(tmp_path / "cfr.ckpt")
+    straight = CFRTrainer(seed=3, player_counts=(3, 4))
+    straight.train(60, batch_size=20)
+
+    interrupted = CFRTrainer(seed=3, player_counts=(3, 4))
+    interrupted.train(40, batch_size=20, checkpoint=path)
+    resumed = CFRTrainer.load_checkpoint(path)
+    assert (resumed.seed, resumed.player_counts, resumed.exploration, resumed.iterations) == (3, (3, 4), 0.6, 40)
+    assert resumed.regrets == interrupted.regrets
+    assert resumed.strategy_sums == interrupted.strategy_sums
+
+    resumed.train(20, batch_size=20)
+    assert resumed.regrets == straight.regrets
+    assert resumed.strategy_sums == straight.strategy_sums
+    assert not (tmp_path / "cfr.ckpt.tmp").exists()
+
+
+def test_strategy_table_round_trip_plays(tmp_path):
+    path = str(tmp_path / "cfr.table")
+    trainer = CFRTrainer(seed=1)
+    trainer.train(50)
+    table = trainer.table()
+    table.save(path)
+    assert StrategyTable.load(path).probabilities == table.probabilities
+
+    agents = [CFRAgent(path), ConservativeAgent("P1"), ConservativeAgent("P2")]
+    assert GameEngine(agents, seed=0).play_game().phase == GamePhase.FINISHED
+
+
+def test_load_rejects_other_files(tmp_path):
+    path = tmp_path / "other"
+    path.write_bytes(b"not a table")
+    with pytest.raises(ValueError):
+        StrategyTable.load(str(path))
+    with pytest.raises(ValueError):
+        CFRTrainer.load_checkpoint(str(path))
@@ -0,0 +1,64 @@
+import asyncio
+
+import pytest
+
+from agents import make_agent
+from game.aio import AsyncGameEngine
+from game.checkpoint import load_pickle, save_pickle
+from game.core import GamePhase
+from game.engine import GameEngine
+from tournament import play_shard
+
+
+def snapshots_of(engine):
+    snapshots = []
+    engine.checkpoint = lambda engine: snapshots.append(engine.snapshot())
+    return snapshots, engine.play_game()
+
+
+@pytest.mark.parametrize("num_players", [3, 5])
+def test_every_snapshot_resumes_the_same_game(num_players, lineup):
+    snapshots, final = snapshots_of(GameEngine(lineup(num_players), seed=4))
+    assert len(snapshots) > 10
+    for snapshot in snapshots:
+        engine = GameEngine(lineup(num_players), seed=99, track_hash=True, track_equity=True)
+        engine.restore(snapshot)
+        assert engine.seed == 4
+        assert engine.play_game() == final
+        assert engine.state_hash == engine.zobrist.hash_state(final)
+        assert engine.equity.scores == [p.money + sum(p.checks) for p in final.players]
+
+
+def test_async_engine_resumes_from_a_pickled_snapshot(tmp_path, lineup):
+    snapshots, final = snapshots_of(GameEngine(lineup(4), seed=8))
+    for snapshot in snapshots[::4]:
+        path = tmp_path / "game.pkl"
+        save_pickle(path, snapshot)
+        engine = AsyncGameEngine(lineup(4))
+        engine.restore(load_pickle(path))
+        assert asyncio.run(engine.play_game_async()) == final
+
+
+def test_snapshots_are_taken_between_rounds(lineup):
+    engine = GameEngine(lineup(3), seed=0)
+    engine.state = engine._start_auction(3)
+    with pytest.raises(ValueError):
+        engine.snapshot()
+
+
+def test_restore_needs_as_many_players(lineup):
+    snapshots, _ = snapshots_of(GameEngine(lineup(3), seed=0))
+    with pytest.raises(ValueError):
+        GameEngine(lineup(4)).restore(snapshots[0])
+
+
+def test_shard_resumes_a_game_in_progress(tmp_path):
+    jobs = [(0, ("random", "conservative", "aggressive"), 11), (1, ("aggressive", "random", "random"), 12)]
+    expected = play_shard(jobs)
+
+    # Progress as a shard leaves it when stopped halfway through its second game
+    snapshots, final = snapshots_of(GameEngine([make_agent(name) for name in jobs[1][1]], seed=12))
+    assert final.phase == GamePhase.FINISHED
+    path = tmp_path / "shard.pkl"
+    save_pickle(path, {"results": [(0, jobs[0][1], expected[0].scores)], "snapshot": snapshots[len(snapshots) // 2]})
+    assert play_shard(jobs, str(path), interval=3600) == expected
@@ -0,0 +1,96 @@
+import itertools
+import math
+import random
+from collections import Counter
+
+import pytest
+
+from agents.endgame import EndgameAgent, SaleSolver, _distinct_draws, canonicalize, round_payoffs
+from game.engine import GameEngine
+
+
+def test_round_payoffs_give_the_highest_check_to_the_highest_card():
+    assert round_payoffs((5, 20, 1), (9000, 4000, 0)) == [4000, 9000, 0]
+
+
+def test_canonicalize_keeps_only_the_order_of_cards():
+    ranked, values = canonicalize(((30, 2), (17, 9)))
+    assert ranked == ((0, 3), (1, 2))
+    assert values == [2, 9, 17, 30]
+
+
+@pytest.mark.parametrize("remaining", [(0, 2000, 3000, 3000, 5000, 5000), (2000, 3000, 4000, 5000), (7000, 7000, 9000)])
+def test_distinct_draws_match_every_combination(remaining):
+    size = 2
+    expected = Counter()
+    for drawn in itertools.combinations(range(len(remaining)), size):
+        expected[tuple(sorted((remaining[i] for i in drawn), reverse=True))] += 1
+    draws = _distinct_draws(remaining, size, limit=100)
+    assert {checks: probability for checks, _, probability in draws} == pytest.approx(
+        {checks: count / math.comb(len(remaining), size) for checks, count in expected.items()}
+    )
+    for checks, left, _ in draws:
+        assert sorted(checks + left) == sorted(remaining)
+    assert _distinct_draws(remaining, size, limit=1) is None
+
+
+def brute_force_utility(hands, plays, checks, remaining):
+    """Checks per seat for two-card hands, where the last round is forced."""
+    last = tuple(next(card for card in hand if card != play) for hand, play in zip(hands, plays))
+    first = round_payoffs(plays, sorted(checks, reverse=True))
+    second = round_payoffs(last, sorted(remaining, reverse=True))
+    return [a + b for a, b in zip(first, second)]
+
+
+def test_two_card_solutions_are_equilibria_or_flagged():
+    rng = random.Random(1)
+    flagged = 0
+    for _ in range(200):
+        cards = rng.sample(range(1, 31), 6)
+        values = [v * 1000 for v in rng.sample([0, *range(2, 16)], 6)]
+        hands = tuple(tuple(sorted(cards[2 * i:2 * i + 2])) for i in range(3))
+        checks, remaining = tuple(values[:3]), tuple(values[3:])
+        solution = SaleSolver().solve(hands, checks, remaining, rng)
+
+        def is_equilibrium(plays):
+            base = brute_force_utility(hands, plays, checks, remaining)
+            for i, hand in enumerate(hands):
+                for card in hand:
+                    deviation = plays[:i] + (card,) + plays[i + 1:]
+                    if brute_force_utility(hands, deviation, checks, remaining)[i] > base[i]:
+                        return False
+            return True
+
+        if solution.converged:
+            assert is_equilibrium(solution.plays)
+            assert list(solution.payoffs) == brute_force_utility(hands, solution.plays, checks, remaining)
+        else:
+            flagged += 1
+            assert not any(is_equilibrium(plays) for plays in itertools.product(*hands))
+    assert flagged
+
+
+def test_dominant_hand_wins_both_rounds():
+    solver = SaleSolver()
+    solution = solver.solve(((29, 30), (1, 2), (3, 4)), (15000, 0, 2000), (14000, 5000, 3000), random.Random(0))
+    assert solution.converged
+    assert solution.payoffs == (29000, 3000, 7000)
+    assert solver.unconverged == 0
+
+
+def test_solutions_are_cached_on_the_multiset_of_checks_left():
+    hands = ((1, 5, 9), (2, 6, 10), (3, 7, 8))
+    remaining = [2000, 3000, 5000, 5000, 7000, 15000]
+    solver = SaleSolver()
+    first = solver.solve(hands, (0, 4000, 9000), remaining, random.Random(0))
+    searched = solver.searched
+    random.Random(1).shuffle(remaining)
+    assert solver.solve(hands, (9000, 0, 4000), remaining, random.Random(2)) == first
+    assert solver.searched == searched
+
+
+def test_endgame_agent_plays_a_card_it_holds(lineup):
+    agents = [EndgameAgent("Endgame"), *lineup(3)]
+    engine = GameEngine(agents, seed=3)
+    final = engine.play_game()
+    assert all(not player.properties for player in final.players)
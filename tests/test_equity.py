@@ -0,0 +1,66 @@
+import random
+
+import pytest
+
+from agents.ismcts import ISMCTSAgent
+from agents.simple import ConservativeAgent
+from game import rules
+from game.core import Action, GamePhase
+from game.engine import GameEngine
+from game.equity import EquityTracker, position_equities
+from game.mutable import MutableState
+
+
+class TrackerCheckingAgent(ConservativeAgent):
+    """Checks the engine's running tracker against a fresh one before every move."""
+
+    engine = None
+
+    def move(self, state):
+        fresh = EquityTracker(self.engine.state)
+        assert self.engine.equity.scores == fresh.scores
+        assert self.engine.equity.equities() == fresh.equities()
+        return super().move(state)
+
+
+@pytest.mark.parametrize("num_players", [3, 4, 5, 6])
+def test_running_equity_matches_a_fresh_tracker(num_players):
+    agents = [TrackerCheckingAgent(f"P{i}") for i in range(num_players)]
+    for seed in range(3):
+        engine = GameEngine(agents, seed=seed, track_equity=True)
+        for agent in agents:
+            agent.engine = engine
+        final = engine.play_game()
+        assert engine.equity.scores == [p.money + sum(p.checks) for p in final.players]
+        assert engine.get_equity() == dict(enumerate(engine.equity.scores))
+
+
+def test_scores_and_winner_read_the_tracker(lineup):
+    engine = GameEngine(lineup(4), seed=1, track_equity=True)
+    engine.play_game()
+    untracked = GameEngine(lineup(4), seed=1)
+    untracked.play_game()
+    assert engine.get_scores() == untracked.get_scores()
+    assert engine.get_winner() == untracked.get_winner()
+
+    engine.equity.scores[3] += 10**6
+    assert engine.get_scores()[3] == untracked.get_scores()[3] + 10**6
+    assert engine.get_winner() == 3
+
+
+def test_position_equities_match_the_tracker():
+    for seed in range(20):
+        rng = random.Random(seed)
+        position = MutableState(rules.begin(rules.new_game(3 + seed % 4, rng)))
+        while not position.is_terminal():
+            assert position_equities(position) == EquityTracker(position.to_state()).equities()
+            if position.phase == GamePhase.BIDDING:
+                position.make_move(rng.choice(position.legal_actions()))
+            else:
+                position.make_move(tuple(Action.play_card(rng.choice(hand)) for hand in position.properties))
+        assert position_equities(position) == list(position.scores())
+
+
+def test_search_can_stop_rollouts_at_the_sales():
+    agents = [ISMCTSAgent(f"P{i}", time_limit=None, iterations=30, rollout_sales=False) for i in range(3)]
+    assert GameEngine(agents, seed=0).play_game().phase == GamePhase.FINISHED
@@ -0,0 +1,57 @@
+from array import array
+
+import pytest
+
+from agents.lookup import NUM_SITUATIONS, EVTable, LookupAgent, build_table
+from agents.simple import ConservativeAgent
+from game.core import GamePhase
+from game.engine import GameEngine
+
+
+def build(directory, name, shard_size=100):
+    path = str(directory / name)
+    situations = build_table(path, games=3, seed=2, player_counts=(3,), rollouts=2, shard_size=shard_size)
+    assert 0 < situations <= NUM_SITUATIONS
+    return path
+
+
+@pytest.fixture(scope="module")
+def built(tmp_path_factory):
+    return build(tmp_path_factory.mktemp("lookup"), "ev.table")
+
+
+def test_write_round_trip(tmp_path, built):
+    path = str(tmp_path / "ev.table")
+    size = len(EVTable(built).values)
+    values = array("f", (i % 97 / 8 for i in range(size)))
+    counts = array("I", (i % 13 for i in range(size)))
+    EVTable.write(path, values, counts, rollouts=4)
+    table = EVTable(path)
+    assert table.values.tolist() == values.tolist()
+    assert table.counts.tolist() == counts.tolist()
+    assert not (tmp_path / "ev.table.tmp").exists()
+
+
+def test_build_does_not_depend_on_sharding(tmp_path, built):
+    whole = EVTable(built)
+    sharded = EVTable(build(tmp_path, "sharded.table", shard_size=1))
+    assert whole.counts.tolist() == sharded.counts.tolist()
+    assert whole.values.tolist() == pytest.approx(sharded.values.tolist())
+    assert any(whole.counts)
+
+
+def test_lookup_agent_plays_from_a_built_table(built):
+    agents = [LookupAgent(built, min_samples=1), ConservativeAgent("P1"), ConservativeAgent("P2")]
+    assert GameEngine(agents, seed=0).play_game().phase == GamePhase.FINISHED
+
+
+def test_damaged_tables_are_rejected(tmp_path, built):
+    path = tmp_path / "ev.table"
+    with open(built, "rb") as f:
+        path.write_bytes(f.read()[:-4])
+    with pytest.raises(ValueError, match="truncated"):
+        EVTable(str(path))
+    path.write_bytes(b"not a table")
+    with pytest.raises(ValueError):
+        EVTable(str(path))
+
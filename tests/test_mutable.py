@@ -0,0 +1,47 @@
+import pytest
+
+from game import rules
+from game.core import GamePhase
+from game.engine import GameEngine
+from game.mutable import MutableState
+
+
+def played_line(engine: GameEngine):
+    """Each decision point of the engine's game with the decision taken there."""
+    state = rules.begin(engine.state)
+    while not rules.is_terminal(state):
+        if state.phase == GamePhase.BIDDING:
+            action = engine.agents[state.current_player_idx].move(state)
+        else:
+            action = tuple(agent.move(rules.player_view(state, i)) for i, agent in enumerate(engine.agents))
+        yield state, action
+        state = rules.apply(state, action)
+
+
+@pytest.mark.parametrize("num_players", [3, 4, 5, 6])
+def test_make_follows_rules_and_unmake_restores(num_players, lineup):
+    for seed in range(5):
+        line = list(played_line(GameEngine(lineup(num_players), seed=seed)))
+        mutable = MutableState(line[0][0])
+        for state, action in line:
+            assert mutable.to_state() == state
+            mutable.make_move(action)
+        assert mutable.is_terminal()
+        assert mutable.to_state() == rules.apply(*line[-1])
+
+        for state, _ in reversed(line):
+            mutable.unmake_move()
+            assert mutable.to_state() == state
+        assert mutable.depth == 0
+
+
+def test_every_bidding_action_unmakes(rich_engine):
+    for state, action in played_line(rich_engine(4, seed=3)):
+        if state.phase != GamePhase.BIDDING:
+            continue
+        mutable = MutableState(state)
+        for candidate in mutable.legal_actions():
+            mutable.make_move(candidate)
+            assert mutable.to_state() == rules.apply(state, candidate)
+            mutable.unmake_move()
+            assert mutable.to_state() == state
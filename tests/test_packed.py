@@ -0,0 +1,32 @@
+import attrs
+import pytest
+
+from game import rules
+from game.engine import GameEngine
+from game.packed import PACKED_SIZE, canonical, money, pack, unpack
+
+
+@pytest.mark.parametrize("num_players", [3, 4, 5, 6])
+def test_round_trip_through_a_game(num_players, lineup, decision_states):
+    for seed in range(5):
+        for state in decision_states(GameEngine(lineup(num_players), seed=seed)):
+            data = pack(state)
+            assert len(data) == PACKED_SIZE
+            assert unpack(data) == canonical(state)
+
+
+def test_round_trip_with_refund_inflated_money(rich_engine, decision_states):
+    states = decision_states(rich_engine(5, seed=0))
+    assert max(player.money for state in states for player in state.players) > 65_535
+    for state in states:
+        assert unpack(pack(state)) == canonical(state)
+
+
+def test_round_trip_at_max_money():
+    state = rules.begin(rules.new_game(6))
+    state = rules.apply(state, rules.legal_actions(state)[0])
+    players = tuple(attrs.evolve(player, money=rules.MAX_MONEY) for player in state.players)
+    state = attrs.evolve(state, players=players)
+    data = pack(state)
+    assert money(data, 5) == rules.MAX_MONEY
+    assert unpack(data) == canonical(state)
@@ -0,0 +1,77 @@
+import pytest
+
+from game.engine import GameEngine
+from game.record import GameRecord, RecordingSink, RecordWriter, _read_varint, _write_varint, read_records
+from game.rules import MAX_MONEY
+
+
+@pytest.fixture
+def record_games(lineup):
+    """Record games of `lineup` with the given seeds to `path`; their final states."""
+
+    def record(path, seeds, num_players=4):
+        finals = []
+        with RecordWriter(path) as writer:
+            for seed in seeds:
+                engine = GameEngine(lineup(num_players), RecordingSink(writer), seed=seed)
+                finals.append(engine.play_game())
+        return finals
+
+    return record
+
+
+@pytest.mark.parametrize("num_players", [3, 4, 5, 6])
+def test_replay_matches_the_played_game(tmp_path, record_games, num_players):
+    path = tmp_path / "games.fsr"
+    finals = record_games(path, range(5), num_players)
+    records = list(read_records(path))
+    assert [r.seed for r in records] == list(range(5))
+    assert [r.final_state() for r in records] == finals
+
+
+@pytest.mark.parametrize("value", [0, 127, 128, 16_383, 16_384, MAX_MONEY // 1000])
+def test_varint_round_trip(value):
+    out = bytearray()
+    _write_varint(out, value)
+    assert _read_varint(bytes(out), 0) == (value, len(out))
+
+
+def test_encode_round_trip_with_large_bids_and_negative_seed():
+    actions = bytearray()
+    for bid in (0, 128, MAX_MONEY // 1000):
+        _write_varint(actions, bid)
+    record = GameRecord(3, -1, tuple(range(1, 31)), (0, 15000) * 15, bytes(actions))
+    decoded = GameRecord.decode(record.encode())
+    assert decoded.seed == 2**64 - 1
+    assert decoded.actions == record.actions
+    assert (decoded.property_deck, decoded.check_deck) == (record.property_deck, record.check_deck)
+
+
+def test_torn_tail_is_skipped_and_truncated(tmp_path, record_games):
+    path = tmp_path / "games.fsr"
+    finals = record_games(path, [1, 2])
+    complete = path.stat().st_size
+    with open(path, "ab") as f:
+        f.write(b"\x40\x00\x00\x00torn")
+    assert [r.final_state() for r in read_records(path)] == finals
+
+    finals += record_games(path, [3])
+    assert path.stat().st_size > complete
+    assert [r.final_state() for r in read_records(path)] == finals
+
+
+def test_restored_game_is_not_recorded(tmp_path, lineup):
+    path = tmp_path / "games.fsr"
+    snapshots = []
+
+    def checkpoint(engine):
+        snapshots.append(engine.snapshot())
+
+    with RecordWriter(path) as writer:
+        engine = GameEngine(lineup(4), RecordingSink(writer), seed=5, checkpoint=checkpoint)
+        final = engine.play_game()
+        # A fresh game abandoned for one picked up halfway: neither matches a record
+        resumed = GameEngine(lineup(4), RecordingSink(writer), seed=6)
+        resumed.restore(snapshots[3])
+        assert resumed.play_game() == final
+    assert [r.final_state() for r in read_records(path)] == [final]
@@ -0,0 +1,77 @@
+import asyncio
+import random
+
+import pytest
+
+from agents.simple import ConservativeAgent, RandomAgent
+from game import rules
+from game.aio import AsyncGameEngine
+from game.engine import GameEngine
+from game.packed import canonical
+from game.remote import AgentClient, AgentServer, RemoteAgent, RemoteAgentError
+
+
+class CanonicalAgent(RandomAgent):
+    """Sees states as the server does, with hands in ascending order."""
+
+    def move(self, state):
+        return super().move(canonical(state))
+
+
+class BrokenSeedAgent(RandomAgent):
+    def __init__(self):
+        super().__init__("broken")
+
+    def set_rng(self, rng):
+        raise RuntimeError("cannot seed")
+
+
+@pytest.fixture
+def server(tmp_path):
+    agents = {"random": RandomAgent, "conservative": ConservativeAgent, "broken": BrokenSeedAgent}
+    with AgentServer(str(tmp_path / "agents.sock"), agents) as server:
+        yield server
+
+
+def test_remote_agents_play_the_local_game(server):
+    local = GameEngine([CanonicalAgent("P0"), ConservativeAgent("P1"), CanonicalAgent("P2")], seed=7).play_game()
+    with AgentClient(server.address, connections=2) as client:
+        agents = [client.agent("random"), client.agent("conservative"), client.agent("random")]
+        assert GameEngine(agents, seed=7).play_game() == local
+
+
+def test_async_engine_pipelines_remote_moves(server):
+    local = [GameEngine([CanonicalAgent(f"P{i}") for i in range(4)], seed=seed).play_game() for seed in range(3)]
+
+    async def play(client):
+        engines = [AsyncGameEngine([client.agent("random") for _ in range(4)], seed=seed) for seed in range(3)]
+        return await asyncio.gather(*(engine.play_game_async() for engine in engines))
+
+    with AgentClient(server.address) as client:
+        assert asyncio.run(play(client)) == local
+
+
+def test_unknown_agent_fails_the_first_move(server, lineup):
+    state = rules.begin(GameEngine(lineup(3), seed=0).state)
+    with RemoteAgent(server.address, "missing") as agent:
+        with pytest.raises(RemoteAgentError, match="Unknown agent"):
+            agent.move(state)
+
+
+def test_a_failed_reseed_fails_the_next_move(server, lineup):
+    state = rules.begin(GameEngine(lineup(3), seed=0).state)
+    with RemoteAgent(server.address, "broken") as agent:
+        agent.move(state)
+        agent.set_rng(random.Random(1))
+        with pytest.raises(RemoteAgentError, match="cannot seed"):
+            agent.move(state)
+        # Reported once
+        assert agent.move(state) in state.get_legal_actions()
+
+
+def test_a_failed_reseed_on_opening_fails_the_first_move(server, lineup):
+    state = rules.begin(GameEngine(lineup(3), seed=0).state)
+    with RemoteAgent(server.address, "broken") as agent:
+        agent.set_rng(random.Random(1))
+        with pytest.raises(RemoteAgentError, match="cannot seed"):
+            agent.move(state)
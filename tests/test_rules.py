@@ -0,0 +1,65 @@
+import random
+
+import pytest
+
+from agents.simple import ConservativeAgent
+from game import rules
+from game.core import Action, GamePhase
+from game.engine import GameEngine
+
+
+class SeatCheckingAgent(ConservativeAgent):
+    """Plays its own highest card and records which seat each sale view was for."""
+
+    def __init__(self, seat: int):
+        super().__init__(f"P{seat}")
+        self.seat = seat
+        self.views = []
+
+    def move(self, state):
+        if state.phase == GamePhase.SELLING:
+            self.views.append(state.current_player_idx)
+        return super().move(state)
+
+
+@pytest.mark.parametrize("num_players", [3, 4, 5, 6])
+def test_each_seat_sees_its_own_hand_in_a_sale(num_players):
+    agents = [SeatCheckingAgent(seat) for seat in range(num_players)]
+    final = GameEngine(agents, seed=1).play_game()
+    assert final.phase == GamePhase.FINISHED
+    for agent in agents:
+        assert agent.views and set(agent.views) == {agent.seat}
+    assert all(not player.properties for player in final.players)
+
+
+def test_collect_plays_rejects_a_card_the_player_does_not_hold():
+    state = rules.begin(rules.new_game(3, random.Random(0)))
+    while state.phase == GamePhase.BIDDING:
+        state = rules.apply(state, Action.pass_turn())
+    other = state.players[1].properties[0]
+    with pytest.raises(ValueError):
+        rules.collect_plays(state, {0: other, 1: other, 2: state.players[2].properties[0]})
+
+
+@pytest.mark.parametrize("num_players", [3, 4, 5, 6])
+def test_decks_divide_into_whole_rounds(num_players):
+    state = rules.new_game(num_players, random.Random(0))
+    assert len(state.property_deck) % num_players == 0
+    assert len(state.check_deck) == len(state.property_deck)
+    assert len(state.property_deck) > len(rules.PROPERTY_DECK) - num_players
+
+
+def test_three_players_keep_the_whole_deck():
+    # A documented deviation from the printed rules, which remove six cards
+    state = rules.new_game(3, random.Random(0))
+    assert sorted(state.property_deck) == list(rules.PROPERTY_DECK)
+    assert sorted(state.check_deck) == sorted(rules.CHECK_DECK)
+
+
+@pytest.mark.parametrize("num_players", [3, 4, 5, 6])
+def test_games_finish_for_every_player_count(num_players, lineup):
+    for seed in range(10):
+        final = GameEngine(lineup(num_players), seed=seed).play_game()
+        assert final.phase == GamePhase.FINISHED
+        assert all(not player.properties for player in final.players)
+        assert sum(len(player.checks) for player in final.players) == len(rules.new_game(num_players).check_deck)
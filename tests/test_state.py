@@ -0,0 +1,14 @@
+import pytest
+
+
+@pytest.mark.parametrize("num_players", [3, 6])
+def test_legal_action_queries_agree_with_the_list(num_players, rich_engine, decision_states):
+    for state in decision_states(rich_engine(num_players, seed=2, money=20_000)):
+        actions = state.get_legal_actions()
+        assert state.legal_action_count() == len(actions)
+        assert list(state.iter_legal_actions()) == actions
+        for index in range(-len(actions), len(actions)):
+            assert state.legal_action(index) == actions[index]
+        for index in (len(actions), -len(actions) - 1):
+            with pytest.raises(IndexError):
+                state.legal_action(index)
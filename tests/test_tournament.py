@@ -0,0 +1,54 @@
+from collections import Counter
+
+import pytest
+
+from tournament import GameResult, TournamentStats, lineup_for, play_shard, run_tournament, seatings, shard_jobs
+
+AGENTS = ["random", "conservative", "aggressive", "endgame", "ismcts"]
+
+
+@pytest.mark.parametrize("num_agents", [2, 3, 4, 5])
+@pytest.mark.parametrize("num_players", [3, 4, 5, 6])
+def test_every_agent_takes_equally_many_seats(num_agents, num_players):
+    names = AGENTS[:num_agents]
+    (lineups,) = seatings(names, [num_players])
+    assert len(set(lineups)) == len(lineups)
+    assert all(len(lineup) == num_players for lineup in lineups)
+    for seat in range(num_players):
+        counts = Counter(lineup[seat] for lineup in lineups)
+        assert set(counts) == set(names)
+        assert len(set(counts.values())) == 1
+
+
+def test_lineup_for_cycles_through_every_count():
+    schedule = seatings(AGENTS[:4], [3, 4, 5])
+    cycle = len(schedule) * max(len(lineups) for lineups in schedule)
+    played = Counter(lineup_for(schedule, i) for i in range(cycle))
+    for lineups in schedule:
+        assert all(played[lineup] == cycle // len(schedule) // len(lineups) for lineup in lineups)
+
+
+def test_stats_split_ties_and_round_trip():
+    stats = TournamentStats()
+    stats.add(GameResult(0, ("a", "b", "c"), (10, 10, 5)))
+    stats.add(GameResult(1, ("a", "a", "b", "c"), (1, 2, 3, 4)))
+    assert stats.games == 2
+    assert stats.overall["a"].seats == 3
+    assert stats.overall["a"].wins == pytest.approx(0.5)
+    assert stats.overall["c"].wins == pytest.approx(1.0)
+    assert stats.by_player_count[3]["b"].wins == pytest.approx(0.5)
+    low, high = stats.overall["c"].win_rate_interval()
+    assert 0.0 <= low < stats.overall["c"].win_rate < high <= 1.0
+
+    restored = TournamentStats.from_state(stats.to_state())
+    assert restored == stats
+    assert restored.to_dict() == stats.to_dict()
+
+
+def test_pool_matches_sequential_play():
+    names = ["random", "conservative", "aggressive"]
+    expected = TournamentStats()
+    for jobs in shard_jobs(seatings(names, [3, 4]), 24, 7, 5):
+        for result in play_shard(jobs):
+            expected.add(result)
+    assert run_tournament(names, [3, 4], 24, seed=7, workers=1, shard_size=5).to_dict() == expected.to_dict()
@@ -0,0 +1,97 @@
+import pytest
+
+from game import workqueue
+from game.workqueue import WorkQueue
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(workqueue, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def queue(tmp_path):
+    with WorkQueue(tmp_path / "queue.db") as queue:
+        yield queue
+
+
+def test_batches_are_leased_in_order_and_completed_once(queue, clock):
+    queue.add([{"games": 1}, {"games": 2}], meta={"seed": 7})
+    assert queue.get_meta("seed") == 7
+    first = queue.lease("a", 10)
+    second = queue.lease("b", 10)
+    assert (first.payload, second.payload) == ({"games": 1}, {"games": 2})
+    assert queue.lease("c", 10) is None
+
+    assert queue.complete(first.batch_id, "a", [1])
+    assert not queue.complete(first.batch_id, "a", [2])
+    assert not queue.complete(second.batch_id, "a", [3])
+    assert queue.counts() == workqueue.QueueCounts(pending=0, leased=1, done=1, failed=0)
+    assert list(queue.results()) == [(first.batch_id, [1])]
+
+
+def test_an_expired_lease_is_leased_again(queue, clock):
+    queue.add([{"games": 1}])
+    stale = queue.lease("a", 10)
+    clock.now += 5
+    assert queue.renew(stale.batch_id, "a", 10)
+    clock.now += 9
+    assert queue.lease("b", 10) is None
+    assert queue.counts().leased == 1
+
+    clock.now += 2
+    assert queue.counts().pending == 1
+    fresh = queue.lease("b", 10)
+    assert (fresh.batch_id, fresh.attempts) == (stale.batch_id, 2)
+
+    # The stale worker finds out it lost the batch, and its result is dropped
+    assert not queue.renew(stale.batch_id, "a", 10)
+    assert not queue.complete(stale.batch_id, "a", "stale")
+    assert not queue.release(stale.batch_id, "a", "stale")
+    assert queue.complete(fresh.batch_id, "b", "fresh")
+    assert list(queue.results()) == [(fresh.batch_id, "fresh")]
+
+
+def test_a_batch_out_of_attempts_fails(queue, clock):
+    queue.add([{"games": 1}], max_attempts=2)
+    first = queue.lease("a", 10)
+    assert queue.release(first.batch_id, "a", "crashed")
+    queue.lease("b", 10)
+    clock.now += 11
+    assert queue.lease("c", 10) is None
+    assert queue.counts() == workqueue.QueueCounts(pending=0, leased=0, done=0, failed=1)
+    # The last attempt expired rather than erring
+    assert list(queue.failures()) == [(first.batch_id, None)]
+
+
+def test_release_marks_the_last_attempt_failed(queue, clock):
+    queue.add([{"games": 1}], max_attempts=1)
+    lease = queue.lease("a", 10)
+    assert queue.release(lease.batch_id, "a", "boom")
+    assert queue.lease("b", 10) is None
+    assert list(queue.failures()) == [(lease.batch_id, "boom")]
+
+
+def test_queue_is_shared_between_connections(tmp_path, clock):
+    path = tmp_path / "queue.db"
+    with WorkQueue(path) as coordinator, WorkQueue(path) as worker:
+        coordinator.add(range(3))
+        leases = [worker.lease("w", 10) for _ in range(3)]
+        for lease in leases:
+            worker.complete(lease.batch_id, "w", lease.payload * 2)
+        assert [result for _, result in coordinator.results()] == [0, 2, 4]
+
+
+def test_max_attempts_must_be_positive(queue):
+    with pytest.raises(ValueError):
+        queue.add([1], max_attempts=0)
@@ -0,0 +1,33 @@
+import pytest
+
+from game.engine import GameEngine
+from game.zobrist import ZOBRIST, TranspositionTable
+
+
+def check_hash(engine: GameEngine) -> None:
+    assert engine.state_hash == ZOBRIST.hash_state(engine.state)
+
+
+@pytest.mark.parametrize("num_players", [3, 4, 5, 6])
+def test_incremental_hash_matches_full_hash(num_players, lineup):
+    for seed in range(5):
+        engine = GameEngine(lineup(num_players), seed=seed, track_hash=True, checkpoint=check_hash)
+        engine.play_game()
+        check_hash(engine)
+
+
+def test_incremental_hash_with_refund_inflated_money(rich_engine):
+    engine = rich_engine(5, seed=0, track_hash=True, checkpoint=check_hash)
+    engine.play_game()
+    check_hash(engine)
+
+
+def test_clear_resets_counters():
+    table = TranspositionTable(max_bytes=1024)
+    table.store(1, "a")
+    table.get(1)
+    table.get(2)
+    table.clear()
+    stats = table.stats
+    assert (stats.entries, stats.lookups, stats.hits, stats.stores) == (0, 0, 0, 0)
+    assert table.get(1) is None
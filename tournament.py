@@ -0,0 +1,433 @@
+"""Headless tournaments between non-interactive agents.
+
+Games are spread evenly over the seatings of the chosen agents at each player
+count (see `seatings`) and sharded across a process pool. Results stream back
+as shards finish and are reported as win rates and mean scores with 95%
+confidence intervals.
+
+Game `i` of a run is fully determined by `(--seed, i)`, so any single game can
+be replayed with narration without re-running the batch:
+
+    python tournament.py --agents random,conservative,aggressive --games 10000
+    python tournament.py --agents random,conservative,aggressive --replay 4711
+
+With `--checkpoint DIR` the run persists its progress atomically: the
+aggregated statistics and finished shards after every shard, and each
+worker's finished games and a snapshot of its game in progress every
+`--checkpoint-interval` seconds. Running the same command again resumes
+where it stopped, mid-game included, and replays at most one interval of
+work per worker.
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import math
+import os
+import sys
+import time
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import TYPE_CHECKING
+
+import attrs
+
+from agents import AGENTS, make_agent
+from game import ConsoleSink, GameEngine, game_seed
+from game.checkpoint import atomic_write, load_pickle, save_pickle
+from game.instrument import EngineInstrumentation, SamplingProfiler, cprofile, format_cprofile
+
+if TYPE_CHECKING:
+    from game import EventSink
+
+Z_95 = 1.959964
+
+
+@attrs.frozen
+class GameResult:
+    game_index: int
+    lineup: tuple[str, ...]
+    scores: tuple[int, ...]
+
+
+@attrs.define
+class AgentStats:
+    # One entry per seat played, so an agent seated twice in a game counts twice
+    seats: int = 0
+    wins: float = 0.0
+    score_sum: float = 0.0
+    score_sq_sum: float = 0.0
+
+    def add(self, score: int, win_share: float) -> None:
+        self.seats += 1
+        self.wins += win_share
+        self.score_sum += score
+        self.score_sq_sum += score * score
+
+    @property
+    def win_rate(self) -> float:
+        return self.wins / self.seats if self.seats else 0.0
+
+    def win_rate_interval(self) -> tuple[float, float]:
+        """Wilson score interval for the win rate."""
+        n = self.seats
+        if not n:
+            return (0.0, 0.0)
+        p = self.win_rate
+        denominator = 1 + Z_95 ** 2 / n
+        centre = (p + Z_95 ** 2 / (2 * n)) / denominator
+        margin = Z_95 * math.sqrt(p * (1 - p) / n + Z_95 ** 2 / (4 * n * n)) / denominator
+        return (max(0.0, centre - margin), min(1.0, centre + margin))
+
+    @property
+    def mean_score(self) -> float:
+        return self.score_sum / self.seats if self.seats else 0.0
+
+    def mean_score_margin(self) -> float:
+        n = self.seats
+        if n < 2:
+            return math.inf
+        variance = max(0.0, (self.score_sq_sum - self.score_sum ** 2 / n) / (n - 1))
+        return Z_95 * math.sqrt(variance / n)
+
+
+@attrs.define
+class TournamentStats:
+    overall: dict[str, AgentStats] = attrs.Factory(dict)
+    by_player_count: dict[int, dict[str, AgentStats]] = attrs.Factory(dict)
+    games: int = 0
+
+    def add(self, result: GameResult) -> None:
+        self.games += 1
+        best = max(result.scores)
+        winners = result.scores.count(best)
+        by_count = self.by_player_count.setdefault(len(result.lineup), {})
+        for name, score in zip(result.lineup, result.scores):
+            win_share = 1 / winners if score == best else 0.0
+            self.overall.setdefault(name, AgentStats()).add(score, win_share)
+            by_count.setdefault(name, AgentStats()).add(score, win_share)
+
+    def to_state(self) -> dict:
+        """Raw counters as plain data, for checkpoints."""
+        return attrs.asdict(self)
+
+    @classmethod
+    def from_state(cls, data: dict) -> TournamentStats:
+        return cls(
+            {name: AgentStats(**s) for name, s in data["overall"].items()},
+            {
+                int(n): {name: AgentStats(**s) for name, s in stats.items()}
+                for n, stats in data["by_player_count"].items()
+            },
+            data["games"],
+        )
+
+    def to_dict(self) -> dict:
+        def summary(stats: dict[str, AgentStats]) -> dict:
+            return {
+                name: {
+                    "seats": s.seats,
+                    "win_rate": s.win_rate,
+                    "win_rate_ci": list(s.win_rate_interval()),
+                    "mean_score": s.mean_score,
+                    "mean_score_ci": s.mean_score_margin(),
+                }
+                for name, s in sorted(stats.items())
+            }
+
+        return {
+            "games": self.games,
+            "overall": summary(self.overall),
+            "by_player_count": {str(n): summary(s) for n, s in sorted(self.by_player_count.items())},
+        }
+
+    def format(self) -> str:
+        lines = []
+
+        def table(title: str, stats: dict[str, AgentStats]) -> None:
+            lines.append(title)
+            lines.append(f"  {'agent':<14}{'seats':>8}{'win rate':>10}{'95% CI':>18}{'mean score':>14}{'± 95%':>10}")
+            for name, s in sorted(stats.items(), key=lambda item: -item[1].win_rate):
+                low, high = s.win_rate_interval()
+                lines.append(
+                    f"  {name:<14}{s.seats:>8}{s.win_rate:>10.1%}{f'[{low:.1%}, {high:.1%}]':>18}"
+                    f"{s.mean_score:>14,.0f}{s.mean_score_margin():>10,.0f}"
+                )
+
+        table(f"Overall ({self.games} games)", self.overall)
+        for n, stats in sorted(self.by_player_count.items()):
+            lines.append("")
+            table(f"{n} players", stats)
+        return "\n".join(lines)
+
+
+def seatings(agent_names: list[str], player_counts: list[int]) -> list[list[tuple[str, ...]]]:
+    """The lineups played at each player count, fair over a full cycle.
+
+    Every agent takes `n // len(agent_names)` seats at an `n`-player table,
+    and every combination of agents takes the remaining seats in turn, so
+    over a count's lineups each agent plays equally often, and equally often
+    in each seat. Lineups of different tables alternate, so a run that stops
+    partway through a cycle is as even as it can be.
+    """
+    schedule = []
+    for n in player_counts:
+        full, extra = divmod(n, len(agent_names))
+        tables = [
+            sorted(set(itertools.permutations(tuple(agent_names) * full + combination)))
+            for combination in itertools.combinations(agent_names, extra)
+        ]
+        # Every table has the same seat counts, hence the same number of seatings
+        schedule.append([lineup for seating in zip(*tables) for lineup in seating])
+    return schedule
+
+
+def lineup_for(schedule: list[list[tuple[str, ...]]], game_index: int) -> tuple[str, ...]:
+    """Alternate player counts game by game, rotating through each count's seatings."""
+    lineups = schedule[game_index % len(schedule)]
+    return lineups[game_index // len(schedule) % len(lineups)]
+
+
+def play_game(
+    lineup: tuple[str, ...],
+    seed: int,
+    sink: EventSink | None = None,
+    instrument: EngineInstrumentation | None = None,
+) -> tuple[int, ...]:
+    engine = GameEngine([make_agent(name) for name in lineup], sink, seed=seed, instrument=instrument)
+    engine.play_game()
+    return tuple(engine.get_scores().values())
+
+
+def play_shard(
+    jobs: list[tuple[int, tuple[str, ...], int]], checkpoint: str | None = None, interval: float = 30.0
+) -> list[GameResult]:
+    if checkpoint is None:
+        return [GameResult(game_index, lineup, play_game(lineup, seed)) for game_index, lineup, seed in jobs]
+    return _ShardCheckpoint(checkpoint, interval).play(jobs)
+
+
+class _ShardCheckpoint:
+    """Plays a shard, saving its progress to `path` at most every `interval` seconds.
+
+    Progress is pickled as plain data, the finished games as
+    `(game_index, lineup, scores)` plus the snapshot of the game in
+    progress, so it loads whether this module ran as a script or not.
+    """
+
+    def __init__(self, path: str, interval: float):
+        self.path = path
+        self.interval = interval
+        self.results: list[GameResult] = []
+        self._saved = time.monotonic()
+
+    def play(self, jobs: list[tuple[int, tuple[str, ...], int]]) -> list[GameResult]:
+        snapshot = None
+        if os.path.exists(self.path):
+            progress = load_pickle(self.path)
+            self.results = [GameResult(*result) for result in progress["results"]]
+            snapshot = progress["snapshot"]
+
+        for game_index, lineup, seed in jobs[len(self.results):]:
+            engine = GameEngine([make_agent(name) for name in lineup], seed=seed, checkpoint=self._between_rounds)
+            if snapshot is not None:
+                engine.restore(snapshot)
+                snapshot = None
+            engine.play_game()
+            self.results.append(GameResult(game_index, lineup, tuple(engine.get_scores().values())))
+            self._save_if_due(None)
+        return self.results
+
+    def _between_rounds(self, engine: GameEngine) -> None:
+        self._save_if_due(engine)
+
+    def _save_if_due(self, engine: GameEngine | None) -> None:
+        now = time.monotonic()
+        if now - self._saved >= self.interval:
+            progress = {
+                "results": [attrs.astuple(result, recurse=False) for result in self.results],
+                "snapshot": engine.snapshot() if engine is not None else None,
+            }
+            save_pickle(self.path, progress)
+            self._saved = now
+
+
+def shard_jobs(
+    schedule: list[list[tuple[str, ...]]], num_games: int, seed: int, shard_size: int
+) -> Iterator[list[tuple[int, tuple[str, ...], int]]]:
+    for start in range(0, num_games, shard_size):
+        yield [
+            (game_index, lineup_for(schedule, game_index), game_seed(seed, game_index))
+            for game_index in range(start, min(start + shard_size, num_games))
+        ]
+
+
+def run_tournament(
+    agent_names: list[str],
+    player_counts: list[int],
+    num_games: int,
+    seed: int = 0,
+    workers: int | None = None,
+    shard_size: int = 50,
+    progress: bool = False,
+    checkpoint: str | None = None,
+    checkpoint_interval: float = 30.0,
+) -> TournamentStats:
+    """Play the batch; with a `checkpoint` directory, resume whatever it holds."""
+    schedule = seatings(agent_names, player_counts)
+    stats = TournamentStats()
+    done: set[int] = set()
+    config = {
+        "agents": agent_names, "player_counts": player_counts, "games": num_games, "seed": seed,
+        "shard_size": shard_size,
+    }
+    if checkpoint is not None:
+        os.makedirs(checkpoint, exist_ok=True)
+        stats, done = _load_progress(checkpoint, config)
+    started = time.perf_counter()
+    resumed_games = stats.games
+
+    def shard_path(shard: int) -> str | None:
+        return os.path.join(checkpoint, f"shard-{shard:06d}.pkl") if checkpoint is not None else None
+
+    pool = ProcessPoolExecutor(max_workers=workers)
+    try:
+        futures = {
+            pool.submit(play_shard, jobs, shard_path(shard), checkpoint_interval): shard
+            for shard, jobs in enumerate(shard_jobs(schedule, num_games, seed, shard_size))
+            if shard not in done
+        }
+        for future in as_completed(futures):
+            for result in future.result():
+                stats.add(result)
+            if checkpoint is not None:
+                shard = futures[future]
+                done.add(shard)
+                _save_progress(checkpoint, config, stats, done)
+                path = shard_path(shard)
+                if os.path.exists(path):
+                    os.remove(path)
+            if progress:
+                rate = (stats.games - resumed_games) / (time.perf_counter() - started)
+                print(f"\r{stats.games}/{num_games} games ({rate:,.0f}/s)", end="", file=sys.stderr)
+    finally:
+        pool.shutdown(cancel_futures=True)
+
+    if progress:
+        print(file=sys.stderr)
+    return stats
+
+
+def _progress_path(checkpoint: str) -> str:
+    return os.path.join(checkpoint, "tournament.json")
+
+
+def _load_progress(checkpoint: str, config: dict) -> tuple[TournamentStats, set[int]]:
+    path = _progress_path(checkpoint)
+    if not os.path.exists(path):
+        return TournamentStats(), set()
+    with open(path) as f:
+        saved = json.load(f)
+    if saved["config"] != config:
+        raise ValueError(f"{checkpoint} holds a different run: {saved['config']}")
+    done = set(saved["completed_shards"])
+    # Shards recorded just before a crash may have left their progress file behind
+    for shard in done:
+        stale = os.path.join(checkpoint, f"shard-{shard:06d}.pkl")
+        if os.path.exists(stale):
+            os.remove(stale)
+    return TournamentStats.from_state(saved["stats"]), done
+
+
+def _save_progress(checkpoint: str, config: dict, stats: TournamentStats, done: set[int]) -> None:
+    saved = {"config": config, "completed_shards": sorted(done), "stats": stats.to_state()}
+    atomic_write(_progress_path(checkpoint), json.dumps(saved).encode())
+
+
+def run_instrumented(
+    agent_names: list[str],
+    player_counts: list[int],
+    num_games: int,
+    seed: int = 0,
+    profiler: str | None = None,
+    profile_out: str | None = None,
+) -> str:
+    """Play the batch in this process with instrumentation and an optional profiler; returns a report."""
+    schedule = seatings(agent_names, player_counts)
+    stats = TournamentStats()
+    instrument = EngineInstrumentation(track_allocations=True)
+
+    def play_all() -> None:
+        for game_index in range(num_games):
+            lineup = lineup_for(schedule, game_index)
+            stats.add(GameResult(game_index, lineup, play_game(lineup, game_seed(seed, game_index), None, instrument)))
+
+    sections = []
+    if profiler == "cprofile":
+        with cprofile(profile_out) as profile:
+            play_all()
+        sections.append(format_cprofile(profile))
+    elif profiler == "sample":
+        with SamplingProfiler() as sampler:
+            play_all()
+        if profile_out is not None:
+            sampler.write_collapsed(profile_out)
+        sections.append(sampler.format())
+    else:
+        play_all()
+    return "\n\n".join([stats.format(), instrument.format(), *sections])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run a headless For Sale tournament.")
+    parser.add_argument("--agents", default=",".join(AGENTS), help="comma-separated agent names")
+    parser.add_argument("--players", default="3,4,5,6", help="comma-separated player counts")
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--shard-size", type=int, default=50)
+    parser.add_argument("--checkpoint", metavar="DIR", help="persist progress here and resume from it")
+    parser.add_argument("--checkpoint-interval", type=float, default=30.0, help="seconds between worker saves")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    parser.add_argument("--replay", type=int, metavar="GAME_INDEX", help="narrate one game of the batch and exit")
+    parser.add_argument(
+        "--instrument", action="store_true", help="play in this process and report engine timings and allocations"
+    )
+    parser.add_argument(
+        "--profile", choices=["cprofile", "sample"], help="also profile the batch (implies --instrument)"
+    )
+    parser.add_argument(
+        "--profile-out", metavar="PATH", help="write the profile (pstats, or collapsed stacks for sample)"
+    )
+    args = parser.parse_args()
+
+    agent_names = args.agents.split(",")
+    for name in agent_names:
+        if name not in AGENTS:
+            parser.error(f"unknown agent {name!r}, choose from {', '.join(AGENTS)}")
+    player_counts = [int(n) for n in args.players.split(",")]
+    if any(n < 3 or n > 6 for n in player_counts):
+        parser.error("player counts must be between 3 and 6")
+
+    if args.replay is not None:
+        lineup = lineup_for(seatings(agent_names, player_counts), args.replay)
+        print(f"Game {args.replay}: {', '.join(lineup)}")
+        scores = play_game(lineup, game_seed(args.seed, args.replay), ConsoleSink())
+        print(f"Scores: {scores}")
+        return
+
+    if args.instrument or args.profile:
+        print(run_instrumented(agent_names, player_counts, args.games, args.seed, args.profile, args.profile_out))
+        return
+
+    stats = run_tournament(
+        agent_names, player_counts, args.games, args.seed, args.workers, args.shard_size, progress=True,
+        checkpoint=args.checkpoint, checkpoint_interval=args.checkpoint_interval,
+    )
+    print(json.dumps(stats.to_dict(), indent=2) if args.json else stats.format())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Train a bidding strategy with Monte Carlo CFR (see `agents.cfr`).
+
+Checkpoints after every batch and resumes from an existing checkpoint:
+
+    python train_cfr.py --iterations 1000000 --workers 8 --checkpoint cfr.ckpt --out cfr.table
+
+Play the result with `agents.cfr.CFRAgent("cfr.table")`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+
+from agents.cfr import NUM_INFO_SETS, CFRTrainer
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Train a CFR bidding strategy.")
+    parser.add_argument("--iterations", type=int, default=100_000, help="iterations to add to the run")
+    parser.add_argument(
+        "--workers", type=int, default=os.cpu_count(), help="worker processes; rerun with the same count to reproduce"
+    )
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    parser.add_argument("--players", help="comma-separated player counts, default 3,4,5,6")
+    parser.add_argument("--seed", type=int, help="default 0")
+    parser.add_argument("--checkpoint", metavar="PATH", help="resume from and save to this file")
+    parser.add_argument("--out", metavar="PATH", required=True, help="write the strategy table here")
+    args = parser.parse_args()
+
+    player_counts = tuple(int(n) for n in args.players.split(",")) if args.players else None
+    if args.checkpoint and os.path.exists(args.checkpoint):
+        trainer = CFRTrainer.load_checkpoint(args.checkpoint)
+        if args.seed is not None and args.seed != trainer.seed:
+            parser.error(f"{args.checkpoint} was trained with --seed {trainer.seed}")
+        if player_counts is not None and player_counts != trainer.player_counts:
+            parser.error(f"{args.checkpoint} was trained with --players {','.join(map(str, trainer.player_counts))}")
+        print(f"Resuming at iteration {trainer.iterations}", file=sys.stderr)
+    else:
+        trainer = CFRTrainer(args.seed or 0, player_counts or (3, 4, 5, 6))
+
+    started = time.perf_counter()
+    trainer.train(args.iterations, args.workers, args.batch_size, args.checkpoint)
+    elapsed = time.perf_counter() - started
+    trainer.table().save(args.out)
+    print(
+        f"{args.iterations} iterations in {elapsed:.1f}s ({args.iterations / elapsed:,.0f}/s), "
+        f"{trainer.iterations} in total, {trainer.visited_info_sets}/{NUM_INFO_SETS} information sets visited",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()